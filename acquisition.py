@@ -0,0 +1,304 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from alert_rules import AlertRuleEngine, QUANTITIES, TOTAL_CHANNEL
+from energy_integrator import EnergyIntegrator
+from simulation_engine import VectorizedLoadSimulator
+from log_sink import BufferedLogSink
+from timeseries_store import TimeSeriesStore, now_ms
+from rollups import MultiResolutionRollup, energy_increments
+
+# Defaults
+DATA_LOG_FILE = "load_data_log.csv"
+HISTORY_DIR = "load_history"
+MAX_DATA_POINTS = 200
+SAMPLE_INTERVAL = 1.0       # seconds between samples
+SUBSCRIBER_TIMEOUT = 30.0   # seconds without a snapshot read before a viewer is dropped
+EVENT_BACKLOG = 100         # recent spike/log events kept for late readers
+ENERGY_CHECKPOINT = "energy.json"   # integrator state, inside the history directory
+CHECKPOINT_INTERVAL = 60.0  # seconds between energy checkpoints
+SERIES = ("voltage_data", "current_data", "power_data", "energy_data")
+
+
+class AcquisitionService:
+    """Process-wide acquisition worker shared by every dashboard session.
+
+    A single background thread simulates the plant, integrates energy,
+    evaluates the alert rules and writes the CSV log, history store and
+    rollups exactly once per sample. Fired alerts join the spike and error
+    events in the ``events`` backlog, which viewers replay by sequence.
+    Each sample is published as an immutable snapshot dict; the series and
+    per-load totals are copied into it on the first read after a sample,
+    so any number of viewers share one copy and an unread sample costs none.
+
+    The worker only samples while at least one viewer is subscribed; viewers
+    that stop reading snapshots for ``subscriber_timeout`` seconds (closed
+    browser tabs) are dropped automatically.
+    """
+
+    def __init__(self, load_profiles, log_file=DATA_LOG_FILE, history_dir=HISTORY_DIR,
+                 interval=SAMPLE_INTERVAL, max_points=MAX_DATA_POINTS, subscriber_timeout=SUBSCRIBER_TIMEOUT):
+        self.load_profiles = load_profiles
+        self.interval = interval
+        self.max_points = max_points
+        self.subscriber_timeout = subscriber_timeout
+        self.logging_enabled = True
+
+        self.simulator = VectorizedLoadSimulator(load_profiles)
+        self.log_sink = BufferedLogSink(log_file)
+        self.history = TimeSeriesStore(history_dir)
+        self.rollups = MultiResolutionRollup()
+        self.energy = EnergyIntegrator(load_profiles)
+        self.checkpoint_path = os.path.join(history_dir, ENERGY_CHECKPOINT)
+        self._last_checkpoint = time.monotonic()
+
+        self._lock = threading.RLock()
+        self._subscribers = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._idle = True   # no sample since the last pause/flush
+        self.sequence = 0
+        self.events = deque(maxlen=EVENT_BACKLOG)
+        self.alert_rules = None
+        self.alert_params = {}
+        self.alert_engine = None
+
+        self._rebuild_rollups()
+        self.clear(reset_energy=not self.energy.load(self.checkpoint_path))
+
+    def _rebuild_rollups(self):
+        """Seed the rollup tiers from the stored history"""
+        longest = max(self.rollups.span(resolution) for resolution in self.rollups.tiers)
+        timestamps, columns = self.history.range(start=now_ms() - longest * 1000)
+        columns = dict(columns, energy=energy_increments(columns["energy"]))
+        self.rollups.add_many(timestamps, columns)
+
+    def clear(self, reset_energy=True):
+        """Reset the live buffers and the energy counter"""
+        with self._lock:
+            if reset_energy:
+                self.energy.reset()
+                self._checkpoint_locked()
+            n = self.max_points
+            self.voltage_data = deque([230 + random.uniform(-2, 2) for _ in range(n)], maxlen=n)
+            self.current_data = deque([50 + random.uniform(-5, 5) for _ in range(n)], maxlen=n)
+            self.power_data = deque([11500 + random.uniform(-500, 500) for _ in range(n)], maxlen=n)
+            self.energy_data = deque([i * 0.001 for i in range(n)], maxlen=n)
+            self.energy_consumption = self.energy.total
+            self.update_counter = 0
+            self._publish({
+                "voltage": 230.0,
+                "current": 50.0,
+                "power": 11500.0,
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+            })
+
+    def set_profiles(self, load_profiles):
+        """Apply load profile changes; the shared dict is updated in place"""
+        with self._lock:
+            if load_profiles is not self.load_profiles:
+                self.load_profiles.clear()
+                self.load_profiles.update(load_profiles)
+            self.simulator.set_profiles(self.load_profiles)
+            self.energy.set_loads(self.load_profiles)
+            if self.alert_rules is not None:
+                self._apply_alerts_locked(self.alert_rules, self.alert_params)
+
+    def set_alert_rules(self, rules, params):
+        """Evaluate ``rules`` on every sample, with limits resolved from ``params``.
+
+        ``rated_current`` is taken from the load profiles. Raises KeyError or
+        ValueError for invalid rules, leaving the previous rules in place.
+        Unchanged rules and parameters are a no-op, so the engine's cooldown
+        and sustain state carries over.
+        """
+        with self._lock:
+            if rules != self.alert_rules or params != self.alert_params:
+                self._apply_alerts_locked(rules, params)
+
+    def _apply_alerts_locked(self, rules, params):
+        """Recompile when the rules or loads changed, otherwise only re-resolve limits"""
+        channels = [TOTAL_CHANNEL] + list(self.load_profiles)
+        params_all = dict(params, rated_current={name: load["current"] for name, load in self.load_profiles.items()})
+        engine = self.alert_engine
+        if engine is None or engine.channels != channels or engine.rules != rules:
+            self.alert_engine = AlertRuleEngine(rules, channels, groups={"loads": channels[1:]}, params=params_all)
+        else:
+            engine.update_params(params_all)
+        self.alert_rules = [dict(rule) for rule in rules]
+        self.alert_params = dict(params)
+
+    def set_load_active(self, name, active):
+        """Switch one load on or off; the simulator arrays and meters are kept"""
+        with self._lock:
+            self.load_profiles[name]["active"] = active
+            self.simulator.set_active(self.simulator.names.index(name), active)
+
+    def subscribe(self, viewer_id):
+        """Register a viewer and make sure the worker is sampling"""
+        with self._lock:
+            self._subscribers[viewer_id] = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="acquisition", daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, viewer_id):
+        """Remove a viewer; sampling pauses once nobody is watching"""
+        with self._lock:
+            self._subscribers.pop(viewer_id, None)
+            if not self._subscribers:
+                self._go_idle_locked()
+
+    def is_running(self):
+        """Whether any viewer currently keeps the worker sampling"""
+        with self._lock:
+            return self._has_subscribers()
+
+    def _has_subscribers(self):
+        cutoff = time.monotonic() - self.subscriber_timeout
+        for viewer_id, last_seen in list(self._subscribers.items()):
+            if last_seen < cutoff:
+                del self._subscribers[viewer_id]
+        return bool(self._subscribers)
+
+    def snapshot(self, viewer_id=None):
+        """Latest published state; reading it keeps ``viewer_id`` subscribed"""
+        if viewer_id is not None and viewer_id in self._subscribers:
+            self._subscribers[viewer_id] = time.monotonic()
+        snapshot = self._snapshot
+        if "events" not in snapshot:
+            with self._lock:
+                snapshot = self._snapshot
+                if "events" not in snapshot:
+                    # First read since the sample: copy the buffers once for every viewer
+                    snapshot = dict(snapshot,
+                                    **{name: tuple(getattr(self, name)) for name in SERIES},
+                                    energy_by_period=self.energy.by_period(),
+                                    energy_by_load=self.energy.by_load(),
+                                    events=tuple(self.events))
+                    self._snapshot = snapshot
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self._lock:
+                    if not self._has_subscribers():
+                        self._go_idle_locked()
+                        continue
+                self.sample()
+            except Exception as e:
+                self._record_event("error", None, str(e))
+
+    def _go_idle_locked(self):
+        """Pause integration and flush once when sampling stops, not on every idle tick"""
+        if self._idle:
+            return
+        self._idle = True
+        self.energy.pause()
+        self._flush_locked()
+
+    def _record_event(self, kind, load_name, value):
+        with self._lock:
+            self.sequence += 1
+            self.events.append((self.sequence, kind, load_name, value))
+
+    def sample(self):
+        """Produce one sample and fan it out to the buffers, log and history"""
+        with self._lock:
+            self._idle = False
+            data = self.simulator.simulate_tick()
+            for kind, load_name, magnitude in data.pop("events"):
+                self._record_event(kind, load_name, magnitude)
+
+            self.voltage_data.append(data["voltage"])
+            self.current_data.append(data["current"])
+            self.power_data.append(data["power"])
+
+            # Trapezoidal energy over monotonic time, per load and tariff period
+            energy_increment = self.energy.add(data["power"], data.pop("load_power"))  # kWh
+            self.energy_consumption = self.energy.total
+            self.energy_data.append(self.energy_consumption)
+            if time.monotonic() - self._last_checkpoint >= CHECKPOINT_INTERVAL:
+                self._checkpoint_locked()
+            self._check_alerts_locked(data, data.pop("load_current"))
+
+            timestamp = now_ms()
+            self.rollups.add(timestamp, {
+                "voltage": data["voltage"],
+                "current": data["current"],
+                "power": data["power"],
+                "energy": energy_increment
+            })
+
+            if self.logging_enabled:
+                try:
+                    self.log_sink.write([data["timestamp"], data["voltage"], data["current"], data["power"], self.energy_consumption])
+                    self.history.append(timestamp, [data["voltage"], data["current"], data["power"], self.energy_consumption])
+                except Exception as e:
+                    self._record_event("error", None, f"Failed to log data: {str(e)}")
+
+            self.update_counter += 1
+            self._publish(data)
+
+    def _check_alerts_locked(self, data, load_current):
+        """Evaluate the alert rules on this sample (aggregate feed plus every load)"""
+        engine = self.alert_engine
+        if engine is None:
+            return
+        # Tick matrix: one row per channel, one column per quantity. Load rows
+        # come straight from the simulator's arrays, which follow the same
+        # load_profiles order as the engine's channels
+        active = self.simulator.active
+        values = np.full((len(engine.channels), len(QUANTITIES)), np.nan)
+        values[0] = [data["voltage"], data["current"], data["power"], self.energy_consumption,
+                     np.count_nonzero(active)]
+        if len(load_current) == len(engine.channels) - 1:
+            values[1:, QUANTITIES.index("current")] = load_current
+            values[1:, QUANTITIES.index("active_loads")] = active
+
+        for event in engine.evaluate(values, time.time()):
+            self._record_event("alert", None if event.channel == TOTAL_CHANNEL else event.channel, event)
+
+    def _publish(self, latest):
+        """Swap in a new immutable snapshot; ``snapshot`` fills in the series on first read"""
+        self.sequence += 1
+        self._snapshot = {
+            "sequence": self.sequence,
+            "latest": dict(latest),
+            "energy_consumption": self.energy_consumption,
+            "update_counter": self.update_counter
+        }
+
+    def flush(self):
+        """Write buffered log rows and history to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self.log_sink.flush()
+        self.history.flush()
+        self._checkpoint_locked()
+
+    def _checkpoint_locked(self):
+        self._last_checkpoint = time.monotonic()
+        try:
+            self.energy.save(self.checkpoint_path)
+        except OSError as e:
+            self._record_event("error", None, f"Failed to checkpoint energy: {str(e)}")
+
+    def close(self):
+        """Stop the worker and close the log and history files"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+        with self._lock:
+            self._checkpoint_locked()
+            self.log_sink.close()
+            self.history.close()
@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+
+from lazy_imports import optional_import
+
+# Optional and imported on first use (None when not installed)
+winsound = optional_import("winsound")
+pyttsx3 = optional_import("pyttsx3")
+
+# Defaults
+QUEUE_SIZE = 8           # distinct alerts waiting to be played
+REPEAT_INTERVAL = 5.0    # seconds before the same alert key is announced again
+BEEP_FREQUENCY = 1000    # Hz
+BEEP_DURATION = 1000     # ms
+SPEECH_RATE = 150
+MAX_TRACKED_KEYS = 256
+
+
+class NullBackend:
+    """Headless backend that only records what would have been played"""
+
+    def __init__(self):
+        self.played = []
+
+    def beep(self):
+        self.played.append(("beep", None))
+
+    def speak(self, message):
+        self.played.append(("speak", message))
+
+
+class SystemBackend:
+    """``winsound`` beeps and ``pyttsx3`` speech; whichever is missing is skipped.
+
+    The speech engine is created on first use, i.e. on the dispatcher's
+    worker thread, since pyttsx3 engines must stay on the thread that
+    created them.
+    """
+
+    def __init__(self, rate=SPEECH_RATE):
+        self.rate = rate
+        self._engine = None
+
+    def beep(self):
+        if winsound is not None:
+            winsound.Beep(BEEP_FREQUENCY, BEEP_DURATION)
+
+    def speak(self, message):
+        if pyttsx3 is None:
+            return
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", self.rate)
+        self._engine.say(message)
+        self._engine.runAndWait()
+
+
+def default_backend():
+    """System sound/speech where available, otherwise the null backend"""
+    if winsound is None and pyttsx3 is None:
+        return NullBackend()
+    return SystemBackend()
+
+
+class AlertDispatcher:
+    """Plays sound and voice alerts on one worker thread behind a bounded queue.
+
+    ``notify`` never blocks the caller. Alerts are identified by ``key``
+    (the message itself by default): a key that is already waiting is
+    merged into the queued entry, which keeps the newest text, and a key
+    announced less than ``repeat_interval`` seconds ago is skipped. Once
+    ``maxsize`` distinct alerts are waiting, new ones are dropped and
+    summarised in a single "N more alerts" announcement.
+    """
+
+    def __init__(self, backend=None, maxsize=QUEUE_SIZE, repeat_interval=REPEAT_INTERVAL):
+        self.backend = backend if backend is not None else default_backend()
+        self.maxsize = maxsize
+        self.repeat_interval = repeat_interval
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()   # key -> [message, sound, voice]
+        self._last_played = {}
+        self._overflow = 0
+        self._overflow_voice = False
+        self._closed = False
+        self._thread = None
+
+    def notify(self, message, key=None, sound=True, voice=False):
+        """Queue an alert; returns False if it was merged, skipped or dropped"""
+        if not (sound or voice):
+            return False
+        key = message if key is None else key
+        with self._cond:
+            if self._closed:
+                return False
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending[0] = message
+                pending[1] = pending[1] or sound
+                pending[2] = pending[2] or voice
+                self.merged += 1
+                return False
+            last = self._last_played.get(key)
+            if last is not None and time.monotonic() - last < self.repeat_interval:
+                self.merged += 1
+                return False
+            if len(self._pending) >= self.maxsize:
+                self._overflow += 1
+                self._overflow_voice = self._overflow_voice or voice
+                self.dropped += 1
+                return False
+
+            self._pending[key] = [message, sound, voice]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return True
+
+    def pending(self):
+        """Number of alerts waiting to be played"""
+        with self._cond:
+            return len(self._pending)
+
+    def _next(self):
+        """Block until there is something to play; None once closed"""
+        with self._cond:
+            while not self._pending and not self._overflow and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            if self._pending:
+                key, (message, sound, voice) = self._pending.popitem(last=False)
+                self._remember(key)
+                return message, sound, voice
+            message = f"{self._overflow} more alerts"
+            voice = self._overflow_voice
+            self._overflow = 0
+            self._overflow_voice = False
+            return message, True, voice
+
+    def _remember(self, key):
+        now = time.monotonic()
+        self._last_played[key] = now
+        if len(self._last_played) > MAX_TRACKED_KEYS:
+            cutoff = now - self.repeat_interval
+            self._last_played = {k: t for k, t in self._last_played.items() if t >= cutoff}
+
+    def _run(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            message, sound, voice = item
+            try:
+                if sound:
+                    self.backend.beep()
+                if voice:
+                    self.backend.speak(message)
+                self.played += 1
+            except Exception:
+                self.errors += 1
+
+    def close(self, timeout=1.0):
+        """Discard waiting alerts and stop the worker"""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._overflow = 0
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
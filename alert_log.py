@@ -0,0 +1,153 @@
+import datetime
+import enum
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Defaults
+ALERT_CAPACITY = 200
+
+
+class AlertLevel(enum.IntEnum):
+    INFO = 0
+    WARNING = 1
+    ERROR = 2
+
+
+# Display text per alert kind; only formatted when an alert is shown or exported.
+# "message" alerts carry their full text in ``subject``.
+ALERT_MESSAGES = {
+    "message": "{subject}",
+    "high_voltage": "⚠️ HIGH VOLTAGE: {value}V (Limit: {limit}V)",
+    "low_voltage": "⚠️ LOW VOLTAGE: {value}V (Minimum: {limit:g}V)",
+    "high_current": "⚠️ HIGH CURRENT: {value}A (Limit: {limit}A)",
+    "low_current": "⚠️ LOW CURRENT: {value}A with loads active (Minimum: {limit:g}A)",
+    "high_power": "⚠️ HIGH POWER: {value}W (Limit: {limit}W)",
+    "low_power": "⚠️ LOW POWER: {value}W with loads active (Minimum: {limit:g}W)",
+    "power_ramp": "⚠️ POWER RAMP: {value:.0f} W/s (Limit: {limit:g} W/s)",
+    "load_overcurrent": "⚠️ OVERCURRENT on {subject}: {value:.1f}A (Limit: {limit:.1f}A)",
+    "budget_exceeded": "🚨 ENERGY BUDGET EXCEEDED: {value:.2f}/{limit} kWh",
+    "budget_warning": "⚠️ ENERGY BUDGET WARNING: {value:.2f} kWh used (warning level {limit:.2f} kWh)",
+    "voltage_spike": "Voltage fluctuation detected: {value:.1f}V",
+    "current_spike": "Current spike in {subject}: +{value:.1f}A"
+}
+ALERT_KINDS = list(ALERT_MESSAGES)
+KIND_IDS = {kind: i for i, kind in enumerate(ALERT_KINDS)}
+
+
+def register_alert_kind(kind, message=None):
+    """Add an alert kind (e.g. from a configured rule) or replace its message"""
+    if kind not in KIND_IDS:
+        KIND_IDS[kind] = len(ALERT_KINDS)
+        ALERT_KINDS.append(kind)
+        ALERT_MESSAGES[kind] = message or f"⚠️ {kind.replace('_', ' ').upper()} on {{subject}}: {{value:g}} (Limit: {{limit:g}})"
+    elif message:
+        ALERT_MESSAGES[kind] = message
+
+
+def alert_message(kind, value=np.nan, limit=np.nan, subject=None):
+    """Message text for an alert of ``kind``"""
+    return ALERT_MESSAGES[kind].format(value=value, limit=limit, subject=subject)
+
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "f8"),    # epoch seconds
+    ("level", "i1"),
+    ("kind", "i2"),
+    ("value", "f8"),
+    ("limit", "f8")
+])
+
+AlertRecord = namedtuple("AlertRecord", ["timestamp", "level", "kind", "value", "limit", "subject"])
+
+
+def format_alert(record):
+    """Display line for an ``AlertRecord``: ``[time] [LEVEL] message``"""
+    timestamp = datetime.datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    message = alert_message(record.kind, record.value, record.limit, record.subject)
+    return f"[{timestamp}] [{record.level.name}] {message}"
+
+
+class AlertLog:
+    """Fixed-capacity ring buffer of typed alert records.
+
+    Numeric fields live in one structured NumPy array and the optional
+    subject (load name or free text) in a parallel object array. Per-level
+    counters are adjusted on insert and eviction, so summaries are O(1),
+    and text is only produced by ``format_alert`` when a record is shown.
+    """
+
+    def __init__(self, capacity=ALERT_CAPACITY):
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self._subjects = np.empty(capacity, dtype=object)
+        self._counts = np.zeros(len(AlertLevel), dtype=np.int64)
+        self._next = 0
+        self._size = 0
+
+    def append(self, level, kind, value=np.nan, limit=np.nan, subject=None, timestamp=None):
+        """Record an alert; the oldest one is overwritten once the log is full"""
+        level = AlertLevel(level)
+        slot = self._next
+        if self._size == self.capacity:
+            self._counts[self._records["level"][slot]] -= 1
+        else:
+            self._size += 1
+        self._records[slot] = (time.time() if timestamp is None else timestamp, level, KIND_IDS[kind], value, limit)
+        self._subjects[slot] = subject
+        self._counts[level] += 1
+        self._next = (slot + 1) % self.capacity
+
+    def count(self, level=None):
+        """Number of stored alerts, optionally of one level"""
+        return self._size if level is None else int(self._counts[level])
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._subjects[:] = None
+        self._counts[:] = 0
+        self._next = 0
+        self._size = 0
+
+    def _order(self):
+        """Slot indices from oldest to newest"""
+        start = (self._next - self._size) % self.capacity
+        return (start + np.arange(self._size)) % self.capacity
+
+    def records(self, last=None, newest_first=False):
+        """Stored alerts as ``AlertRecord`` tuples, oldest first by default"""
+        order = self._order()
+        if last is not None:
+            order = order[-last:] if last else order[:0]
+        if newest_first:
+            order = order[::-1]
+        rows = self._records[order]
+        return [
+            AlertRecord(float(row["timestamp"]), AlertLevel(int(row["level"])), ALERT_KINDS[row["kind"]],
+                        float(row["value"]), float(row["limit"]), subject)
+            for row, subject in zip(rows, self._subjects[order])
+        ]
+
+    def columns(self):
+        """Stored alerts oldest first as ``{field: array}`` for export; timestamps in epoch seconds"""
+        order = self._order()
+        rows = self._records[order]
+        subjects = self._subjects[order]
+        kinds = np.array(ALERT_KINDS, dtype=object)[rows["kind"]]
+        levels = np.array([level.name for level in AlertLevel], dtype=object)[rows["level"]]
+        messages = [
+            alert_message(kind, value, limit, subject)
+            for kind, value, limit, subject in zip(kinds, rows["value"].tolist(), rows["limit"].tolist(), subjects)
+        ]
+        return {
+            "timestamp": rows["timestamp"],
+            "level": levels,
+            "kind": kinds,
+            "value": rows["value"],
+            "limit": rows["limit"],
+            "subject": subjects,
+            "message": np.array(messages, dtype=object)
+        }
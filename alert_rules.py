@@ -0,0 +1,232 @@
+import fnmatch
+from collections import namedtuple
+
+import numpy as np
+
+from alert_log import AlertLevel, register_alert_kind
+
+# Quantities a tick matrix carries per channel, in column order
+QUANTITIES = ("voltage", "current", "power", "energy", "active_loads")
+TOTAL_CHANNEL = "Total"
+RULE_TYPES = ("threshold", "rate")
+OPERATORS = {">": (1.0, False), ">=": (1.0, True), "<": (-1.0, False), "<=": (-1.0, True)}
+
+# The threshold alerts every front end raises, exactly as the original
+# if-chains did (low voltage only when not high, the budget warning only
+# while not exceeded). A limit or cooldown may be a number, a parameter name
+# (a number or a {channel: value} mapping supplied by the front end) or a
+# {channel: value} mapping.
+DEFAULT_ALERT_RULES = [
+    {"name": "high_voltage", "quantity": "voltage", "channels": TOTAL_CHANNEL, "op": ">",
+     "limit": "voltage_threshold", "level": "warning"},
+    {"name": "low_voltage", "quantity": "voltage", "channels": TOTAL_CHANNEL, "op": "<",
+     "limit": "low_voltage_threshold", "unless": "high_voltage", "level": "warning"},
+    {"name": "high_current", "quantity": "current", "channels": TOTAL_CHANNEL, "op": ">",
+     "limit": "current_threshold", "level": "warning"},
+    {"name": "high_power", "quantity": "power", "channels": TOTAL_CHANNEL, "op": ">",
+     "limit": "power_threshold", "level": "warning"},
+    {"name": "budget_exceeded", "quantity": "energy", "channels": TOTAL_CHANNEL, "op": ">=",
+     "limit": "energy_budget", "level": "error"},
+    {"name": "budget_warning", "quantity": "energy", "channels": TOTAL_CHANNEL, "op": ">=",
+     "limit": "energy_budget", "scale": 0.9, "unless": "budget_exceeded", "level": "warning"}
+]
+
+# Further rules a front end or load_config.json ("extra_alert_rules") can
+# switch on by name
+OPTIONAL_ALERT_RULES = {rule["name"]: rule for rule in [
+    {"name": "low_current", "quantity": "current", "channels": TOTAL_CHANNEL, "op": "<",
+     "limit": 0.1, "requires": "active_loads", "unless": "high_current", "level": "warning"},
+    {"name": "low_power", "quantity": "power", "channels": TOTAL_CHANNEL, "op": "<",
+     "limit": 50.0, "requires": "active_loads", "unless": "high_power", "level": "warning"},
+    {"name": "power_ramp", "type": "rate", "quantity": "power", "channels": TOTAL_CHANNEL, "op": ">",
+     "limit": 10000.0, "level": "info"},
+    {"name": "load_overcurrent", "quantity": "current", "channels": "loads", "op": ">",
+     "limit": "rated_current", "scale": 1.3, "hysteresis": 2.0, "sustain": 3.0, "level": "warning"}
+]}
+
+AlertEvent = namedtuple("AlertEvent", ["kind", "level", "channel", "value", "limit"])
+
+
+def alert_rule_set(base, extra=()):
+    """``base`` rules plus ``extra`` entries: names from ``OPTIONAL_ALERT_RULES`` or rule dicts"""
+    rules = [dict(rule) for rule in base]
+    for entry in extra:
+        if isinstance(entry, str):
+            if entry not in OPTIONAL_ALERT_RULES:
+                raise KeyError(f"unknown optional alert rule '{entry}'")
+            entry = OPTIONAL_ALERT_RULES[entry]
+        rules.append(dict(entry))
+    return rules
+
+
+class AlertRuleEngine:
+    """Declarative alert rules compiled into flat NumPy state arrays.
+
+    Every (rule, channel) pair becomes one slot with its own limit,
+    comparison sign, hysteresis band, sustain time and cooldown, plus the
+    per-slot state (latched, breach start, last fired, previous value for
+    rate rules). ``evaluate`` gathers a whole ``channels x quantities``
+    tick matrix into the slots and decides every rule on every channel with
+    a fixed number of array operations, so the cost per tick does not
+    depend on Python loops over channels.
+
+    Rule fields: ``name`` (alert kind), ``quantity``, ``channels`` (a group
+    name, a glob pattern or a list of either), ``type`` ("threshold" or
+    "rate", per second), ``op``, ``limit`` with optional ``scale``,
+    ``hysteresis``, ``sustain`` (seconds), ``cooldown`` (seconds, defaults
+    to the ``alert_cooldown`` parameter), ``requires`` (a quantity that must
+    be positive), ``unless`` (a rule that suppresses this one on the same
+    channel), ``level`` and an optional ``message`` template.
+    """
+
+    def __init__(self, rules, channels, quantities=QUANTITIES, groups=None, params=None):
+        self.rules = [dict(rule) for rule in rules]
+        self.channels = list(channels)
+        self.quantities = list(quantities)
+        self._position = {name: i for i, name in enumerate(self.channels)}
+        self._compile(groups or {})
+        self.update_params(params or {})
+        self.reset()
+
+    def _select(self, spec, groups):
+        """Channel indices named by a group, a glob pattern or a list of them"""
+        specs = [spec] if isinstance(spec, str) else list(spec)
+        selected = []
+        for item in specs:
+            names = groups[item] if item in groups else fnmatch.filter(self.channels, item)
+            selected.extend(self._position[name] for name in names if name in self._position)
+        return list(dict.fromkeys(selected))
+
+    def _compile(self, groups):
+        kinds, levels, channel_idx, quantity_idx, requires_idx = [], [], [], [], []
+        signs, inclusive, is_rate, hysteresis, sustain = [], [], [], [], []
+        self._rule_slots = []
+        slot_of = {}
+
+        for rule in self.rules:
+            name = rule["name"]
+            rule_type = rule.get("type", "threshold")
+            if rule_type not in RULE_TYPES:
+                raise ValueError(f"Rule '{name}': unknown type '{rule_type}'")
+            if rule.get("op", ">") not in OPERATORS:
+                raise ValueError(f"Rule '{name}': unknown operator '{rule.get('op')}'")
+            if rule["quantity"] not in self.quantities:
+                raise ValueError(f"Rule '{name}': unknown quantity '{rule['quantity']}'")
+            register_alert_kind(name, rule.get("message"))
+
+            sign, closed = OPERATORS[rule.get("op", ">")]
+            requires = rule.get("requires")
+            first = len(kinds)
+            for channel in self._select(rule.get("channels", "*"), groups):
+                slot_of[(name, channel)] = len(kinds)
+                kinds.append(name)
+                levels.append(AlertLevel[rule.get("level", "warning").upper()])
+                channel_idx.append(channel)
+                quantity_idx.append(self.quantities.index(rule["quantity"]))
+                requires_idx.append(-1 if requires is None else self.quantities.index(requires))
+                signs.append(sign)
+                inclusive.append(closed)
+                is_rate.append(rule_type == "rate")
+                hysteresis.append(float(rule.get("hysteresis", 0.0)))
+                sustain.append(float(rule.get("sustain", 0.0)))
+            self._rule_slots.append(slice(first, len(kinds)))
+
+        # Suppressing rule on the same channel, or -1
+        unless = [
+            slot_of.get((rule["unless"], channel), -1) if "unless" in rule else -1
+            for rule, slots in zip(self.rules, self._rule_slots)
+            for channel in channel_idx[slots]
+        ]
+
+        self.kinds = np.array(kinds, dtype=object)
+        self.levels = np.array(levels, dtype=object)
+        self.channel_idx = np.array(channel_idx, dtype=np.intp)
+        self.slot_channels = np.array([self.channels[i] for i in channel_idx], dtype=object)
+        self.quantity_idx = np.array(quantity_idx, dtype=np.intp)
+        self.requires_idx = np.array(requires_idx, dtype=np.intp)
+        self.signs = np.array(signs)
+        self.inclusive = np.array(inclusive, dtype=bool)
+        self.is_rate = np.array(is_rate, dtype=bool)
+        self.hysteresis = np.array(hysteresis)
+        self.sustain = np.array(sustain)
+        self.unless = np.array(unless, dtype=np.intp)
+        self._has_rate = bool(self.is_rate.any())
+        self._has_requires = bool((self.requires_idx >= 0).any())
+        self._has_unless = bool((self.unless >= 0).any())
+        self._has_inclusive = bool(self.inclusive.any())
+        self._has_hysteresis = bool(self.hysteresis.any())
+        self._has_sustain = bool(self.sustain.any())
+        self.limits = np.zeros(len(kinds))
+        self.cooldowns = np.zeros(len(kinds))
+
+    def __len__(self):
+        return self.kinds.size
+
+    def _resolve(self, value, params, slots, default=0.0):
+        """Per-slot values for a number, a parameter name or a channel mapping"""
+        if isinstance(value, str):
+            value = params.get(value, default)
+        if isinstance(value, dict):
+            names = [self.channels[i] for i in self.channel_idx[slots]]
+            return np.array([float(value.get(name, np.nan)) for name in names])
+        return float(value)
+
+    def update_params(self, params):
+        """Re-resolve limits and cooldowns from named parameters; state is kept"""
+        for rule, slots in zip(self.rules, self._rule_slots):
+            self.limits[slots] = self._resolve(rule["limit"], params, slots, np.nan) * rule.get("scale", 1.0)
+            self.cooldowns[slots] = self._resolve(rule.get("cooldown", "alert_cooldown"), params, slots)
+        self.params = dict(params)
+
+    def reset(self):
+        """Clear latches, sustain timers, cooldowns and rate history"""
+        n = len(self)
+        self.latched = np.zeros(n, dtype=bool)
+        self.breach_since = np.full(n, np.nan)
+        self.last_fired = np.full(n, -np.inf)
+        self.previous = np.full(n, np.nan)
+        self.previous_time = None
+
+    def evaluate(self, values, now):
+        """Evaluate one tick matrix (channels x quantities); returns fired ``AlertEvent``s"""
+        values = np.asarray(values, dtype=np.float64)
+        x = values[self.channel_idx, self.quantity_idx]
+
+        if self._has_rate:
+            raw = x
+            if self.previous_time is None or now <= self.previous_time:
+                rate = np.full_like(x, np.nan)
+            else:
+                rate = (x - self.previous) / (now - self.previous_time)
+            x = np.where(self.is_rate, rate, x)
+            self.previous = raw
+            self.previous_time = now
+
+        # Positive margin means the limit is crossed in the rule's direction
+        margin = self.signs * (x - self.limits)
+        condition = margin > 0
+        if self._has_inclusive:
+            condition |= self.inclusive & (margin == 0)
+        # A latched slot only clears once it is back past the hysteresis band
+        if self._has_hysteresis:
+            condition |= self.latched & (margin > -self.hysteresis)
+        if self._has_requires:
+            enabled = values[self.channel_idx, np.maximum(self.requires_idx, 0)] > 0
+            condition &= (self.requires_idx < 0) | enabled
+        if self._has_unless:
+            condition &= ~((self.unless >= 0) & condition[np.maximum(self.unless, 0)])
+        self.latched = condition
+
+        fire = condition & (now - self.last_fired >= self.cooldowns)
+        if self._has_sustain:
+            self.breach_since = np.where(condition, np.fmin(self.breach_since, now), np.nan)
+            fire &= now - self.breach_since >= self.sustain
+        slots = np.flatnonzero(fire)
+        if not slots.size:
+            return []
+        self.last_fired[slots] = now
+        # Gather every field once, then zip; no per-event array indexing
+        return list(map(AlertEvent._make, zip(
+            self.kinds[slots], self.levels[slots], self.slot_channels[slots],
+            x[slots].tolist(), self.limits[slots].tolist()
+        )))
@@ -0,0 +1,90 @@
+# Defaults
+SMOOTHING = 0.1       # EWMA weight of the newest sample in the mean
+SCALE_SMOOTHING = 0.01  # ... and in the deviation; a slow scale keeps z-scores near-normal
+THRESHOLD = 3.5       # robust z-score that flags a sample
+WARMUP = 30           # samples seen before anything is flagged
+MIN_SCALE = 1e-6
+MAD_TO_SIGMA = 1.2533  # mean absolute deviation -> standard deviation (normal data)
+
+
+class StreamingAnomalyDetector:
+    """Online robust z-score detector over EWMA residuals.
+
+    Each feature keeps an exponentially weighted mean and mean absolute
+    deviation, so ``update`` costs O(1) per sample regardless of history
+    length. A sample is scored against the statistics from *before* it
+    arrived; residuals are clipped at ``threshold`` deviations when folded
+    back in, so a single spike barely moves the baseline while a lasting
+    level shift is adopted within a few samples. The deviation is averaged
+    over a much longer window than the mean: a scale estimated from only a
+    few residuals is noisy and roughly doubles the false alarms.
+    """
+
+    def __init__(self, features, alpha=SMOOTHING, threshold=THRESHOLD, warmup=WARMUP,
+                 scale_alpha=SCALE_SMOOTHING):
+        self.features = list(features)
+        self.alpha = alpha
+        self.scale_alpha = scale_alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.anomalies = 0
+        self._mean = [0.0] * len(self.features)
+        self._mad = [0.0] * len(self.features)
+
+    def update(self, sample):
+        """Score one sample (a mapping of feature values) and learn from it.
+
+        Returns ``(is_anomaly, scores)`` where ``scores`` maps each feature
+        to its robust z-score.
+        """
+        self.count += 1
+        # Plain running averages until the EWMA windows have filled
+        alpha = max(self.alpha, 1.0 / self.count)
+        # (the first sample only seeds the mean, so residuals start one later)
+        scale_alpha = max(self.scale_alpha, 1.0 / max(self.count - 1, 1))
+        scores = {}
+        flagged = False
+        for i, name in enumerate(self.features):
+            x = float(sample[name])
+            if self.count == 1:
+                self._mean[i] = x
+                scores[name] = 0.0
+                continue
+            residual = x - self._mean[i]
+            scale = max(self._mad[i] * MAD_TO_SIGMA, MIN_SCALE * max(abs(self._mean[i]), 1.0))
+            score = abs(residual) / scale
+            scores[name] = score
+            if self.count > self.warmup and score > self.threshold:
+                flagged = True
+
+            # Huber-style update: outliers contribute at most `threshold` deviations
+            if self.count > self.warmup:
+                limit = self.threshold * scale
+                residual = max(-limit, min(limit, residual))
+            self._mean[i] += alpha * residual
+            self._mad[i] += scale_alpha * (abs(residual) - self._mad[i])
+
+        if flagged:
+            self.anomalies += 1
+        return flagged, scores
+
+    def baseline(self):
+        """Current ``{feature: (mean, sigma)}`` estimates"""
+        return {
+            name: (self._mean[i], self._mad[i] * MAD_TO_SIGMA)
+            for i, name in enumerate(self.features)
+        }
+
+    def __len__(self):
+        return self.count
+
+
+def worst_feature(scores):
+    """Feature name with the highest score, or None when ``scores`` is empty"""
+    if not scores:
+        return None
+    return max(scores, key=scores.get)
@@ -1,19 +1,64 @@
+from lazy_imports import startup_profiler, lazy_import
+startup_profiler.start_if_requested()  # streamlit run app.py -- --profile-startup, or PROFILE_STARTUP=1
+
 import streamlit as st
-from collections import deque
-import matplotlib.pyplot as plt
-import random
 import datetime
 import time
-import csv
 import json
 import os
-import pandas as pd
+import numpy as np
+import uuid
+from acquisition import AcquisitionService
+from energy_integrator import tariff_period
+from exporters import EXPORT_FORMATS, available_formats, export_bytes, sample_timestamps
+from alert_log import AlertLevel, AlertLog, format_alert
+from alert_rules import DEFAULT_ALERT_RULES, alert_rule_set
+from timeseries_store import now_ms, to_local_datetime64
+
+# Deferred: not needed for the login page
+pd = lazy_import("pandas")
+chart_cache = lazy_import("chart_cache")  # matplotlib
 
 # Constants
 CONFIG_FILE = "load_config.json"
 DATA_LOG_FILE = "load_data_log.csv"
+HISTORY_DIR = "load_history"
 MAX_DATA_POINTS = 200
+MAX_ALERTS = 200
 UPDATE_INTERVAL = 1.0  # seconds
+LIVE_REFRESH_INTERVAL = 2.0  # seconds between live panel refreshes
+TARIFF_PERIOD_LABELS = {
+    "peak": "Peak Hours (8AM-8PM)",
+    "off_peak": "Off-Peak Hours (12AM-6AM)",
+    "shoulder": "Shoulder Hours (6AM-8AM, 8PM-12AM)"
+}
+# History windows: (span in seconds, rollup resolution or None for raw samples)
+HISTORY_WINDOWS = {
+    "Live (last 200 samples)": None,
+    "Last hour": (3600, None),
+    "Last 24 hours": (86400, 60),
+    "Last 7 days": (7 * 86400, 900),
+    "Last 30 days": (30 * 86400, 3600)
+}
+# Graph selector entries: (series column, threshold attribute, low threshold attribute, chart spec)
+GRAPH_SPECS = {
+    "🔌 Voltage": ("voltage", "voltage_threshold", "low_voltage_threshold", {
+        "title": "Voltage Over Time", "ylabel": "Voltage (V)", "label": "Voltage (V)", "color": "blue",
+        "limit_label": "Threshold ({}V)", "reference": (230, "Nominal (230V)"), "ylim": (150, 300)
+    }),
+    "⚡ Current": ("current", "current_threshold", None, {
+        "title": "Current Over Time", "ylabel": "Current (A)", "label": "Current (A)", "color": "orange",
+        "limit_label": "Threshold ({}A)"
+    }),
+    "🔥 Power": ("power", "power_threshold", None, {
+        "title": "Power Over Time", "ylabel": "Power (W)", "label": "Power (W)", "color": "red",
+        "limit_label": "Threshold ({}W)"
+    }),
+    "🔋 Energy": ("energy", "energy_budget", None, {
+        "title": "Cumulative Energy Consumption", "ylabel": "Energy (kWh)", "label": "Energy Consumption (kWh)",
+        "color": "purple", "limit_label": "Budget ({} kWh)"
+    })
+}
 
 class LoadManagementSystem:
     def __init__(self):
@@ -32,6 +77,7 @@ class LoadManagementSystem:
         
         # Thresholds - Initialize with safe defaults
         self.voltage_threshold = 250.0
+        self.low_voltage_threshold = 200.0
         self.current_threshold = 150.0
         self.power_threshold = 30000.0
         self.energy_budget = 1000.0
@@ -49,37 +95,38 @@ class LoadManagementSystem:
         self.voice_alerts = False
         self.alert_cooldown = 10
         
-        # Alert control
-        self.last_alert_time = {}
+        # Alert rules (evaluated once per sample by the acquisition service);
+        # extra rules from load_config.json are added to the defaults
+        self.extra_alert_rules = []
+        
+        # Shared acquisition service (attached once the configuration is loaded)
+        self.service = None
         
         # Load configuration
         self.load_config()
+        
+        # Every session views the same process-wide acquisition worker; its
+        # load profiles, buffers, history and rollups are shared
+        self.service = get_acquisition_service(self.load_profiles)
+        self.load_profiles = self.service.load_profiles
+        self.service.logging_enabled = self.logging_enabled
+        self.sync_alert_rules()
+        st.session_state.snapshot = self.service.snapshot()
 
     def _init_session_state(self):
         """Initialize all required session state variables"""
         if 'system_initialized' not in st.session_state:
             st.session_state.system_initialized = True
             st.session_state.monitoring = False
-            st.session_state.alerts = []
-            st.session_state.latest_data = {
-                "voltage": 230.0,
-                "current": 50.0,
-                "power": 11500.0,
-                "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            st.session_state.alerts = AlertLog(MAX_ALERTS)
             st.session_state.login_attempts = 0
             st.session_state.locked_out = False
             st.session_state.lockout_time = None
-            st.session_state.data_update_counter = 0
             
-            # Initialize data storage in session state
-            st.session_state.voltage_data = deque([230 + random.uniform(-5, 5) for _ in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-            st.session_state.current_data = deque([50 + random.uniform(-10, 10) for _ in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-            st.session_state.power_data = deque([11500 + random.uniform(-1000, 1000) for _ in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-            st.session_state.energy_data = deque([i * 0.001 for i in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-            st.session_state.energy_consumption = 0.1
+            # Viewer identity for the shared acquisition service
+            st.session_state.viewer_id = uuid.uuid4().hex
+            st.session_state.last_seen_sequence = 0
             st.session_state.start_time = datetime.datetime.now()
-            st.session_state.last_update_time = time.time()
 
     def authenticate(self, username, password):
         """Enhanced authentication with lockout after failed attempts"""
@@ -132,10 +179,6 @@ class LoadManagementSystem:
         st.markdown(f"**Logged in as:** admin | **Status:** {'🟢 RUNNING' if st.session_state.monitoring else '🔴 STOPPED'}")
         st.markdown("---")
         
-        # Update data if monitoring is active
-        if st.session_state.monitoring:
-            self.update_simulation_data()
-        
         # Create tabs
         tabs = st.tabs(["📊 Monitoring", "🎛️ Load Control", "💰 Energy & Cost", "⚠️ Alerts", "⚙️ Settings"])
         
@@ -161,51 +204,35 @@ class LoadManagementSystem:
         status_color = "green" if st.session_state.monitoring else "red"
         st.sidebar.markdown(f"**Monitoring:** :{status_color}[{status_text}]")
         st.sidebar.markdown("**System:** Prototype✅")
-        st.sidebar.markdown(f"**Data Updates:** {st.session_state.data_update_counter}")
-        st.sidebar.markdown(f"**Energy Consumed:** {st.session_state.energy_consumption:.3f} kWh")
-        
-        # Auto-refresh when monitoring
-        if st.session_state.monitoring:
-            time.sleep(2)  # 2 second refresh rate
-            st.rerun()
+        st.sidebar.markdown(f"**Data Updates:** {st.session_state.snapshot['update_counter']}")
+        st.sidebar.markdown(f"**Energy Consumed:** {st.session_state.snapshot['energy_consumption']:.3f} kWh")
         
         # Logout button
         if st.sidebar.button("🚪 Logout", type="secondary"):
             self.stop_monitoring()
+            self.close_charts()
             self.authenticated = False
             st.rerun()
     
+    def close_charts(self):
+        """Release this session's cached figures"""
+        charts = st.session_state.pop('charts', None)
+        if charts is not None:
+            charts.close()
+    
     def update_simulation_data(self):
-        """Update simulation data in real-time"""
-        current_time = time.time()
-        
-        # Only update if enough time has passed
-        if current_time - st.session_state.last_update_time >= UPDATE_INTERVAL:
-            # Generate new data
-            data = self.simulate_realistic_data()
-            
-            # Update data collections
-            st.session_state.voltage_data.append(data["voltage"])
-            st.session_state.current_data.append(data["current"])
-            st.session_state.power_data.append(data["power"])
-            
-            # Calculate energy consumption
-            time_diff = current_time - st.session_state.last_update_time
-            energy_increment = (data["power"] / 1000) * (time_diff / 3600)  # kWh
-            st.session_state.energy_consumption += energy_increment
-            st.session_state.energy_data.append(st.session_state.energy_consumption)
-            
-            # Update latest data
-            st.session_state.latest_data = data
-            st.session_state.data_update_counter += 1
-            st.session_state.last_update_time = current_time
-            
-            # Check for alerts
-            self.check_alerts(data)
-            
-            # Log data if enabled
-            if self.logging_enabled:
-                self.log_data(data)
+        """Pick up the latest sample from the shared acquisition service"""
+        self.sync_alert_rules()
+        snapshot = self.service.snapshot(st.session_state.viewer_id)
+        st.session_state.snapshot = snapshot
+        
+        # Only new samples need work; reading an unchanged snapshot is O(1).
+        # Alerts were evaluated by the worker on every sample and arrive as events
+        if snapshot["sequence"] > st.session_state.last_seen_sequence:
+            for sequence, kind, load_name, value in snapshot["events"]:
+                if sequence > st.session_state.last_seen_sequence:
+                    self.log_event(kind, load_name, value)
+            st.session_state.last_seen_sequence = snapshot["sequence"]
     
     def create_monitoring_tab(self):
         """Create the monitoring tab with graphs and real-time data"""
@@ -230,45 +257,50 @@ class LoadManagementSystem:
             if st.button("🗑️ Clear Data"):
                 self.clear_data()
         
+        # The live panel refreshes itself on a timer as a fragment, so the other
+        # tabs and the control/settings widgets are not rebuilt every refresh
+        refresh = LIVE_REFRESH_INTERVAL if st.session_state.monitoring else None
+        st.fragment(self.create_live_panel, run_every=refresh)()
+    
+    def create_live_panel(self):
+        """Create the live metrics, health indicators and selected graph"""
+        # Update data if monitoring is active
+        if st.session_state.monitoring:
+            self.update_simulation_data()
+        
         # Real-time data display
         st.subheader("⚡ Live Electrical Parameters")
         data_col1, data_col2, data_col3, data_col4, data_col5 = st.columns(5)
         
-        # Calculate current rate and cost
-        current_hour = datetime.datetime.now().hour
-        if 8 <= current_hour < 20:  # Peak hours
-            rate = self.tariff_rates["peak"]
-            period = "Peak (8AM-8PM)"
-        elif 0 <= current_hour < 6:  # Off-peak hours
-            rate = self.tariff_rates["off_peak"]
-            period = "Off-Peak (12AM-6AM)"
-        else:  # Shoulder hours
-            rate = self.tariff_rates["shoulder"]
-            period = "Shoulder"
+        # Current rate; cost prices each tariff period's energy at its own rate
+        period = tariff_period()
+        rate = self.tariff_rates[period]
         
-        cost = st.session_state.energy_consumption * rate
+        snapshot = st.session_state.snapshot
+        energy_consumption = snapshot["energy_consumption"]
+        cost = self.energy_cost(snapshot)
         
         with data_col1:
-            voltage = st.session_state.latest_data['voltage']
+            voltage = snapshot["latest"]['voltage']
             delta_v = "normal" if 200 <= voltage <= 250 else "inverse"
             st.metric("Voltage", f"{voltage} V", delta=f"{voltage-230:.1f}V", delta_color=delta_v)
         
         with data_col2:
-            current = st.session_state.latest_data['current']
+            current = snapshot["latest"]['current']
             delta_c = "normal" if current <= 100 else "inverse"
             st.metric("Current", f"{current} A", delta=f"{current-50:.1f}A", delta_color=delta_c)
         
         with data_col3:
-            power = st.session_state.latest_data['power']
+            power = snapshot["latest"]['power']
             delta_p = "normal" if power <= 20000 else "inverse"
             st.metric("Power", f"{power:.0f} W", delta=f"{power-11500:.0f}W", delta_color=delta_p)
         
         with data_col4:
-            st.metric("Energy", f"{st.session_state.energy_consumption:.3f} kWh", delta=f"Budget: {self.energy_budget:.1f} kWh")
+            st.metric("Energy", f"{energy_consumption:.3f} kWh", delta=f"Budget: {self.energy_budget:.1f} kWh")
         
         with data_col5:
             st.metric("Cost", f"₹{cost:.2f}", delta=f"Rate: ₹{rate}/kWh")
-            st.caption(f"Period: {period}")
+            st.caption(f"Period: {TARIFF_PERIOD_LABELS[period]}")
         
         # System status indicators
         st.subheader("🔍 System Health")
@@ -287,71 +319,63 @@ class LoadManagementSystem:
             st.metric("Power Status", p_status)
         
         with health_col4:
-            e_status = "🟢 OK" if st.session_state.energy_consumption < self.energy_budget * 0.9 else "🟡 Near Limit" if st.session_state.energy_consumption < self.energy_budget else "🔴 Exceeded"
+            e_status = "🟢 OK" if energy_consumption < self.energy_budget * 0.9 else "🟡 Near Limit" if energy_consumption < self.energy_budget else "🔴 Exceeded"
             st.metric("Energy Status", e_status)
         
         # Create graphs
         self.create_graphs()
         
         # Last update info
-        st.caption(f"Last updated: {st.session_state.latest_data['timestamp']} | Updates: {st.session_state.data_update_counter}")
+        st.caption(f"Last updated: {snapshot['latest']['timestamp']} | Updates: {snapshot['update_counter']}")
+    
+    def get_graph_series(self, window):
+        """Return x values, column series, min/max bands and x-axis label for a history window"""
+        if window is None:
+            snapshot = st.session_state.snapshot
+            series = {
+                "voltage": snapshot["voltage_data"],
+                "current": snapshot["current_data"],
+                "power": snapshot["power_data"],
+                "energy": snapshot["energy_data"]
+            }
+            return range(MAX_DATA_POINTS), series, None, "Time (samples)"
+        
+        span, resolution = window
+        start = now_ms() - span * 1000
+        if resolution is None:
+            # Range query against the columnar store; no full scan of the history
+            timestamps, series = self.service.history.range(start=start)
+            return to_local_datetime64(timestamps), series, None, "Time"
+        
+        # Day/week/month views come from pre-aggregated rollup buckets
+        timestamps, stats = self.service.rollups.series(resolution, start, now_ms() + 1)
+        series = {name: stats["mean"][name] for name in ("voltage", "current", "power")}
+        series["energy"] = np.cumsum(stats["sum"]["energy"])
+        bands = {name: (stats["min"][name], stats["max"][name]) for name in ("voltage", "current", "power")}
+        return to_local_datetime64(timestamps), series, bands, f"Time ({resolution // 60} min buckets)"
     
     def create_graphs(self):
         """Create the monitoring graphs"""
         st.subheader("📈 Historical Trends")
         
-        # Create four separate graphs in tabs for better visibility
-        graph_tabs = st.tabs(["🔌 Voltage", "⚡ Current", "🔥 Power", "🔋 Energy"])
-        
-        with graph_tabs[0]:
-            fig1, ax1 = plt.subplots(figsize=(12, 4))
-            voltage_list = list(st.session_state.voltage_data)
-            ax1.plot(voltage_list, label="Voltage (V)", color="blue", linewidth=2)
-            ax1.axhline(y=self.voltage_threshold, color='red', linestyle='--', alpha=0.7, label=f"Threshold ({self.voltage_threshold}V)")
-            ax1.axhline(y=230, color='green', linestyle='--', alpha=0.7, label="Nominal (230V)")
-            ax1.set_title("Voltage Over Time", fontsize=14, fontweight='bold')
-            ax1.set_ylabel("Voltage (V)")
-            ax1.set_xlabel("Time (samples)")
-            ax1.legend()
-            ax1.grid(True, alpha=0.3)
-            ax1.set_ylim(150, 300)
-            st.pyplot(fig1)
-        
-        with graph_tabs[1]:
-            fig2, ax2 = plt.subplots(figsize=(12, 4))
-            current_list = list(st.session_state.current_data)
-            ax2.plot(current_list, label="Current (A)", color="orange", linewidth=2)
-            ax2.axhline(y=self.current_threshold, color='red', linestyle='--', alpha=0.7, label=f"Threshold ({self.current_threshold}A)")
-            ax2.set_title("Current Over Time", fontsize=14, fontweight='bold')
-            ax2.set_ylabel("Current (A)")
-            ax2.set_xlabel("Time (samples)")
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-            st.pyplot(fig2)
-        
-        with graph_tabs[2]:
-            fig3, ax3 = plt.subplots(figsize=(12, 4))
-            power_list = list(st.session_state.power_data)
-            ax3.plot(power_list, label="Power (W)", color="red", linewidth=2)
-            ax3.axhline(y=self.power_threshold, color='red', linestyle='--', alpha=0.7, label=f"Threshold ({self.power_threshold}W)")
-            ax3.set_title("Power Over Time", fontsize=14, fontweight='bold')
-            ax3.set_ylabel("Power (W)")
-            ax3.set_xlabel("Time (samples)")
-            ax3.legend()
-            ax3.grid(True, alpha=0.3)
-            st.pyplot(fig3)
-        
-        with graph_tabs[3]:
-            fig4, ax4 = plt.subplots(figsize=(12, 4))
-            energy_list = list(st.session_state.energy_data)
-            ax4.plot(energy_list, label="Energy Consumption (kWh)", color="purple", linewidth=2)
-            ax4.axhline(y=self.energy_budget, color='red', linestyle='--', alpha=0.7, label=f"Budget ({self.energy_budget} kWh)")
-            ax4.set_title("Cumulative Energy Consumption", fontsize=14, fontweight='bold')
-            ax4.set_ylabel("Energy (kWh)")
-            ax4.set_xlabel("Time (samples)")
-            ax4.legend()
-            ax4.grid(True, alpha=0.3)
-            st.pyplot(fig4)
+        window_name = st.selectbox("History window", list(HISTORY_WINDOWS.keys()), key="history_window")
+        x, series, bands, x_label = self.get_graph_series(HISTORY_WINDOWS[window_name])
+        if len(x) == 0:
+            st.info("No stored history in this window yet.")
+        
+        # Only the selected graph is built and rasterized
+        graph = st.radio("Graph", list(GRAPH_SPECS.keys()), horizontal=True,
+                         key="graph_select", label_visibility="collapsed")
+        
+        # Figures persist per session; only the line data changes between refreshes
+        if 'charts' not in st.session_state:
+            st.session_state.charts = chart_cache.ChartCache({name: spec for name, (*_, spec) in GRAPH_SPECS.items()})
+        column, threshold_attr, low_attr, _ = GRAPH_SPECS[graph]
+        chart = st.session_state.charts.get(graph, time_axis=not isinstance(x, range))
+        chart.low_limit = getattr(self, low_attr) if low_attr else None
+        band = bands.get(column) if bands else None
+        fig = chart.update(x, series[column], getattr(self, threshold_attr), band, x_label)
+        st.pyplot(fig)
     
     def create_control_tab(self):
         """Create the load control tab"""
@@ -432,18 +456,20 @@ class LoadManagementSystem:
     
     def update_load_status(self, load_name):
         """Update load status from UI"""
-        self.load_profiles[load_name]["active"] = st.session_state[f"active_{load_name}"]
+        self.service.set_load_active(load_name, st.session_state[f"active_{load_name}"])
         status = "ON" if self.load_profiles[load_name]["active"] else "OFF"
         self.log_alert(f"Load '{load_name}' turned {status}", "info")
     
     def update_load_current(self, load_name):
         """Update load current from UI"""
         self.load_profiles[load_name]["current"] = st.session_state[f"current_{load_name}"]
+        self.service.set_profiles(self.load_profiles)
         self.log_alert(f"Load '{load_name}' current updated to {self.load_profiles[load_name]['current']} A", "info")
     
     def update_load_pf(self, load_name):
         """Update load power factor from UI"""
         self.load_profiles[load_name]["power_factor"] = st.session_state[f"pf_{load_name}"]
+        self.service.set_profiles(self.load_profiles)
         self.log_alert(f"Load '{load_name}' power factor updated to {self.load_profiles[load_name]['power_factor']}", "info")
     
     def create_energy_tab(self):
@@ -454,27 +480,21 @@ class LoadManagementSystem:
         st.subheader("📊 Energy Summary")
         col1, col2, col3 = st.columns(3)
         
-        # Calculate current rate and cost
-        current_hour = datetime.datetime.now().hour
-        if 8 <= current_hour < 20:  # Peak hours
-            rate = self.tariff_rates["peak"]
-            period = "Peak Hours (8AM-8PM)"
-        elif 0 <= current_hour < 6:  # Off-peak hours
-            rate = self.tariff_rates["off_peak"]
-            period = "Off-Peak Hours (12AM-6AM)"
-        else:  # Shoulder hours
-            rate = self.tariff_rates["shoulder"]
-            period = "Shoulder Hours (6AM-8AM, 8PM-12AM)"
+        # Current rate; cost prices each tariff period's energy at its own rate
+        period = tariff_period()
+        rate = self.tariff_rates[period]
         
-        cost = st.session_state.energy_consumption * rate
+        snapshot = st.session_state.snapshot
+        energy_consumption = snapshot["energy_consumption"]
+        cost = self.energy_cost(snapshot)
         
         with col1:
-            st.metric("Total Energy Consumed", f"{st.session_state.energy_consumption:.3f} kWh")
+            st.metric("Total Energy Consumed", f"{energy_consumption:.3f} kWh")
             st.metric("Estimated Cost", f"₹{cost:.2f}")
         
         with col2:
-            budget_remaining = max(0, self.energy_budget - st.session_state.energy_consumption)
-            budget_percent = (st.session_state.energy_consumption / self.energy_budget * 100) if self.energy_budget > 0 else 0
+            budget_remaining = max(0, self.energy_budget - energy_consumption)
+            budget_percent = (energy_consumption / self.energy_budget * 100) if self.energy_budget > 0 else 0
             
             st.metric("Energy Budget Remaining", f"{budget_remaining:.2f} kWh")
             st.metric("Budget Used", f"{budget_percent:.1f}%")
@@ -484,7 +504,20 @@ class LoadManagementSystem:
         
         with col3:
             st.metric("Current Tariff Rate", f"₹{rate:.2f}/kWh")
-            st.metric("Current Period", period)
+            st.metric("Current Period", TARIFF_PERIOD_LABELS[period])
+        
+        # Per-load and per-period accumulators of the shared energy integrator
+        load_col, period_col = st.columns(2)
+        with load_col:
+            st.markdown("**Energy by Load (kWh)**")
+            st.dataframe(pd.Series(snapshot["energy_by_load"], name="kWh", dtype=float).round(4))
+        with period_col:
+            st.markdown("**Energy by Tariff Period (kWh)**")
+            st.dataframe(pd.Series({TARIFF_PERIOD_LABELS[name]: value for name, value in snapshot["energy_by_period"].items()},
+                                   name="kWh", dtype=float).round(4))
+        
+        # Longer-range totals from the pre-aggregated rollups
+        self.create_energy_history()
         
         # Tariff settings
         st.subheader("💸 Tariff Configuration")
@@ -522,57 +555,76 @@ class LoadManagementSystem:
             self.save_config()
             st.success("Tariff rates updated successfully!")
     
+    def create_energy_history(self):
+        """Day, week and month energy totals plus a daily chart from the rollup tiers"""
+        st.subheader("📅 Energy History")
+        now = now_ms()
+        midnight = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        today_start = int(midnight.timestamp() * 1000)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Today", f"{self.service.rollups.total('energy', today_start, now + 1):.3f} kWh")
+        with col2:
+            st.metric("Last 7 Days", f"{self.service.rollups.total('energy', now - 7 * 86400000, now + 1):.3f} kWh")
+        with col3:
+            st.metric("Last 30 Days", f"{self.service.rollups.total('energy', now - 30 * 86400000, now + 1):.3f} kWh")
+        
+        # Daily totals for the last 30 days from the hourly buckets
+        timestamps, stats = self.service.rollups.series(3600, today_start - 29 * 86400000, now + 1)
+        if len(timestamps):
+            days = pd.Series(stats["sum"]["energy"], index=pd.DatetimeIndex(to_local_datetime64(timestamps)))
+            daily = days.resample("D").sum()
+            daily.index = daily.index.strftime("%Y-%m-%d")
+            st.bar_chart(daily.rename("Energy (kWh)"))
+        else:
+            st.info("No energy history recorded yet.")
+    
     def create_alerts_tab(self):
         """Create the alerts history tab"""
         st.header("⚠️ Alert History & Management")
         
-        # Alert summary
-        if st.session_state.alerts:
-            error_count = sum(1 for alert in st.session_state.alerts if "ERROR" in alert)
-            warning_count = sum(1 for alert in st.session_state.alerts if "WARNING" in alert)
-            info_count = len(st.session_state.alerts) - error_count - warning_count
-            
+        alerts = st.session_state.alerts
+        
+        # Alert summary from the per-level counters
+        if len(alerts):
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("🔴 Errors", error_count)
+                st.metric("🔴 Errors", alerts.count(AlertLevel.ERROR))
             with col2:
-                st.metric("🟡 Warnings", warning_count)
+                st.metric("🟡 Warnings", alerts.count(AlertLevel.WARNING))
             with col3:
-                st.metric("ℹ️ Info", info_count)
+                st.metric("ℹ️ Info", alerts.count(AlertLevel.INFO))
             with col4:
-                st.metric("📝 Total", len(st.session_state.alerts))
+                st.metric("📝 Total", len(alerts))
         
         # Control buttons
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🗑️ Clear All Alerts"):
-                st.session_state.alerts = []
+                alerts.clear()
                 self.log_alert("Alert history cleared", "info")
                 st.rerun()
         
         with col2:
             if st.button("📥 Export Alerts"):
-                if st.session_state.alerts:
-                    alert_df = pd.DataFrame(st.session_state.alerts, columns=["Alert"])
-                    st.download_button(
-                        label="Download Alerts as CSV",
-                        data=alert_df.to_csv(index=False),
-                        file_name=f"alerts_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
+                if len(alerts):
+                    data = alerts.columns()
+                    data["timestamp"] = to_local_datetime64(data["timestamp"] * 1000)
+                    self.download_export(data, "Download Alerts", "alerts")
         
         st.markdown("---")
         
-        # Display alerts in reverse order (newest first)
+        # Display alerts newest first; text is formatted only for the rows shown
         st.subheader("📋 Recent Alerts")
-        if st.session_state.alerts:
-            for i, alert in enumerate(reversed(st.session_state.alerts[-20:])):  # Show last 20 alerts
-                if "ERROR" in alert:
-                    st.error(f"🔴 {alert}")
-                elif "WARNING" in alert:
-                    st.warning(f"🟡 {alert}")
+        if len(alerts):
+            for record in alerts.records(last=20, newest_first=True):  # Show last 20 alerts
+                if record.level == AlertLevel.ERROR:
+                    st.error(f"🔴 {format_alert(record)}")
+                elif record.level == AlertLevel.WARNING:
+                    st.warning(f"🟡 {format_alert(record)}")
                 else:
-                    st.info(f"ℹ️ {alert}")
+                    st.info(f"ℹ️ {format_alert(record)}")
         else:
             st.info("No alerts to display.")
     
@@ -634,6 +686,16 @@ class LoadManagementSystem:
             st.success("Thresholds updated successfully!")
             st.rerun()
         
+        # Export format used by the data and alert downloads
+        st.subheader("📤 Data Export")
+        st.selectbox(
+            "Export format",
+            available_formats(),
+            format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+            key="export_format",
+            help="Parquet, Arrow and .npz keep column types and load much faster than CSV"
+        )
+        
         # Configuration management
         st.subheader("💾 Configuration Management")
         config_col1, config_col2, config_col3 = st.columns(3)
@@ -655,111 +717,47 @@ class LoadManagementSystem:
                 st.success("Reset to default settings!")
                 st.rerun()
     
-    def simulate_realistic_data(self):
-        """Generate realistic load data with variations"""
-        # Base values
-        base_voltage = 230.0
-        voltage_variation = random.uniform(-5, 5)
-        
-        # Calculate total current based on active loads
-        total_current = 0.0
-        total_power = 0.0
-        
-        # Simulate occasional voltage spikes or drops (less frequent)
-        if random.random() < 0.01:  # 1% chance
-            voltage_spike_or_drop = random.uniform(-30, 30)
-            voltage_variation += voltage_spike_or_drop
-            self.log_alert(f"Voltage fluctuation detected: {voltage_spike_or_drop:.1f}V", "warning")
-        
-        for load_name, load_data in self.load_profiles.items():
-            if load_data["active"]:
-                # Add realistic variation
-                current_variation = random.uniform(-0.1, 0.1) * load_data["current"]
-                
-                # Simulate occasional current spikes (rare)
-                if random.random() < 0.005:  # 0.5% chance
-                    current_spike = random.uniform(10.0, 30.0)
-                    current_variation += current_spike
-                    self.log_alert(f"Current spike in {load_name}: +{current_spike:.1f}A", "warning")
-                
-                load_current = max(0, load_data["current"] + current_variation)
-                total_current += load_current
-                
-                # Calculate power for this load
-                load_voltage = base_voltage + voltage_variation
-                load_power = load_voltage * load_current * load_data["power_factor"]
-                total_power += load_power
-        
-        # Add background load (always present)
-        background_current = random.uniform(3.0, 8.0)
-        total_current += background_current
-        background_power = (base_voltage + voltage_variation) * background_current * 0.92
-        total_power += background_power
-        
-        # Ensure realistic bounds
-        voltage = max(180, min(270, base_voltage + voltage_variation))
-        current = max(0, min(600, total_current))
-        power = max(0, min(150000, total_power))
-        
+    def energy_cost(self, snapshot):
+        """Cost of the consumed energy, each tariff period at its own rate"""
+        return sum(energy * self.tariff_rates[period] for period, energy in snapshot["energy_by_period"].items())
+    
+    def log_event(self, kind, load_name, value):
+        """Turn an acquisition event (fired rule, spike or logging failure) into an alert"""
+        if kind == "alert":
+            self.raise_alert(value.kind, value.level, value.value, value.limit, load_name)
+        elif kind in ("voltage_spike", "current_spike"):
+            self.raise_alert(kind, AlertLevel.WARNING, value, subject=load_name)
+        else:
+            self.log_alert(value, "error")
+    
+    def sync_alert_rules(self):
+        """Hand the current rules and thresholds to the shared acquisition service"""
+        try:
+            rules = alert_rule_set(DEFAULT_ALERT_RULES, self.extra_alert_rules)
+            self.service.set_alert_rules(rules, self.alert_params())
+        except (KeyError, ValueError) as e:
+            self.log_alert(f"Invalid alert rules, using defaults: {str(e)}", "error")
+            self.extra_alert_rules = []
+            self.service.set_alert_rules(alert_rule_set(DEFAULT_ALERT_RULES), self.alert_params())
+    
+    def alert_params(self):
+        """Named values that alert rule limits and cooldowns can refer to"""
         return {
-            "voltage": round(voltage, 1),
-            "current": round(current, 1),
-            "power": round(power, 0),
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "voltage_threshold": self.voltage_threshold,
+            "low_voltage_threshold": self.low_voltage_threshold,
+            "current_threshold": self.current_threshold,
+            "power_threshold": self.power_threshold,
+            "energy_budget": self.energy_budget,
+            "alert_cooldown": self.alert_cooldown
         }
     
-    def check_alerts(self, data):
-        """Check for threshold violations and trigger alerts with cooldown"""
-        current_time = time.time()
-        
-        # Check voltage alerts
-        if data["voltage"] > self.voltage_threshold:
-            if self.should_trigger_alert("high_voltage", current_time):
-                self.log_alert(f"⚠️ HIGH VOLTAGE: {data['voltage']}V (Limit: {self.voltage_threshold}V)", "warning")
-                
-        elif data["voltage"] < 200:
-            if self.should_trigger_alert("low_voltage", current_time):
-                self.log_alert(f"⚠️ LOW VOLTAGE: {data['voltage']}V (Minimum: 200V)", "warning")
-        
-        # Check current alerts
-        if data["current"] > self.current_threshold:
-            if self.should_trigger_alert("high_current", current_time):
-                self.log_alert(f"⚠️ HIGH CURRENT: {data['current']}A (Limit: {self.current_threshold}A)", "warning")
-        
-        # Check power alerts
-        if data["power"] > self.power_threshold:
-            if self.should_trigger_alert("high_power", current_time):
-                self.log_alert(f"⚠️ HIGH POWER: {data['power']}W (Limit: {self.power_threshold}W)", "warning")
-        
-        # Check energy budget alerts
-        budget_usage = (st.session_state.energy_consumption / self.energy_budget) * 100 if self.energy_budget > 0 else 0
-        
-        if budget_usage >= 100:
-            if self.should_trigger_alert("budget_exceeded", current_time):
-                self.log_alert(f"🚨 ENERGY BUDGET EXCEEDED: {st.session_state.energy_consumption:.2f}/{self.energy_budget} kWh", "error")
-        elif budget_usage >= 90:
-            if self.should_trigger_alert("budget_warning", current_time):
-                self.log_alert(f"⚠️ ENERGY BUDGET WARNING: {budget_usage:.1f}% used", "warning")
-    
-    def should_trigger_alert(self, alert_type, current_time):
-        """Check if enough time has passed since last alert of this type"""
-        if alert_type not in self.last_alert_time:
-            self.last_alert_time[alert_type] = current_time
-            return True
-        
-        time_since_last = current_time - self.last_alert_time[alert_type]
-        if time_since_last >= self.alert_cooldown:
-            self.last_alert_time[alert_type] = current_time
-            return True
-        
-        return False
-    
     def start_monitoring(self):
         """Start the monitoring process"""
         if not st.session_state.monitoring:
             st.session_state.monitoring = True
             st.session_state.start_time = datetime.datetime.now()
-            st.session_state.last_update_time = time.time()
+            self.service.subscribe(st.session_state.viewer_id)
+            st.session_state.last_seen_sequence = self.service.snapshot()["sequence"]
             
             self.log_alert("🟢 Monitoring started", "info")
             st.success("✅ Monitoring started successfully!")
@@ -769,27 +767,27 @@ class LoadManagementSystem:
         """Stop the monitoring process"""
         if st.session_state.monitoring:
             st.session_state.monitoring = False
+            self.service.unsubscribe(st.session_state.viewer_id)
+            self.flush_log()
             
             self.log_alert("🔴 Monitoring stopped", "info")
             st.success("ℹ️ Monitoring stopped successfully!")
             st.rerun()
     
     def log_alert(self, message, level="info"):
-        """Log an alert message"""
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level.upper()}] {message}"
-        st.session_state.alerts.append(log_entry)
-        
-        # Limit alert history to 200 entries
-        if len(st.session_state.alerts) > 200:
-            st.session_state.alerts = st.session_state.alerts[-200:]
+        """Log a free-text alert message"""
+        st.session_state.alerts.append(AlertLevel[level.upper()], "message", subject=message)
+    
+    def raise_alert(self, kind, level, value, limit=None, subject=None):
+        """Record a typed alert; its text is formatted only when displayed"""
+        st.session_state.alerts.append(level, kind, value, float("nan") if limit is None else limit, subject)
     
     def emergency_shutdown(self):
         """Turn off all loads"""
         shutdown_count = 0
         for load_name in self.load_profiles:
             if self.load_profiles[load_name]["active"]:
-                self.load_profiles[load_name]["active"] = False
+                self.service.set_load_active(load_name, False)
                 shutdown_count += 1
         
         # Store emergency shutdown flag to trigger UI update
@@ -799,65 +797,45 @@ class LoadManagementSystem:
         st.error(f"🚨 Emergency shutdown completed! {shutdown_count} loads deactivated.")
         st.rerun()
     
-    def log_data(self, data):
-        """Log data to CSV file"""
+    def flush_log(self):
+        """Write any buffered log rows to disk"""
         try:
-            file_exists = os.path.isfile(DATA_LOG_FILE)
-            
-            with open(DATA_LOG_FILE, mode='a', newline='') as file:
-                writer = csv.writer(file)
-                
-                if not file_exists:
-                    writer.writerow(["timestamp", "voltage", "current", "power", "energy"])
-                
-                writer.writerow([
-                    data["timestamp"],
-                    data["voltage"],
-                    data["current"],
-                    data["power"],
-                    st.session_state.energy_consumption
-                ])
+            self.service.flush()
         except Exception as e:
             self.log_alert(f"Failed to log data: {str(e)}", "error")
     
+    def download_export(self, columns, label, file_prefix):
+        """Download button for ``columns`` encoded in the selected export format"""
+        fmt = st.session_state.get("export_format", "csv")
+        name, extension, mime = EXPORT_FORMATS[fmt]
+        st.download_button(
+            label=f"{label} as {name}",
+            data=export_bytes(columns, fmt),
+            file_name=f"{file_prefix}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            mime=mime
+        )
+    
     def export_data(self):
-        """Export data to a CSV file"""
+        """Export this session's data in the selected format"""
         try:
-            # Generate timestamp for each data point
-            time_step = UPDATE_INTERVAL  # seconds
-            now = datetime.datetime.now()
+            # Read this session's samples from the columnar history store
+            session_start = int(st.session_state.start_time.timestamp() * 1000)
+            timestamps, columns = self.service.history.range(start=session_start)
             
-            data = []
-            voltage_list = list(st.session_state.voltage_data)
-            current_list = list(st.session_state.current_data)
-            power_list = list(st.session_state.power_data)
-            energy_list = list(st.session_state.energy_data)
-            
-            for i in range(len(voltage_list)):
-                timestamp = (now - datetime.timedelta(seconds=(len(voltage_list)-i-1) * time_step))
-                timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                
-                data.append([
-                    timestamp_str,
-                    voltage_list[i],
-                    current_list[i],
-                    power_list[i],
-                    energy_list[i] if i < len(energy_list) else 0
-                ])
-            
-            df = pd.DataFrame(data, columns=["timestamp", "voltage", "current", "power", "energy"])
+            if len(timestamps):
+                data = {"timestamp": to_local_datetime64(timestamps),
+                        **{name: columns[name] for name in ("voltage", "current", "power", "energy")}}
+            else:
+                # Nothing stored yet (e.g. logging disabled): fall back to the live buffers
+                snapshot = st.session_state.snapshot
+                data = {"timestamp": sample_timestamps(len(snapshot["voltage_data"]), UPDATE_INTERVAL),
+                        **{name: np.asarray(snapshot[f"{name}_data"], dtype=np.float64)
+                           for name in ("voltage", "current", "power", "energy")}}
             
-            # Use Streamlit's download button
-            csv_data = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Data as CSV",
-                data=csv_data,
-                file_name=f"load_management_data_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+            self.download_export(data, "📥 Download Data", "load_management_data")
             
             self.log_alert("📊 Data exported successfully", "info")
-            st.success(f"✅ Data exported! {len(data)} records ready for download.")
+            st.success(f"✅ Data exported! {len(data['timestamp'])} records ready for download.")
         except Exception as e:
             self.log_alert(f"Export failed: {str(e)}", "error")
             st.error(f"❌ Export failed: {str(e)}")
@@ -874,7 +852,8 @@ class LoadManagementSystem:
             "logging_enabled": self.logging_enabled,
             "alert_sounds": self.alert_sounds,
             "voice_alerts": self.voice_alerts,
-            "alert_cooldown": self.alert_cooldown
+            "alert_cooldown": self.alert_cooldown,
+            "extra_alert_rules": self.extra_alert_rules
         }
         
         try:
@@ -902,12 +881,18 @@ class LoadManagementSystem:
                 
                 # Update load profiles
                 self.load_profiles = config.get("load_profiles", self.load_profiles)
+                if self.service:
+                    self.service.set_profiles(self.load_profiles)
+                    self.load_profiles = self.service.load_profiles
                 
                 # Update settings
                 self.logging_enabled = config.get("logging_enabled", True)
+                if self.service:
+                    self.service.logging_enabled = self.logging_enabled
                 self.alert_sounds = config.get("alert_sounds", True)
                 self.voice_alerts = config.get("voice_alerts", False)
                 self.alert_cooldown = max(5, min(60, config.get("alert_cooldown", 10)))
+                self.extra_alert_rules = config.get("extra_alert_rules", [])
                 
                 self.log_alert("📂 Configuration loaded", "info")
             else:
@@ -923,32 +908,27 @@ class LoadManagementSystem:
         self.energy_budget = 1000.0
         self.tariff_rates = {"peak": 5.75, "off_peak": 3.50, "shoulder": 4.25}
         self.alert_cooldown = 10
+        self.extra_alert_rules = []
         self.log_alert("System reset to default settings", "info")
     
     def clear_data(self):
         """Clear all monitoring data"""
-        # Initialize with some baseline data with variation
-        st.session_state.voltage_data = deque([230 + random.uniform(-2, 2) for _ in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-        st.session_state.current_data = deque([50 + random.uniform(-5, 5) for _ in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-        st.session_state.power_data = deque([11500 + random.uniform(-500, 500) for _ in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-        st.session_state.energy_data = deque([i * 0.001 for i in range(MAX_DATA_POINTS)], maxlen=MAX_DATA_POINTS)
-        st.session_state.energy_consumption = 0.0
+        # Resets the shared live buffers and energy counter for every viewer
+        self.service.clear()
+        st.session_state.snapshot = self.service.snapshot()
+        st.session_state.last_seen_sequence = st.session_state.snapshot["sequence"]
         st.session_state.start_time = datetime.datetime.now()
         
-        # Reset latest data
-        st.session_state.latest_data = {
-            "voltage": 230.0,
-            "current": 50.0,
-            "power": 11500.0,
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        st.session_state.data_update_counter = 0
-        st.session_state.last_update_time = time.time()
-        
         self.log_alert("🗑️ All monitoring data cleared", "info")
         st.success("✅ Monitoring data cleared successfully!")
         st.rerun()
 
+@st.cache_resource
+def get_acquisition_service(_load_profiles):
+    """Process-wide acquisition worker shared by all sessions"""
+    return AcquisitionService(_load_profiles, log_file=DATA_LOG_FILE, history_dir=HISTORY_DIR,
+                              interval=UPDATE_INTERVAL, max_points=MAX_DATA_POINTS)
+
 def main():
     st.set_page_config(
         page_title="Load Management System",
@@ -987,6 +967,7 @@ def main():
         system.create_login_page()
     else:
         system.create_main_interface()
+    startup_profiler.mark_ready("first page rendered")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
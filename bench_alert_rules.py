@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+
+from alert_rules import AlertRuleEngine, DEFAULT_ALERT_RULES, QUANTITIES, TOTAL_CHANNEL
+
+# Benchmark settings
+CHANNELS = (4, 10, 100, 1000, 5000)
+TICKS = 200
+COOLDOWN = 10.0
+TICK_SECONDS = 0.5
+PARAMS = {
+    "voltage_threshold": 250.0,
+    "low_voltage_threshold": 200.0,
+    "current_threshold": 150.0,
+    "power_threshold": 30000.0,
+    "energy_budget": 1000.0,
+    "alert_cooldown": COOLDOWN
+}
+
+
+def make_ticks(rng, n_channels):
+    """Random tick matrices (channels x quantities) with occasional breaches"""
+    ticks = np.empty((TICKS, n_channels, len(QUANTITIES)))
+    ticks[..., 0] = rng.normal(232, 12, (TICKS, n_channels))
+    ticks[..., 1] = rng.normal(120, 25, (TICKS, n_channels))
+    ticks[..., 2] = ticks[..., 0] * ticks[..., 1] * 0.9
+    ticks[..., 3] = np.linspace(850, 1050, TICKS)[:, None]
+    ticks[..., 4] = rng.integers(0, 4, (TICKS, n_channels))
+    return ticks
+
+
+def if_chain(ticks, channels):
+    """The original app.py check_alerts if-chain, run per channel"""
+    last_alert = {}
+    fired = []
+
+    def should_trigger(kind, channel, now):
+        key = (kind, channel)
+        if now - last_alert.get(key, -np.inf) >= COOLDOWN:
+            last_alert[key] = now
+            fired.append((now, kind, channel))
+
+    for t, tick in enumerate(ticks):
+        now = t * TICK_SECONDS
+        for channel, (voltage, current, power, energy, active) in zip(channels, tick.tolist()):
+            if voltage > PARAMS["voltage_threshold"]:
+                should_trigger("high_voltage", channel, now)
+            elif voltage < PARAMS["low_voltage_threshold"]:
+                should_trigger("low_voltage", channel, now)
+            if current > PARAMS["current_threshold"]:
+                should_trigger("high_current", channel, now)
+            if power > PARAMS["power_threshold"]:
+                should_trigger("high_power", channel, now)
+            budget_usage = energy / PARAMS["energy_budget"] * 100
+            if budget_usage >= 100:
+                should_trigger("budget_exceeded", channel, now)
+            elif budget_usage >= 90:
+                should_trigger("budget_warning", channel, now)
+    return fired
+
+
+def compile_engine(channels):
+    """The default rules applied to every channel"""
+    rules = [dict(rule, channels="*") for rule in DEFAULT_ALERT_RULES]
+    return AlertRuleEngine(rules, channels, params=PARAMS)
+
+
+def engine(ticks, channels):
+    """The same rules compiled once and evaluated a tick matrix at a time"""
+    rule_engine = compile_engine(channels)
+    fired = []
+    for t, tick in enumerate(ticks):
+        now = t * TICK_SECONDS
+        fired.extend((now, event.kind, event.channel) for event in rule_engine.evaluate(tick, now))
+    return fired
+
+
+def run(name, evaluate, ticks, channels):
+    start = time.perf_counter()
+    fired = evaluate(ticks, channels)
+    elapsed = (time.perf_counter() - start) / len(ticks)
+    print(f"  {name:<10} {elapsed * 1000:9.3f} ms/tick  ({len(fired)} alerts)")
+    return elapsed, fired
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for n_channels in CHANNELS:
+        ticks = make_ticks(rng, n_channels)
+        channels = [TOTAL_CHANNEL] + [f"Feeder {i}" for i in range(1, n_channels)]
+        start = time.perf_counter()
+        compile_engine(channels)
+        print(f"{n_channels} channels x {len(DEFAULT_ALERT_RULES)} rules, {TICKS} ticks "
+              f"(compile {(time.perf_counter() - start) * 1000:.1f} ms)")
+        before, expected = run("if-chain", if_chain, ticks, channels)
+        after, fired = run("engine", engine, ticks, channels)
+        # The default rules must raise exactly the alerts the if-chain raised
+        assert sorted(fired) == sorted(expected), "engine alerts differ from the if-chain"
+        print(f"  Speed-up: {before / after:.1f}x, identical alerts")
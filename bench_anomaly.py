@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+
+from anomaly_detector import StreamingAnomalyDetector
+
+try:
+    from sklearn.ensemble import IsolationForest
+except ImportError:
+    IsolationForest = None
+
+# Benchmark settings
+SAMPLES = 20000
+BATCH_SAMPLES = 2000      # the history-rescanning methods get slow quickly
+FOREST_SAMPLES = 200
+FEATURES = ("voltage", "current", "power")
+SPIKE_EVERY = 97
+
+
+def make_samples(rng, n):
+    """IEEE-feed-like samples with a spike every SPIKE_EVERY samples, plus the spike mask"""
+    voltage = rng.normal(235, 8, n)
+    current = rng.normal(5.0, 0.5, n)
+    power = voltage * current * 0.95
+    spikes = np.zeros(n, dtype=bool)
+    spikes[::SPIKE_EVERY] = True
+    voltage[spikes] += 60
+    samples = [dict(zip(FEATURES, row)) for row in np.column_stack([voltage, current, power]).tolist()]
+    return samples, spikes
+
+
+def streaming(samples):
+    detector = StreamingAnomalyDetector(FEATURES)
+    for sample in samples:
+        yield detector.update(sample)[0]
+
+
+def batch_robust_z(samples):
+    """Median/MAD z-score recomputed over the whole history on every sample"""
+    history = []
+    for sample in samples:
+        history.append([sample[name] for name in FEATURES])
+        data = np.array(history)
+        median = np.median(data, axis=0)
+        mad = np.median(np.abs(data - median), axis=0) * 1.4826 + 1e-9
+        yield bool((np.abs(data[-1] - median) / mad > 3.5).any())
+
+
+def batch_forest(samples):
+    """The old button: rebuild the array and fit an IsolationForest on it"""
+    history = []
+    for sample in samples:
+        history.append([sample[name] for name in FEATURES])
+        data = np.array(history)
+        if len(data) < 2:
+            yield False
+            continue
+        model = IsolationForest(contamination=0.15, random_state=42).fit(data)
+        yield model.predict(data[-1:])[0] == -1
+
+
+def run(name, method, samples, spikes):
+    latencies = np.empty(len(samples))
+    flagged = np.zeros(len(samples), dtype=bool)
+    results = method(samples)
+    for i in range(len(samples)):
+        start = time.perf_counter()
+        flagged[i] = next(results)
+        latencies[i] = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    # Scored against the injected spikes
+    hits = np.count_nonzero(flagged & spikes)
+    precision = hits / max(np.count_nonzero(flagged), 1)
+    recall = hits / max(np.count_nonzero(spikes), 1)
+    print(f"{name:<24} {len(samples):6d} samples  p50 {p50:10.1f} us  p99 {p99:10.1f} us  "
+          f"last {latencies[-1] * 1e6:10.1f} us  ({np.count_nonzero(flagged)} flagged, "
+          f"{hits}/{np.count_nonzero(spikes)} spikes: precision {precision:.2f}, recall {recall:.2f})")
+
+
+if __name__ == "__main__":
+    samples, spikes = make_samples(np.random.default_rng(0), SAMPLES)
+    print(f"Per-sample latency, {len(FEATURES)} features, spike every {SPIKE_EVERY} samples")
+    run("streaming EWMA z-score", streaming, samples, spikes)
+    run("batch median/MAD", batch_robust_z, samples[:BATCH_SAMPLES], spikes[:BATCH_SAMPLES])
+    if IsolationForest is not None:
+        run("batch IsolationForest", batch_forest, samples[:FOREST_SAMPLES], spikes[:FOREST_SAMPLES])
+    else:
+        print(f"{'batch IsolationForest':<24} skipped (scikit-learn not installed)")
@@ -0,0 +1,94 @@
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from blit_renderer import BlitManager
+
+# Benchmark settings
+FRAMES = 200
+POINTS = 200
+TARGET_FPS = 20
+SERIES = (
+    ("Voltage (V)", "blue", 230, 5),
+    ("Current (A)", "green", 135, 10),
+    ("Power (W)", "red", 29000, 1500),
+    ("Energy (kWh)", "purple", None, None)
+)
+
+
+def build_figure():
+    """Four live series laid out like the Tkinter dashboards"""
+    fig, axes = plt.subplots(len(SERIES), 1, figsize=(12, 10))
+    fig.tight_layout(pad=3.0)
+    lines = []
+    for ax, (label, color, _, _) in zip(axes, SERIES):
+        line, = ax.plot(range(POINTS), [0] * POINTS, label=label, color=color)
+        ax.set_title(label.split(" ")[0] + " Over Time")
+        ax.set_ylabel(label)
+        ax.legend()
+        ax.grid(True)
+        lines.append(line)
+    return fig, axes, lines
+
+
+def make_frames(rng):
+    energy = 0.0
+    frames = []
+    data = [np.zeros(POINTS) for _ in SERIES]
+    for _ in range(FRAMES):
+        for i, (_, _, base, spread) in enumerate(SERIES):
+            if base is None:
+                energy += 0.001
+                value = energy
+            else:
+                value = base + rng.uniform(-spread, spread)
+            data[i] = np.append(data[i][1:], value)
+        frames.append([d.copy() for d in data])
+    return frames
+
+
+def run(name, step, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        step(frame)
+    elapsed = time.perf_counter() - start
+    fps = len(frames) / elapsed
+    status = "ok" if fps >= TARGET_FPS else "below target"
+    print(f"{name:<22} {fps:8.1f} fps  ({elapsed / len(frames) * 1000:.2f} ms/frame, {status})")
+    return fps
+
+
+if __name__ == "__main__":
+    frames = make_frames(np.random.default_rng(0))
+    print(f"{len(SERIES)} series x {POINTS} points, {FRAMES} frames, Agg canvas")
+
+    fig, axes, lines = build_figure()
+    fig.canvas.draw()
+
+    def full_redraw(frame):
+        for line, y in zip(lines, frame):
+            line.set_ydata(y)
+        for ax in axes:
+            ax.relim()
+            ax.autoscale_view()
+        fig.canvas.draw()
+
+    before = run("relim + full draw", full_redraw, frames)
+    plt.close(fig)
+
+    fig, axes, lines = build_figure()
+    blitter = BlitManager(fig.canvas, lines)
+    fig.canvas.draw()
+
+    def blit_redraw(frame):
+        for line, y in zip(lines, frame):
+            line.set_ydata(y)
+        blitter.update()
+
+    after = run("blit", blit_redraw, frames)
+    print(f"Full draws during blit run: {blitter.full_draws - 1} of {FRAMES} frames")
+    print(f"Speed-up: {after / before:.1f}x")
+    plt.close(fig)
@@ -0,0 +1,68 @@
+import math
+import time
+
+import numpy as np
+
+from energy_integrator import EnergyIntegrator
+
+# Benchmark settings
+SAMPLES = 200_000
+INTERVAL = 0.5          # seconds the loop sleeps between samples (loadf1 UPDATE_INTERVAL)
+STALL_PROB = 0.02       # chance a sample is delayed by a beep or speech
+STALL_RANGE = (0.5, 3.0)
+LOADS = ["Lighting", "HVAC", "Computers", "Industrial"]
+
+
+def make_samples(rng):
+    """Monotonic sample times with jitter and stalls, and a slowly varying power"""
+    dt = INTERVAL + rng.normal(0, 0.02, SAMPLES).clip(-0.1, 0.1)
+    stalls = rng.random(SAMPLES) < STALL_PROB
+    dt[stalls] += rng.uniform(*STALL_RANGE, stalls.sum())
+    t = np.cumsum(dt)
+    power = 20000 + 8000 * np.sin(t / 600) + rng.normal(0, 500, SAMPLES)
+    return t, power
+
+
+def exact_kwh(t, power):
+    """Trapezoidal energy summed exactly with math.fsum"""
+    return math.fsum(((power[1:] + power[:-1]) / 2 * np.diff(t)).tolist()) / 3_600_000
+
+
+def fixed_interval(t, power):
+    """Old loadf1 loop: every sample counts as one UPDATE_INTERVAL"""
+    energy = 0.0
+    for p in power.tolist():
+        energy += (p / 1000) * (INTERVAL / 3600)
+    return energy
+
+
+def wall_clock_rectangle(t, power):
+    """Old app.py: measured interval times the newest power, plain float sum"""
+    energy = 0.0
+    last = None
+    for now, p in zip(t.tolist(), power.tolist()):
+        time_diff = INTERVAL if last is None else now - last
+        last = now
+        energy += (p / 1000) * (time_diff / 3600)
+    return energy
+
+
+def integrator(t, power):
+    meter = EnergyIntegrator(LOADS)
+    shares = np.array([0.1, 0.4, 0.2, 0.3])
+    for now, p in zip(t.tolist(), power.tolist()):
+        meter.add(p, p * shares, t=now)
+    return meter.total
+
+
+if __name__ == "__main__":
+    t, power = make_samples(np.random.default_rng(0))
+    exact = exact_kwh(t, power)
+    print(f"{SAMPLES:,} samples over {t[-1] / 3600:.1f} h, {STALL_PROB:.0%} stalled; exact {exact:.6f} kWh")
+    for name, method in [("fixed interval", fixed_interval), ("wall-clock rect", wall_clock_rectangle),
+                         ("EnergyIntegrator", integrator)]:
+        start = time.perf_counter()
+        energy = method(t, power)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<17} {energy:12.6f} kWh  error {energy - exact:+.3e} kWh  "
+              f"{elapsed / SAMPLES * 1e6:6.2f} us/sample")
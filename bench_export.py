@@ -0,0 +1,71 @@
+import collections
+import csv
+import datetime
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from energy_integrator import EnergyIntegrator
+from exporters import sample_timestamps, write_csv
+
+# Benchmark settings
+ROWS = 1_000_000
+LEGACY_ROWS = (500, 1_000, 2_000)   # the per-row loop is quadratic; keep it small
+TIME_STEP = 0.5                     # seconds between samples (UPDATE_INTERVAL)
+
+
+def integrated_energy(power):
+    """Running kWh as the app records it, one EnergyIntegrator sample every TIME_STEP"""
+    meter = EnergyIntegrator()
+    return np.cumsum([meter.add(p, t=i * TIME_STEP) for i, p in enumerate(power)])
+
+
+def make_history(rng, n):
+    voltage = collections.deque(np.round(rng.uniform(220, 240, n), 2).tolist())
+    current = collections.deque(np.round(rng.uniform(50, 150, n), 2).tolist())
+    power = collections.deque(np.round(np.array(voltage) * np.array(current) * 0.9, 2).tolist())
+    return voltage, current, power, integrated_energy(power)
+
+
+def legacy_export(path, voltage_data, current_data, power_data, energy_data):
+    """The old loadf1 loop, minus its per-row DEBUG print; it recomputed energy per row"""
+    with open(path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "voltage", "current", "power", "energy"])
+        start_time = datetime.datetime.now() - datetime.timedelta(seconds=len(voltage_data) * TIME_STEP)
+        for i in range(len(voltage_data)):
+            timestamp = (start_time + datetime.timedelta(seconds=i * TIME_STEP)).strftime("%Y-%m-%d %H:%M:%S")
+            energy = sum(list(power_data)[:i + 1]) / 1000 * (TIME_STEP / 3600)
+            writer.writerow([timestamp, list(voltage_data)[i], list(current_data)[i], list(power_data)[i], energy])
+
+
+def vectorized_export(path, voltage_data, current_data, power_data, energy_data):
+    write_csv(path, {
+        "timestamp": sample_timestamps(len(power_data), TIME_STEP),
+        "voltage": np.asarray(voltage_data, dtype=np.float64),
+        "current": np.asarray(current_data, dtype=np.float64),
+        "power": np.asarray(power_data, dtype=np.float64),
+        "energy": energy_data
+    })
+
+
+def run(name, export, history, path):
+    start = time.perf_counter()
+    export(path, *history)
+    elapsed = time.perf_counter() - start
+    rows = len(history[0])
+    size = os.path.getsize(path) / 2**20
+    print(f"  {name:<11} {rows:>9,} rows  {elapsed:8.3f} s  {rows / elapsed:12,.0f} rows/s  {size:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.csv")
+        print("CSV export of the monitoring history")
+        for rows in LEGACY_ROWS:
+            run("per-row", legacy_export, make_history(rng, rows), path)
+        for rows in LEGACY_ROWS + (ROWS,):
+            run("vectorized", vectorized_export, make_history(rng, rows), path)
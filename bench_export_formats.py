@@ -0,0 +1,78 @@
+import io
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from energy_integrator import EnergyIntegrator
+from exporters import available_formats, export_bytes, sample_timestamps
+
+# Benchmark settings
+ROWS = 1_000_000
+TIME_STEP = 1.0   # seconds between samples (app UPDATE_INTERVAL)
+
+
+def integrated_energy(power):
+    """Running kWh as the app records it, one EnergyIntegrator sample every TIME_STEP"""
+    meter = EnergyIntegrator()
+    return np.cumsum([meter.add(p, t=i * TIME_STEP) for i, p in enumerate(power.tolist())])
+
+
+def make_columns(rng):
+    voltage = np.round(rng.uniform(220, 240, ROWS), 2)
+    current = np.round(rng.uniform(50, 150, ROWS), 2)
+    power = np.round(voltage * current * 0.9, 2)
+    return {
+        "timestamp": sample_timestamps(ROWS, TIME_STEP),
+        "voltage": voltage,
+        "current": current,
+        "power": power,
+        "energy": integrated_energy(power)
+    }
+
+
+def dataframe_csv(columns):
+    """The old export_data: DataFrame with formatted timestamps, then one CSV string"""
+    df = pd.DataFrame({
+        "timestamp": pd.Series(columns["timestamp"]).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        **{name: values for name, values in columns.items() if name != "timestamp"}
+    })
+    return df.to_csv(index=False)
+
+
+def read_back(fmt, data):
+    if fmt == "csv":
+        return pd.read_csv(io.BytesIO(data))
+    if fmt == "npz":
+        with np.load(io.BytesIO(data)) as arrays:
+            return {name: arrays[name] for name in arrays.files}
+    import pyarrow as pa
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(pa.BufferReader(data))
+    return pa.ipc.open_file(pa.BufferReader(data)).read_all()
+
+
+def run(name, encode, columns, fmt):
+    start = time.perf_counter()
+    data = encode(columns)
+    elapsed = time.perf_counter() - start
+    # pyarrow allocates outside tracemalloc, so its peak is about the output alone
+    tracemalloc.start()
+    data = encode(columns)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    read_back(fmt, data.encode() if isinstance(data, str) else data)
+    load = time.perf_counter() - start
+    print(f"  {name:<16} encode {elapsed:6.2f} s  peak {peak / 2**20:7.1f} MiB  "
+          f"size {len(data) / 2**20:6.1f} MiB  read back {load:6.3f} s")
+
+
+if __name__ == "__main__":
+    columns = make_columns(np.random.default_rng(0))
+    print(f"Export of {ROWS:,} rows x {len(columns)} columns")
+    run("DataFrame CSV", dataframe_csv, columns, "csv")
+    for fmt in available_formats():
+        run(fmt, lambda cols, fmt=fmt: export_bytes(cols, fmt), columns, fmt)
@@ -0,0 +1,87 @@
+import io
+import statistics
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from chart_cache import LiveChart
+
+# Benchmark settings
+RENDERS = 40
+POINTS = 200        # live window
+SAVEFIG_ARGS = {"format": "png", "bbox_inches": "tight", "dpi": 200}   # what st.pyplot does
+
+VOLTAGE_SPEC = {
+    "title": "Voltage Over Time", "ylabel": "Voltage (V)", "label": "Voltage (V)", "color": "blue",
+    "limit_label": "Threshold ({}V)", "reference": (230, "Nominal (230V)"), "ylim": (150, 300)
+}
+
+
+def make_series(rng):
+    return 230 + rng.uniform(-5, 5, POINTS)
+
+
+def rasterize(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_ARGS)
+    return buffer.tell()
+
+
+def render_rebuild(y, threshold, raster=True):
+    """Previous create_graphs behaviour: a fresh pyplot figure per rerun, never closed"""
+    fig, ax = plt.subplots(figsize=(12, 4))
+    ax.plot(range(POINTS), y, label="Voltage (V)", color="blue", linewidth=2)
+    ax.axhline(y=threshold, color='red', linestyle='--', alpha=0.7, label=f"Threshold ({threshold}V)")
+    ax.axhline(y=230, color='green', linestyle='--', alpha=0.7, label="Nominal (230V)")
+    ax.set_title("Voltage Over Time", fontsize=14, fontweight='bold')
+    ax.set_ylabel("Voltage (V)")
+    ax.set_xlabel("Time (samples)")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.set_ylim(150, 300)
+    return rasterize(fig) if raster else fig
+
+
+def render_cached(chart, y, threshold, raster=True):
+    """LiveChart: update the existing line in place, then rasterize"""
+    fig = chart.update(range(POINTS), y, threshold, x_label="Time (samples)")
+    return rasterize(fig) if raster else fig
+
+
+def run(name, func, frames):
+    timings = []
+    for frame in frames:
+        start = time.perf_counter()
+        func(frame)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<20} mean {statistics.mean(timings):7.1f} ms   p95 {p95:7.1f} ms")
+    return statistics.mean(timings)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    frames = [make_series(rng) for _ in range(RENDERS)]
+    print(f"Rendering {RENDERS} frames of {POINTS} points")
+
+    plt.rcParams["figure.max_open_warning"] = 0
+    chart = LiveChart(**VOLTAGE_SPEC)
+
+    print("Figure update only:")
+    build_before = run("rebuild per rerun", lambda y: render_rebuild(y, 250.0, raster=False), frames)
+    plt.close('all')
+    build_after = run("cached figure", lambda y: render_cached(chart, y, 250.0, raster=False), frames)
+
+    print("Update + rasterize (st.pyplot):")
+    before = run("rebuild per rerun", lambda y: render_rebuild(y, 250.0), frames)
+    leaked = len(plt.get_fignums())
+    plt.close('all')
+    after = run("cached figure", lambda y: render_cached(chart, y, 250.0), frames)
+    chart.close()
+
+    print(f"Open pyplot figures left by rebuild path: {leaked}, by cached path: {len(plt.get_fignums())}")
+    print(f"Speed-up: {build_before / build_after:.1f}x figure update, {before / after:.2f}x end to end")
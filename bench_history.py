@@ -0,0 +1,83 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from sample_history import SampleHistory
+
+# Benchmark settings
+SAMPLES = 1_000_000
+TICK_SIZES = (1_000, 100_000, 1_000_000)
+TICKS = 5
+COLUMNS = ["voltage", "current", "power"]
+
+
+def make_samples(rng):
+    voltage = np.round(rng.uniform(220, 240, SAMPLES), 2)
+    current = np.round(rng.uniform(0, 5, SAMPLES), 2)
+    power = np.round(voltage * current, 2)
+    return [{"voltage": v, "current": c, "power": p}
+            for v, c, p in zip(voltage.tolist(), current.tolist(), power.tolist())]
+
+
+def fill_list(samples):
+    log = []
+    for sample in samples:
+        log.append(dict(sample))  # each logged sample was its own dict
+    return log
+
+
+def fill_history(samples):
+    history = SampleHistory(COLUMNS)
+    for sample in samples:
+        history.append(sample)
+    return history
+
+
+def measure(fill, samples):
+    """Seconds per append, then bytes retained by a second, traced fill"""
+    start = time.perf_counter()
+    store = fill(samples)
+    elapsed = time.perf_counter() - start
+    del store
+    tracemalloc.start()
+    store = fill(samples)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store, elapsed / len(samples), retained
+
+
+def list_tick(log):
+    """The old update_plots: rebuild four lists and take max() of each column"""
+    times = list(range(len(log)))
+    columns = [[entry[name] for entry in log] for name in COLUMNS]
+    return times, [max(values) * 1.2 for values in columns]
+
+
+def history_tick(history):
+    times = history.positions()
+    return times, [(history.column(name), history.max(name) * 1.2) for name in COLUMNS]
+
+
+def tick_time(step, store):
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        step(store)
+    return (time.perf_counter() - start) / TICKS
+
+
+if __name__ == "__main__":
+    samples = make_samples(np.random.default_rng(0))
+    print(f"{SAMPLES:,} samples x {len(COLUMNS)} columns")
+
+    log, list_append, list_bytes = measure(fill_list, samples)
+    history, history_append, history_bytes = measure(fill_history, samples)
+    print(f"  list of dicts  {list_append * 1e6:6.2f} us/append  {list_bytes / 2**20:8.1f} MiB")
+    print(f"  SampleHistory  {history_append * 1e6:6.2f} us/append  {history_bytes / 2**20:8.1f} MiB "
+          f"(buffers {history.nbytes() / 2**20:.1f} MiB at capacity {history.capacity:,})")
+
+    print("Plot update (data prep + autoscale) per tick")
+    for size in TICK_SIZES:
+        old = tick_time(list_tick, log[:size])
+        new = tick_time(history_tick, history)
+        print(f"  {size:>9,} samples: list {old * 1000:9.3f} ms   history {new * 1000:7.4f} ms")
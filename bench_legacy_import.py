@@ -0,0 +1,62 @@
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from legacy_import import convert
+
+# Benchmark settings
+ROWS = 2_000_000
+GLUED_EVERY = 1000         # one missing newline per this many rows
+WORKER_COUNTS = (1, 2, 4)
+
+
+def write_log(path, rng):
+    """A load_data_log.csv in the app's format, with some rows glued together"""
+    start = np.datetime64("2024-01-01T00:00:00")
+    stamps = np.char.replace(np.datetime_as_string(start + np.arange(ROWS) * np.timedelta64(1, "s")), "T", " ")
+    voltage = np.round(rng.uniform(220, 240, ROWS), 1)
+    current = np.round(rng.uniform(50, 150, ROWS), 1)
+    power = np.round(voltage * current * 0.9, 0)
+    energy = np.cumsum(power) / 3_600_000
+    ends = np.full(ROWS, "\n", dtype=object)
+    ends[GLUED_EVERY::GLUED_EVERY] = ""
+    with open(path, "w") as file:
+        file.write("timestamp,voltage,current,power,energy\n")
+        for row in zip(stamps.tolist(), voltage.tolist(), current.tolist(), power.tolist(), energy.tolist(), ends.tolist()):
+            file.write("%s,%s,%s,%s,%s%s" % row)
+
+
+def per_row(path):
+    """The straightforward reader: csv module with per-field conversion"""
+    rows = 0
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row in reader:
+            if len(row) == 5:
+                np.datetime64(row[0])
+                [float(value) for value in row[1:]]
+                rows += 1
+    return rows
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load_data_log.csv")
+        write_log(path, rng)
+        size = os.path.getsize(path) / 2**20
+        print(f"{ROWS:,} rows, {size:.1f} MiB, one glued row every {GLUED_EVERY:,}")
+
+        start = time.perf_counter()
+        rows = per_row(path)
+        elapsed = time.perf_counter() - start
+        print(f"  csv.reader loop  {elapsed:6.2f} s  {size / elapsed:6.1f} MB/s  ({rows:,} rows, glued rows lost)")
+
+        for workers in WORKER_COUNTS:
+            stats = convert(path, os.path.join(tmp, f"store_{workers}"), workers=workers)
+            print(f"  convert x{workers}       {stats['seconds']:6.2f} s  {size / stats['seconds']:6.1f} MB/s  "
+                  f"({stats['rows']:,} rows, {stats['repaired']:,} repaired, {stats['rejected']:,} rejected)")
@@ -0,0 +1,55 @@
+import csv
+import datetime
+import os
+import tempfile
+import time
+
+from log_sink import BufferedLogSink, LOG_HEADER
+
+# Benchmark settings
+ROWS = 20000
+
+
+def make_row(i):
+    timestamp = datetime.datetime(2025, 1, 1) + datetime.timedelta(seconds=i)
+    return [timestamp.strftime("%Y-%m-%d %H:%M:%S"), 230.1, 135.9, 29427.0, i * 0.0001]
+
+
+def log_per_sample(path, rows):
+    """Previous log_data behaviour: open, append and close for every row"""
+    for row in rows:
+        file_exists = os.path.isfile(path)
+        with open(path, mode='a', newline='') as file:
+            writer = csv.writer(file)
+            if not file_exists:
+                writer.writerow(LOG_HEADER)
+            writer.writerow(row)
+
+
+def log_buffered(path, rows):
+    """BufferedLogSink with its default flush budget"""
+    sink = BufferedLogSink(path)
+    for row in rows:
+        sink.write(row)
+    sink.close()
+
+
+def run(name, func, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load_data_log.csv")
+        start = time.perf_counter()
+        func(path, rows)
+        elapsed = time.perf_counter() - start
+        with open(path) as f:
+            written = sum(1 for _ in f) - 1
+    assert written == len(rows), f"{name}: wrote {written} of {len(rows)} rows"
+    print(f"{name:<20} {len(rows) / elapsed:>12,.0f} rows/sec  ({elapsed * 1000:.1f} ms)")
+    return elapsed
+
+
+if __name__ == "__main__":
+    rows = [make_row(i) for i in range(ROWS)]
+    print(f"Logging {ROWS} rows")
+    before = run("per-sample append", log_per_sample, rows)
+    after = run("buffered sink", log_buffered, rows)
+    print(f"Speed-up: {before / after:.1f}x")
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import numpy as np
+
+from inference_worker import InferenceWorker
+from retrieval import BM25Index, TOP_K, qa_batch, rank_answers, top_chunks
+
+# Load-test settings
+CLIENTS = (1, 8, 32)
+REQUESTS_PER_CLIENT = 20
+CALL_OVERHEAD = 0.030   # seconds per pipeline call (tokenizer setup, kernel launches)
+PER_CONTEXT = 0.002     # seconds per (question, context) pair in a batch
+PAGES = 40
+
+
+class StandInQAModel:
+    """Local stand-in for the transformers pipeline with a batch-shaped cost.
+
+    A call costs a fixed overhead plus a small amount per pair, which is
+    roughly how a batched forward pass behaves; ``time.sleep`` releases
+    the GIL like the real model's native code does.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, question, context):
+        self.calls += 1
+        time.sleep(CALL_OVERHEAD + PER_CONTEXT * len(context))
+        return [{"answer": text.split()[0], "score": 1.0 / (i + 1)} for i, text in enumerate(context)]
+
+
+def make_index(rng):
+    words = [f"word{i}" for i in range(2000)]
+    index = BM25Index()
+    pages = {}
+    for page in range(1, PAGES + 1):
+        pages[page] = " ".join(rng.choice(words, 300))
+        index.add(pages[page], page=page)
+    return index, pages, words
+
+
+async def ask(worker, index, pages, question):
+    """The ask-question handler's path: retrieve, await the worker, rank"""
+    chunk_ids = top_chunks(index, question, TOP_K)
+    results = await worker.submit((question, index.contexts(chunk_ids, pages.get)))
+    return rank_answers(index, chunk_ids, results)
+
+
+async def client(worker, index, pages, questions, latencies):
+    for question in questions:
+        start = time.perf_counter()
+        await ask(worker, index, pages, question)
+        latencies.append(time.perf_counter() - start)
+
+
+async def load_test(max_batch, n_clients, index, pages, words, rng):
+    model = StandInQAModel()
+    worker = InferenceWorker(lambda requests: qa_batch(model, requests), max_batch=max_batch)
+    latencies = []
+    questions = [[" ".join(rng.choice(words, 5)) for _ in range(REQUESTS_PER_CLIENT)] for _ in range(n_clients)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(worker, index, pages, q, latencies) for q in questions))
+    elapsed = time.perf_counter() - start
+    worker.close()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"  max_batch {max_batch:2d}: p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  "
+          f"{len(latencies) / elapsed:6.1f} req/s  ({model.calls} model calls)")
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    index, pages, words = make_index(rng)
+    print(f"Stand-in model: {CALL_OVERHEAD * 1000:.0f} ms per call + {PER_CONTEXT * 1000:.0f} ms per context, "
+          f"top-{TOP_K} contexts per question")
+    for n_clients in CLIENTS:
+        print(f"{n_clients} concurrent clients x {REQUESTS_PER_CLIENT} questions")
+        for max_batch in (1, 16):
+            asyncio.run(load_test(max_batch, n_clients, index, pages, words, rng))
@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+
+from retrieval import BM25Index, TOP_K
+
+# Benchmark settings
+PAGES = (50, 500, 2000)
+WORDS_PER_PAGE = 250
+VOCABULARY = 5000
+QUERIES = 200
+
+
+def make_pages(rng, n_pages):
+    """Synthetic slide text with a Zipf-like word distribution"""
+    vocabulary = np.array([f"term{i}" for i in range(VOCABULARY)])
+    weights = 1.0 / np.arange(1, VOCABULARY + 1)
+    weights /= weights.sum()
+    return [" ".join(rng.choice(vocabulary, WORDS_PER_PAGE, p=weights)) for _ in range(n_pages)]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    queries = [" ".join(f"term{i}" for i in rng.integers(0, 500, 6)) for _ in range(QUERIES)]
+    for n_pages in PAGES:
+        pages = make_pages(rng, n_pages)
+
+        start = time.perf_counter()
+        index = BM25Index()
+        for page_number, text in enumerate(pages, start=1):
+            index.add(text, page=page_number)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in queries:
+            hits = index.search(query, TOP_K)
+        search = (time.perf_counter() - start) / len(queries)
+
+        full_context = n_pages * WORDS_PER_PAGE
+        top_context = sum(len(text.split()) for text in index.contexts([chunk_id for chunk_id, _ in hits],
+                                                                        lambda page: pages[page - 1]))
+        print(f"{n_pages:5d} pages: {len(index):5d} chunks, build {build * 1000:7.1f} ms, "
+              f"search {search * 1000:6.2f} ms/query, QA context {full_context} -> {top_context} words")
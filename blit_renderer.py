@@ -0,0 +1,102 @@
+import numpy as np
+
+# Defaults
+RESCALE_MARGIN = 0.1    # headroom added around the data when an axis is rescaled
+SHRINK_RATIO = 0.25     # also rescale once the data fills less than this share of the view
+
+
+class BlitManager:
+    """Fast redraw path for live line plots on an Agg-based canvas.
+
+    The figure is drawn in full once (and again after a resize or a
+    rescale) and a copy of it without the line artists is kept as the
+    background. Each ``update`` restores that background, draws only the
+    lines and blits the result, so titles, ticks, labels, legends and grids
+    are not re-rendered every tick.
+
+    An axis is rescaled only when its data leaves the current view, or
+    shrinks to a small part of it; that costs one full draw.
+    """
+
+    def __init__(self, canvas, lines, margin=RESCALE_MARGIN, shrink=SHRINK_RATIO):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.lines = list(lines)
+        self.margin = margin
+        self.shrink = shrink
+        self.full_draws = 0
+
+        self._background = None
+        self._axes = []
+        for line in self.lines:
+            line.set_animated(True)
+            if line.axes not in self._axes:
+                self._axes.append(line.axes)
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        """A full draw happened (first show, resize, rescale): recapture the background"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.full_draws += 1
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines:
+            if line.get_visible():
+                self.figure.draw_artist(line)
+
+    def _data_limits(self, ax):
+        """(xmin, xmax, ymin, ymax) of the managed lines on ``ax``, or None"""
+        xs, ys = [], []
+        for line in self.lines:
+            if line.axes is ax:
+                x = np.asarray(line.get_xdata(), dtype=np.float64)
+                y = np.asarray(line.get_ydata(), dtype=np.float64)
+                if x.size and y.size:
+                    xs.append((np.nanmin(x), np.nanmax(x)))
+                    ys.append((np.nanmin(y), np.nanmax(y)))
+        if not xs:
+            return None
+        return min(x[0] for x in xs), max(x[1] for x in xs), min(y[0] for y in ys), max(y[1] for y in ys)
+
+    def _padded(self, low, high):
+        span = high - low or abs(high) or 1.0
+        return low - span * self.margin, high + span * self.margin
+
+    def _rescale(self):
+        """Move the limits of any axis whose data no longer fits; True if one changed"""
+        changed = False
+        for ax in self._axes:
+            limits = self._data_limits(ax)
+            if limits is None or not np.all(np.isfinite(limits)):
+                continue
+            xmin, xmax, ymin, ymax = limits
+
+            if (xmin, xmax) != tuple(ax.get_xlim()) and xmax > xmin:
+                ax.set_xlim(xmin, xmax)
+                changed = True
+
+            low, high = ax.get_ylim()
+            target = self._padded(ymin, ymax)
+            outside = ymin < low or ymax > high
+            too_small = (ymax - ymin) < (high - low) * self.shrink and target != (low, high)
+            if outside or too_small:
+                ax.set_ylim(*target)
+                changed = True
+        return changed
+
+    def update(self):
+        """Redraw the lines, doing a full draw only when the axes had to change"""
+        if self._rescale() or self._background is None:
+            # The draw_event handler recaptures the background and draws the lines
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_lines()
+        self.canvas.blit(self.figure.bbox)
+
+    def disconnect(self):
+        """Stop tracking draws and hand the lines back to normal rendering"""
+        self.canvas.mpl_disconnect(self._cid)
+        for line in self.lines:
+            line.set_animated(False)
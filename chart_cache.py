@@ -0,0 +1,132 @@
+import numpy as np
+from matplotlib.figure import Figure
+
+from downsample import axes_pixel_width, lttb_indices
+
+# Defaults
+FIGURE_SIZE = (12, 4)
+BAND_ALPHA = 0.15
+
+
+class LiveChart:
+    """A persistent figure whose artists are updated in place.
+
+    The axes, title, legend and threshold lines are built once; ``update``
+    only swaps the line data, moves the threshold and rescales. Figures are
+    created through ``matplotlib.figure.Figure`` rather than ``pyplot`` so
+    they never enter pyplot's global registry and are freed with the chart.
+    """
+
+    def __init__(self, title, ylabel, label, color, limit_label, reference=None, ylim=None,
+                 low_limit=None, time_axis=False, figsize=FIGURE_SIZE):
+        self.color = color
+        self.limit_label = limit_label
+        self.ylim = ylim
+        self.low_limit = low_limit
+
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.subplots()
+        if time_axis:
+            # Fix the date converter up front so empty windows keep a date axis
+            self.ax.xaxis.update_units(np.zeros(0, dtype="datetime64[ms]"))
+
+        self.line, = self.ax.plot([], [], label=label, color=color, linewidth=2)
+        self.limit_line = self.ax.axhline(y=0, color='red', linestyle='--', alpha=0.7)
+        if reference is not None:
+            value, reference_label = reference
+            self.ax.axhline(y=value, color='green', linestyle='--', alpha=0.7, label=reference_label)
+        self.band = None
+
+        self.ax.set_title(title, fontsize=14, fontweight='bold')
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True, alpha=0.3)
+        if ylim is not None:
+            self.ax.set_ylim(*ylim)
+
+        self._limit = None
+        self._x_label = None
+        self._legend_key = None
+
+    def update(self, x, y, limit, band=None, x_label=""):
+        """Replace the plotted data; ``band`` is an optional ``(low, high)`` pair"""
+        x, y, band = self._decimate(x, y, limit, band)
+        self.line.set_data(x, y)
+
+        if limit != self._limit:
+            self.limit_line.set_ydata([limit, limit])
+            self.limit_line.set_label(self.limit_label.format(limit))
+            self._limit = limit
+
+        # A fill region cannot be reshaped in place, so the band is swapped
+        if self.band is not None:
+            self.band.remove()
+            self.band = None
+        if band is not None:
+            self.band = self.ax.fill_between(x, *band, color=self.color, alpha=BAND_ALPHA, label="Min/Max")
+
+        if x_label != self._x_label:
+            self.ax.set_xlabel(x_label)
+            self._x_label = x_label
+
+        # Legend only needs rebuilding when its entries change
+        legend_key = (self._limit, self.band is not None)
+        if legend_key != self._legend_key:
+            self.ax.legend()
+            self._legend_key = legend_key
+
+        self.ax.relim()
+        if self.band is not None:
+            self.ax.update_datalim(self.band.get_datalim(self.ax.transData).get_points())
+        self.ax.autoscale_view(scaley=self.ylim is None)
+        return self.figure
+
+    def _decimate(self, x, y, limit, band):
+        """LTTB-reduce series longer than the axes is wide, keeping alarm samples"""
+        width = axes_pixel_width(self.ax)
+        if len(y) <= width:
+            return x, y, band
+        y = np.asarray(y, dtype=np.float64)
+        keep = y > limit
+        if self.low_limit is not None:
+            keep |= y < self.low_limit
+        if band is not None:
+            keep |= np.asarray(band[1]) > limit
+        idx = lttb_indices(x, y, width, keep)
+        if band is not None:
+            band = (np.asarray(band[0])[idx], np.asarray(band[1])[idx])
+        return np.asarray(x)[idx], y[idx], band
+
+    def close(self):
+        """Drop every artist so the figure can be garbage collected"""
+        self.figure.clear()
+        self.band = None
+
+
+class ChartCache:
+    """Per-session set of ``LiveChart`` objects, built on first use.
+
+    Charts are keyed by name and by whether the x axis holds sample numbers
+    or timestamps, since an axis cannot switch units once it has data.
+    """
+
+    def __init__(self, specs):
+        self.specs = specs
+        self._charts = {}
+
+    def get(self, name, time_axis=False):
+        """The cached chart for ``name``, building it the first time"""
+        key = (name, time_axis)
+        chart = self._charts.get(key)
+        if chart is None:
+            chart = LiveChart(time_axis=time_axis, **self.specs[name])
+            self._charts[key] = chart
+        return chart
+
+    def __len__(self):
+        return len(self._charts)
+
+    def close(self):
+        """Release every figure held by this cache"""
+        for chart in self._charts.values():
+            chart.close()
+        self._charts.clear()
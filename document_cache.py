@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+
+# Defaults
+CACHE_DIR = "slide_cache"
+ANSWER_CACHE_SIZE = 256
+READ_BLOCK = 1024 * 1024
+PAGES_FILE = "pages.jsonl"   # one {"page", "text"} object per line, in completion order
+INDEX_FILE = "index-v2.pkl"  # v2: chunks are page offsets, their text is read from PAGES_FILE
+
+
+def digest_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path, block_size=READ_BLOCK):
+    """SHA-256 of a file, read in blocks"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class PageSpool:
+    """Page text spooled to a JSON-lines file and read back one page at a time.
+
+    Only the byte offset of each page's line is held in memory, so the
+    text of a deck costs disk space rather than RAM. Appends and reads are
+    serialized, and ``move`` renames the file under the same lock. Without
+    a path, or once the file cannot be written, pages are kept in memory.
+    """
+
+    def __init__(self, path=None, offsets=None):
+        self.path = path
+        self.offsets = dict(offsets or {})   # page number -> byte offset of its line
+        self.memory = {}                     # pages that could not be spooled
+        self._lock = threading.Lock()
+
+    @classmethod
+    def scan(cls, path):
+        """Spool over an existing pages file; raises OSError or ValueError if it is unreadable"""
+        offsets = {}
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                offsets[json.loads(line)["page"]] = offset
+                offset += len(line)
+        return cls(path, offsets)
+
+    def __len__(self):
+        return len(self.offsets) + len(self.memory)
+
+    @property
+    def on_disk(self):
+        """Whether every page is in the file"""
+        return self.path is not None and not self.memory
+
+    def append(self, page_number, text):
+        line = (json.dumps({"page": page_number, "text": text}) + "\n").encode("utf-8")
+        with self._lock:
+            if self.path is not None and not self.memory:
+                try:
+                    with open(self.path, "ab") as f:
+                        offset = f.tell()
+                        f.write(line)
+                    self.offsets[page_number] = offset
+                    return
+                except OSError:
+                    pass
+            self.memory[page_number] = text
+
+    def read(self, page_number):
+        """Text of a page; empty for pages that were never appended"""
+        with self._lock:
+            if page_number in self.memory:
+                return self.memory[page_number]
+            offset = self.offsets.get(page_number)
+            if offset is None:
+                return ""
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                line = f.readline()
+        return json.loads(line)["text"]
+
+    def move(self, path):
+        with self._lock:
+            os.replace(self.path, path)
+            self.path = path
+
+
+class DocumentCache:
+    """On-disk cache of extracted page text and retrieval indexes.
+
+    Entries live in ``<root>/<sha256 of the PDF>/``, so the same deck
+    uploaded under any name is extracted and indexed only once. Pages can
+    be appended one at a time while a deck is still being extracted
+    (``begin`` returns a ``PageSpool``, ``finish`` publishes it); files are
+    written under a temporary name and renamed, so a crash never leaves a
+    half-written entry behind. Page text is never loaded as a whole: loaded
+    entries are spools read one page at a time.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def _path(self, digest, name):
+        return os.path.join(self.root, digest, name)
+
+    def __contains__(self, digest):
+        return os.path.exists(self._path(digest, INDEX_FILE))
+
+    def load(self, digest):
+        """``(pages, index)`` for a cached document, or None; ``pages`` is a ``PageSpool``"""
+        try:
+            with open(self._path(digest, INDEX_FILE), "rb") as f:
+                index = pickle.load(f)
+            pages = PageSpool.scan(self._path(digest, PAGES_FILE))
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError, EOFError):
+            return None
+        return pages, index
+
+    def begin(self, digest):
+        """Start a new entry, discarding pages left over from an interrupted one"""
+        os.makedirs(os.path.join(self.root, digest), exist_ok=True)
+        path = self._path(digest, PAGES_FILE) + ".tmp"
+        open(path, "w").close()
+        return PageSpool(path)
+
+    def finish(self, digest, index, pages):
+        """Publish the spooled pages and the index"""
+        pages.move(self._path(digest, PAGES_FILE))
+        # The index is written last: its presence marks a complete entry
+        self._write(self._path(digest, INDEX_FILE), pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def spool(self, digest):
+        """``begin``, or an in-memory ``PageSpool`` when the cache cannot be written (it is optional)"""
+        try:
+            return self.begin(digest)
+        except OSError:
+            return PageSpool()
+
+    def publish(self, digest, index, pages):
+        """``finish`` if every page reached the spool file; returns False if the entry was not written"""
+        if not pages.on_disk:
+            return False
+        try:
+            self.finish(digest, index, pages)
+        except OSError:
+            return False
+        return True
+
+    def _write(self, path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def normalize_question(question):
+    """Case, whitespace and trailing punctuation do not change the question"""
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!. ").lower()
+
+
+class AnswerCache:
+    """Thread-safe LRU of answers keyed by (document digest, normalized question)"""
+
+    def __init__(self, maxsize=ANSWER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._answers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest, question):
+        key = (digest, normalize_question(question))
+        with self._lock:
+            answer = self._answers.get(key)
+            if answer is None:
+                self.misses += 1
+                return None
+            self._answers.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def put(self, digest, question, answer):
+        key = (digest, normalize_question(question))
+        with self._lock:
+            self._answers[key] = answer
+            self._answers.move_to_end(key)
+            if len(self._answers) > self.maxsize:
+                self._answers.popitem(last=False)
+
+    def __len__(self):
+        return len(self._answers)
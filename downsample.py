@@ -0,0 +1,87 @@
+import numpy as np
+
+# Defaults
+MIN_POINTS = 3      # first point, last point and at least one bucket
+
+
+def _as_float(values):
+    """Numeric view of x or y values (datetime64 becomes its integer ticks)"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64) or np.issubdtype(values.dtype, np.timedelta64):
+        return values.astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def axes_pixel_width(ax):
+    """Width of a matplotlib axes in pixels: the useful number of points to plot"""
+    return max(MIN_POINTS, int(ax.bbox.width))
+
+
+def lttb_indices(x, y, n_out, keep=None):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept and the rest are split into
+    ``n_out - 2`` equal buckets. From each bucket the point forming the
+    largest triangle with the previous and the next bucket is kept. The
+    previous bucket is represented by its average (like the next one)
+    rather than by its selected point, which removes the sequential
+    dependency so every bucket is solved in a single NumPy pass.
+
+    ``keep`` is an optional boolean mask of points that must stay visible,
+    e.g. samples above an alert threshold; the most extreme of them in each
+    bucket is added to the result, so at most ``2 * n_out`` points return.
+    Indices come back sorted.
+    """
+    n = len(y)
+    if n <= n_out or n_out < MIN_POINTS:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # Bucket id of every interior point (first and last sit outside)
+    n_buckets = n_out - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    starts = edges[:-1] - 1
+    counts = np.diff(edges)
+    bucket = np.repeat(np.arange(n_buckets), counts)
+    px, py = x[1:n - 1], y[1:n - 1]
+
+    # Average point of every bucket, padded with the fixed end points
+    mean_x = np.add.reduceat(px, starts) / counts
+    mean_y = np.add.reduceat(py, starts) / counts
+    anchor_x = np.concatenate(([x[0]], mean_x, [x[-1]]))
+    anchor_y = np.concatenate(([y[0]], mean_y, [y[-1]]))
+
+    # Doubled triangle area between previous anchor, candidate and next anchor
+    ax_ = np.repeat(anchor_x[:-2], counts)
+    ay_ = np.repeat(anchor_y[:-2], counts)
+    dx = np.repeat(anchor_x[:-2] - anchor_x[2:], counts)
+    dy = np.repeat(anchor_y[2:] - anchor_y[:-2], counts)
+    area = np.abs(dx * (py - ay_) - (ax_ - px) * dy)
+
+    selected = _first_max(area, bucket, starts)
+    if keep is not None:
+        keep = np.asarray(keep, dtype=bool)[1:n - 1]
+        if keep.any():
+            # Most extreme forced point per bucket, measured from the bucket mean
+            deviation = np.where(keep, np.abs(py - np.repeat(mean_y, counts)), -1.0)
+            forced = _first_max(deviation, bucket, starts)
+            selected = np.union1d(selected, forced[keep[forced]])
+
+    return np.concatenate(([0], selected + 1, [n - 1]))
+
+
+def _first_max(values, bucket, starts):
+    """Position of the first maximum of ``values`` in every bucket"""
+    best = np.maximum.reduceat(values, starts)
+    hits = np.flatnonzero(values == best[bucket])
+    # ``hits`` is sorted, so the first hit of a bucket is where the id changes
+    return hits[np.flatnonzero(np.diff(bucket[hits], prepend=-1))]
+
+
+def downsample(x, y, n_out, keep=None):
+    """``(x, y)`` reduced to about ``n_out`` points; short series pass through"""
+    if len(y) <= n_out:
+        return x, y
+    idx = lttb_indices(x, y, n_out, keep)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
@@ -0,0 +1,129 @@
+import csv
+import datetime
+import io
+
+import numpy as np
+
+from lazy_imports import optional_import
+
+pa = optional_import("pyarrow")
+
+# Defaults
+CHUNK_ROWS = 65536
+TIMESTAMP_UNIT = "s"
+PARQUET_COMPRESSION = "zstd"
+
+# Download formats: label, file extension, MIME type
+EXPORT_FORMATS = {
+    "csv": ("CSV", "csv", "text/csv"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow IPC", "arrow", "application/vnd.apache.arrow.file"),
+    "npz": ("NumPy .npz", "npz", "application/octet-stream")
+}
+
+
+def sample_timestamps(n, interval_s, end=None):
+    """``n`` evenly spaced ``datetime64[ms]`` stamps; the first is ``n`` intervals before ``end``"""
+    end = np.datetime64(end or datetime.datetime.now(), "ms")
+    steps = np.round(np.arange(-n, 0) * interval_s * 1000).astype("timedelta64[ms]")
+    return end + steps
+
+
+def format_timestamps(times, unit=TIMESTAMP_UNIT):
+    """``YYYY-MM-DD HH:MM:SS`` strings for a datetime64 array, without a Python loop"""
+    return np.char.replace(np.datetime_as_string(np.asarray(times), unit=unit), "T", " ")
+
+
+def _column_chunk(values, start, stop):
+    chunk = values[start:stop]
+    if np.issubdtype(chunk.dtype, np.datetime64):
+        chunk = format_timestamps(chunk)
+    return chunk.tolist()
+
+
+def iter_csv_chunks(columns, chunk_rows=CHUNK_ROWS, header=True):
+    """CSV text for a ``{name: array}`` mapping, yielded ``chunk_rows`` rows at a time.
+
+    Each chunk is converted column-wise (datetime columns are formatted
+    vectorized) and written with one ``writerows`` call, so memory is
+    bounded by the chunk size rather than the history length.
+    """
+    names = list(columns)
+    arrays = [np.asarray(columns[name]) for name in names]
+    n = len(arrays[0]) if arrays else 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(names)
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        writer.writerows(zip(*(_column_chunk(values, start, stop) for values in arrays)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_csv(path, columns, chunk_rows=CHUNK_ROWS):
+    """Stream ``columns`` to a CSV file chunk by chunk; returns the row count"""
+    with open(path, "w", newline="") as file:
+        for chunk in iter_csv_chunks(columns, chunk_rows):
+            file.write(chunk)
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def available_formats():
+    """Export formats usable here; Parquet and Arrow need pyarrow"""
+    return [fmt for fmt in EXPORT_FORMATS if pa is not None or fmt not in ("parquet", "arrow")]
+
+
+def csv_bytes(columns, chunk_rows=CHUNK_ROWS):
+    """UTF-8 CSV built from the chunk stream, with no DataFrame or full-size str in between"""
+    buffer = io.BytesIO()
+    for chunk in iter_csv_chunks(columns, chunk_rows):
+        buffer.write(chunk.encode("utf-8"))
+    return buffer.getvalue()
+
+
+def arrow_table(columns):
+    """A ``pyarrow.Table`` over the column arrays; numeric and datetime64 columns are not copied"""
+    return pa.table({name: pa.array(np.asarray(values)) for name, values in columns.items()})
+
+
+def parquet_bytes(columns, compression=PARQUET_COMPRESSION):
+    import pyarrow.parquet as pq
+    sink = pa.BufferOutputStream()
+    pq.write_table(arrow_table(columns), sink, compression=compression)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_ipc_bytes(columns):
+    table = arrow_table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=CHUNK_ROWS)
+    return sink.getvalue().to_pybytes()
+
+
+def _npz_array(values):
+    values = np.asarray(values)
+    if values.dtype == object:
+        # Object arrays would need pickling to load; store text instead
+        values = np.array(["" if value is None else str(value) for value in values], dtype=str)
+    return values
+
+
+def npz_bytes(columns):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **{name: _npz_array(values) for name, values in columns.items()})
+    return buffer.getvalue()
+
+
+def export_bytes(columns, fmt="csv"):
+    """Encode a ``{name: array}`` mapping in one of ``EXPORT_FORMATS``"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt in ("parquet", "arrow") and pa is None:
+        raise RuntimeError(f"{EXPORT_FORMATS[fmt][0]} export requires pyarrow")
+    return {"csv": csv_bytes, "parquet": parquet_bytes, "arrow": arrow_ipc_bytes, "npz": npz_bytes}[fmt](columns)
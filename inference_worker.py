@@ -0,0 +1,103 @@
+import asyncio
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Defaults
+MAX_BATCH = 16        # requests per forward pass
+MAX_WAIT_MS = 10      # how long the first request of a batch waits for company
+QUEUE_SIZE = 1024
+
+
+class InferenceWorker:
+    """Runs a blocking model on one dedicated thread with dynamic micro-batching.
+
+    ``submit`` puts a request on a bounded queue and returns an awaitable.
+    The worker takes the first waiting request, keeps collecting for up to
+    ``max_wait_ms`` or until ``max_batch`` requests are in hand, then calls
+    ``predict_batch(requests)`` once; it must return one result per
+    request, in order. If the call raises, every request of the batch
+    fails with that exception. The event loop never runs model code.
+    """
+
+    def __init__(self, predict_batch, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, maxsize=QUEUE_SIZE):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self.busy = 0.0  # seconds spent in predict_batch
+
+        self._queue = queue.Queue(maxsize)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="inference-worker", daemon=True)
+        self._thread.start()
+
+    def submit_future(self, request):
+        """Queue a request; returns a ``concurrent.futures.Future``.
+
+        Raises ``queue.Full`` when ``maxsize`` requests are already waiting.
+        """
+        if self._closed:
+            raise RuntimeError("inference worker is closed")
+        future = Future()
+        self._queue.put_nowait((request, future))  # queue.Full when overloaded
+        return future
+
+    def submit(self, request):
+        """Queue a request from async code; await the result"""
+        return asyncio.wrap_future(self.submit_future(request))
+
+    def retry_after(self):
+        """Whole seconds until the requests queued now are likely served (at least 1)"""
+        per_batch = self.busy / self.batches if self.batches else 0.0
+        return max(1, math.ceil(self._queue.qsize() / self.max_batch * per_batch))
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or the wait is over"""
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # let the loop see the shutdown after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            batch = [(request, future) for request, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            start = time.monotonic()
+            try:
+                results = self.predict_batch([request for request, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self.busy += time.monotonic() - start
+            self.batches += 1
+            self.requests += len(batch)
+
+    def close(self, timeout=1.0):
+        """Finish the queued requests and stop the worker"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
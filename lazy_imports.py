@@ -0,0 +1,142 @@
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+# Defaults
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "PROFILE_STARTUP"   # for entry points started by another CLI (uvicorn)
+STARTUP_TARGET = 1.0              # seconds
+REPORT_TOP = 15
+
+
+class LazyModule:
+    """Module proxy that performs the real import on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            name = self.__dict__["_name"]
+            __import__(name)  # through builtins so the startup profiler sees it
+            module = sys.modules[name]
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """Deferred ``import name``; a module that is already imported is returned as is"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def optional_import(name):
+    """Like ``lazy_import`` but None when the module is not installed.
+
+    Availability is checked with ``find_spec``, which locates the module
+    without executing it.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    return LazyModule(name)
+
+
+class StartupProfiler:
+    """Times every import made by the application code while it starts.
+
+    ``builtins.__import__`` is wrapped so that each outermost import of a
+    module not yet in ``sys.modules`` is timed, including everything it
+    pulls in. ``mark_ready`` prints the slowest of them next to the total
+    time to the first usable screen; imports made afterwards (lazily) are
+    printed as they happen.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = None
+        self.ready_at = None
+        self.times = {}
+        self._local = threading.local()   # import nesting depth per thread
+        self._original = None
+
+    def start_if_requested(self, argv=None):
+        """Start profiling when ``--profile-startup`` or ``PROFILE_STARTUP=1`` is given"""
+        argv = sys.argv if argv is None else argv
+        if PROFILE_FLAG in argv:
+            argv.remove(PROFILE_FLAG)
+            self.start()
+        elif os.environ.get(PROFILE_ENV) == "1":
+            self.start()
+        return self.enabled
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        begin = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                elapsed = time.perf_counter() - begin
+                if self.ready_at is None:
+                    self.times[name] = self.times.get(name, 0.0) + elapsed
+                else:
+                    print(f"Deferred import: {name} {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+    def mark_ready(self, label="ready"):
+        """Print the startup report; later imports are reported one by one"""
+        if not self.enabled or self.ready_at is not None:
+            return
+        self.ready_at = time.perf_counter()
+        print(self.report(label), file=sys.stderr)
+
+    def report(self, label="ready"):
+        total = (self.ready_at or time.perf_counter()) - self.started
+        status = "ok" if total <= STARTUP_TARGET else f"over the {STARTUP_TARGET:.1f}s target"
+        lines = [f"Startup: {label} after {total:.3f}s ({status})"]
+        ranked = sorted(self.times.items(), key=lambda item: item[1], reverse=True)
+        for name, seconds in ranked[:REPORT_TOP]:
+            lines.append(f"  {seconds * 1000:9.1f} ms  {name}")
+        if len(ranked) > REPORT_TOP:
+            rest = sum(seconds for _, seconds in ranked[REPORT_TOP:])
+            lines.append(f"  {rest * 1000:9.1f} ms  ({len(ranked) - REPORT_TOP} more)")
+        return "\n".join(lines)
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,205 @@
+import argparse
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from timeseries_store import HISTORY_COLUMNS, TimeSeriesStore, from_local_datetime64
+
+# Defaults
+CHUNK_BYTES = 8 * 1024 * 1024   # bytes of CSV parsed per worker task
+OUTPUT_DIR = "legacy_history"
+UNTIMED_DIR = "untimed"          # store for rows written without a timestamp
+UNTIMED_COLUMNS = ("voltage", "current", "power")
+MAX_FIELDS = 5
+
+# Row timestamps; a row is "glued" when one follows a digit or "." with no
+# newline in between, e.g. "...,0.02025-08-14 11:33:13,..."
+TIMESTAMP = r"(?:19|20)\d{2}-\d{2}-\d{2}[ T]\d{2}:\d{2}"
+TIMESTAMP_RE = re.compile(TIMESTAMP.encode())
+# Header lines: the log header and the Tkinter apps' export headers
+HEADER = r"\s*(?:timestamp|voltage)\b"
+HEADER_WORDS = ["timestamp"] + list(HISTORY_COLUMNS) + ["Timestamp", "Voltage (V)", "Current (A)", "Power (W)"]
+
+# Row layouts per writer: (starts with a timestamp, field count) -> value columns
+LEGACY_SCHEMAS = {
+    (True, 5): ("voltage", "current", "power", "energy"),   # app.py / loadf1 load_data_log.csv
+    (True, 4): ("voltage", "current", "power"),             # load18 energy_data.csv
+    (False, 3): ("voltage", "current", "power")             # load16 / load17 energy_data.csv
+}
+
+
+def chunk_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """Byte ranges of about ``chunk_bytes`` that start and end on line boundaries"""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_bytes, size))
+            file.readline()
+            stop = min(file.tell(), size)
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+
+def repair_rows(data):
+    """Split glued rows back onto their own lines; returns (data, rows split).
+
+    Candidates are found with array operations on the year's "-" (digit or
+    "." five bytes before it, another "-" three bytes after), so only those
+    few positions are checked with the timestamp regex.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    dashes = np.flatnonzero(buffer == ord("-"))
+    dashes = dashes[(dashes >= 5) & (dashes + 3 < buffer.size)]
+    before = buffer[dashes - 5]
+    candidates = dashes[(((before >= ord("0")) & (before <= ord("9"))) | (before == ord(".")))
+                        & (buffer[dashes + 3] == ord("-"))] - 4
+    splits = [int(pos) for pos in candidates if TIMESTAMP_RE.match(data, pos)]
+    if not splits:
+        return data, 0
+    bounds = [0] + splits + [len(data)]
+    return b"\n".join(data[a:b] for a, b in zip(bounds, bounds[1:])), len(splits)
+
+
+def read_fields(data):
+    """Rows of ``data`` as a frame of ``MAX_FIELDS`` columns: the first as text, the rest as floats"""
+    options = dict(header=None, names=range(MAX_FIELDS), on_bad_lines="skip", engine="c")
+    try:
+        # Header words read as NaN (the first field keeps its text, so header
+        # lines can be recognised); any other stray text falls back to the slow path
+        return pd.read_csv(io.BytesIO(data), dtype={0: str, **{i: np.float64 for i in range(1, MAX_FIELDS)}},
+                           na_values={i: HEADER_WORDS for i in range(1, MAX_FIELDS)}, **options)
+    except ValueError:
+        frame = pd.read_csv(io.BytesIO(data), dtype=str, **options)
+        for i in range(1, MAX_FIELDS):
+            frame[i] = pd.to_numeric(frame[i], errors="coerce")
+        return frame
+
+
+def parse_chunk(path, start, stop):
+    """Repair and parse one byte range of a legacy log.
+
+    Each row is matched to a writer in ``LEGACY_SCHEMAS`` by whether it
+    starts with a timestamp and how many fields it has. Returns a dict with
+    ``timed`` (epoch-ms timestamps and ``HISTORY_COLUMNS``; energy is NaN
+    for writers that did not log it), ``untimed`` (``UNTIMED_COLUMNS``)
+    and counts of repaired rows, header lines and rejected rows.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(stop - start)
+    data, repaired = repair_rows(data)
+    lines = data.splitlines()
+    line_count = len(lines) - lines.count(b"")
+    del lines
+
+    frame = read_fields(data)
+    fields = frame.notna().sum(axis=1).to_numpy()
+    timed = frame[0].str.match(TIMESTAMP).fillna(False).to_numpy(dtype=bool)
+    headers = frame[0].str.match(HEADER, case=False).fillna(False).to_numpy(dtype=bool) & (fields == 1)
+    timed_rows = timed & np.isin(fields, [n for has_time, n in LEGACY_SCHEMAS if has_time])
+    untimed_rows = ~timed & np.isin(fields, [n for has_time, n in LEGACY_SCHEMAS if not has_time])
+
+    stamps = pd.to_datetime(frame[0][timed_rows], format="ISO8601", errors="coerce").to_numpy()
+    values = {name: frame[i + 1].to_numpy()[timed_rows] for i, name in enumerate(HISTORY_COLUMNS)}
+    valid = ~np.isnat(stamps)
+    for name in UNTIMED_COLUMNS:
+        valid &= ~np.isnan(values[name])
+    result = {
+        "timed": (from_local_datetime64(stamps[valid]), {name: column[valid] for name, column in values.items()})
+    }
+
+    values = {UNTIMED_COLUMNS[0]: pd.to_numeric(frame[0][untimed_rows], errors="coerce").to_numpy(dtype=np.float64)}
+    for i, name in enumerate(UNTIMED_COLUMNS[1:], start=1):
+        values[name] = frame[i].to_numpy()[untimed_rows]
+    valid_untimed = np.ones(int(untimed_rows.sum()), dtype=bool)
+    for column in values.values():
+        valid_untimed &= ~np.isnan(column)
+    result["untimed"] = {name: column[valid_untimed] for name, column in values.items()}
+
+    result["repaired"] = repaired
+    result["headers"] = int(headers.sum())
+    result["rejected"] = line_count - int(valid.sum()) - int(valid_untimed.sum()) - result["headers"]
+    return result
+
+
+def in_order(timestamps, last):
+    """Mask of rows not older than every row before them (and ``last``)"""
+    if last is None or not timestamps.size:
+        last = timestamps[0] if timestamps.size else 0
+    previous = np.maximum.accumulate(np.concatenate(([last], timestamps)))[:-1]
+    return timestamps >= previous
+
+
+def convert(path, output_dir=OUTPUT_DIR, workers=None, chunk_bytes=CHUNK_BYTES):
+    """Stream a legacy CSV log into ``TimeSeriesStore`` directories.
+
+    Byte ranges are parsed on a process pool and written in file order.
+    Timestamped rows go to ``output_dir``; rows that would move time
+    backwards (e.g. replayed sample data) are skipped and counted, since
+    the store is append-only. Rows written without a timestamp go to
+    ``output_dir/untimed`` keyed by row number. Returns the run statistics.
+    """
+    ranges = chunk_ranges(path, chunk_bytes)
+    stats = {"bytes": os.path.getsize(path), "rows": 0, "untimed": 0, "repaired": 0,
+             "headers": 0, "rejected": 0, "out_of_order": 0}
+    store = TimeSeriesStore(output_dir, columns=HISTORY_COLUMNS)
+    untimed_store = None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = pool.map(parse_chunk, [path] * len(ranges), *zip(*ranges)) if ranges else []
+            for chunk in chunks:
+                timestamps, columns = chunk["timed"]
+                keep = in_order(timestamps, store.last_timestamp())
+                store.append_many(timestamps[keep], {name: values[keep] for name, values in columns.items()})
+                stats["rows"] += int(keep.sum())
+                stats["out_of_order"] += int(keep.size - keep.sum())
+
+                untimed = chunk["untimed"]
+                count = len(untimed["voltage"])
+                if count:
+                    if untimed_store is None:
+                        untimed_store = TimeSeriesStore(os.path.join(output_dir, UNTIMED_DIR), columns=UNTIMED_COLUMNS)
+                    first = len(untimed_store)
+                    untimed_store.append_many(np.arange(first, first + count), untimed)
+                    stats["untimed"] += count
+                stats["repaired"] += chunk["repaired"]
+                stats["headers"] += chunk["headers"]
+                stats["rejected"] += chunk["rejected"]
+    finally:
+        store.close()
+        if untimed_store is not None:
+            untimed_store.close()
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def report(path, stats):
+    seconds = max(stats["seconds"], 1e-9)
+    print(f"{path}: {stats['bytes'] / 2**20:.1f} MiB in {stats['seconds']:.2f} s "
+          f"({stats['bytes'] / 2**20 / seconds:.1f} MB/s)")
+    print(f"  {stats['rows']:,} timestamped rows, {stats['untimed']:,} untimed rows, "
+          f"{stats['repaired']:,} glued rows split, {stats['headers']:,} header lines skipped, "
+          f"{stats['rejected']:,} rejected, "
+          f"{stats['out_of_order']:,} out of order")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repair legacy CSV logs and convert them to the columnar history store")
+    parser.add_argument("paths", nargs="+", help="load_data_log.csv / energy_data.csv files")
+    parser.add_argument("--output", default=OUTPUT_DIR, help=f"parent of the per-file stores (default: {OUTPUT_DIR})")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / 2**20, help="MiB of CSV per task")
+    args = parser.parse_args()
+    for path in args.paths:
+        # One store per input file: each log has its own time range
+        output_dir = os.path.join(args.output, os.path.splitext(os.path.basename(path))[0])
+        report(path, convert(path, output_dir, args.workers, int(args.chunk_mb * 2**20)))
@@ -4,27 +4,31 @@ import random
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from collections import deque
-from gtts import gTTS
-from pydub import AudioSegment
-from pydub.playback import play
-import os
-import winsound
-
-# Function to generate and play alert sounds and voice alerts
-def speak_alert(message):
+from blit_renderer import BlitManager
+import threading
+from alert_dispatcher import AlertDispatcher
+from tts_cache import CachedVoiceBackend, TTSClipCache
+
+# Voice alert clips are cached as decoded audio; template text is rendered at startup
+ALERT_TEMPLATES = [
+    "Voltage exceeded! Current voltage is {} volts.",
+    "Current exceeded! Current value is {} amperes.",
+    "Power exceeded! Current power is {} watts."
+]
+voice_cache = TTSClipCache()
+voice_alerts = AlertDispatcher(CachedVoiceBackend(voice_cache))  # speaks off the Tk thread
+
+def prerender_alerts():
     try:
-        # Play beep sound for alert
-        winsound.Beep(1000, 1000)  # Frequency 1000 Hz for 1 second
-
-        # Generate and play voice message
-        tts = gTTS(text=message, lang='en')
-        temp_file = "alert.mp3"
-        tts.save(temp_file)
-        alert_audio = AudioSegment.from_file(temp_file)
-        play(alert_audio)
-        os.remove(temp_file)
+        voice_cache.prerender(ALERT_TEMPLATES)
     except Exception as e:
-        print(f"Error with text-to-speech: {e}")
+        print(f"Error pre-rendering voice alerts: {e}")
+
+threading.Thread(target=prerender_alerts, daemon=True).start()
+
+# Queue a beep and voice alert; repeats of the same kind are merged while it waits
+def speak_alert(message, kind):
+    voice_alerts.notify(message, key=kind, sound=True, voice=True)
 
 # Function to fetch simulated data
 def fetch_data():
@@ -54,15 +58,15 @@ def check_alerts(data):
     if data["voltage"] > voltage_threshold:
         alert_message = f"Voltage exceeded! Current: {data['voltage']} V"
         messagebox.showwarning("Alert", alert_message)
-        speak_alert(f"Voltage exceeded! Current voltage is {data['voltage']} volts.")
+        speak_alert(f"Voltage exceeded! Current voltage is {data['voltage']} volts.", "voltage")
     if data["current"] > current_threshold:
         alert_message = f"Current exceeded! Current: {data['current']} A"
         messagebox.showwarning("Alert", alert_message)
-        speak_alert(f"Current exceeded! Current value is {data['current']} amperes.")
+        speak_alert(f"Current exceeded! Current value is {data['current']} amperes.", "current")
     if data["power"] > power_threshold:
         alert_message = f"Power exceeded! Current: {data['power']} W"
         messagebox.showwarning("Alert", alert_message)
-        speak_alert(f"Power exceeded! Current power is {data['power']} watts.")
+        speak_alert(f"Power exceeded! Current power is {data['power']} watts.", "power")
 
 # Update the graphs
 def update_graphs(data):
@@ -74,14 +78,8 @@ def update_graphs(data):
     current_line.set_ydata(current_data)
     power_line.set_ydata(power_data)
 
-    voltage_ax.relim()
-    voltage_ax.autoscale_view()
-    current_ax.relim()
-    current_ax.autoscale_view()
-    power_ax.relim()
-    power_ax.autoscale_view()
-
-    canvas.draw()
+    # Only the lines are redrawn; axes rescale when data leaves their range
+    blitter.update()
 
 # Start fetching data
 def start_monitoring():
@@ -150,6 +148,7 @@ power_ax.legend()
 
 canvas = FigureCanvasTkAgg(fig, master=root)
 canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+blitter = BlitManager(canvas, [voltage_line, current_line, power_line])
 
 # Start and Stop buttons
 control_frame = tk.Frame(root)
@@ -4,6 +4,7 @@ import random
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from collections import deque
+from blit_renderer import BlitManager
 import pyttsx3  # Offline text-to-speech library
 import winsound
 
@@ -71,14 +72,8 @@ def update_graphs(data):
     current_line.set_ydata(current_data)
     power_line.set_ydata(power_data)
 
-    voltage_ax.relim()
-    voltage_ax.autoscale_view()
-    current_ax.relim()
-    current_ax.autoscale_view()
-    power_ax.relim()
-    power_ax.autoscale_view()
-
-    canvas.draw()
+    # Only the lines are redrawn; axes rescale when data leaves their range
+    blitter.update()
 
 # Start fetching data
 def start_monitoring():
@@ -147,6 +142,7 @@ power_ax.legend()
 
 canvas = FigureCanvasTkAgg(fig, master=root)
 canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+blitter = BlitManager(canvas, [voltage_line, current_line, power_line])
 
 # Start and Stop buttons
 control_frame = tk.Frame(root)
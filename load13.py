@@ -4,25 +4,11 @@ import random
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from collections import deque
-import pyttsx3  # Offline text-to-speech library
-import winsound
-import threading
-
-# Initialize the text-to-speech engine
-tts_engine = pyttsx3.init()
-tts_engine.setProperty("rate", 150)  # Set speaking speed
-
-# Function to generate and play alert sounds and voice alerts
-def speak_alert(message):
-    try:
-        # Play beep sound for alert
-        winsound.Beep(1000, 1000)  # Frequency 1000 Hz for 1 second
-
-        # Use pyttsx3 to speak the alert message
-        tts_engine.say(message)
-        tts_engine.runAndWait()
-    except Exception as e:
-        print(f"Error with text-to-speech: {e}")
+from blit_renderer import BlitManager
+from alert_dispatcher import AlertDispatcher
+
+# Beep and voice alerts play on one worker thread; repeats are merged, not stacked
+alert_dispatcher = AlertDispatcher()
 
 # Function to fetch simulated data
 def fetch_data():
@@ -51,17 +37,17 @@ def check_alerts(data):
 
     if data["voltage"] > voltage_threshold:
         alert_message = f"Voltage exceeded! Current: {data['voltage']} V"
-        threading.Thread(target=speak_alert, args=(alert_message,)).start()
+        alert_dispatcher.notify(alert_message, key="voltage", voice=True)
         messagebox.showwarning("Alert", alert_message)
         decrease_threshold("voltage")
     if data["current"] > current_threshold:
         alert_message = f"Current exceeded! Current: {data['current']} A"
-        threading.Thread(target=speak_alert, args=(alert_message,)).start()
+        alert_dispatcher.notify(alert_message, key="current", voice=True)
         messagebox.showwarning("Alert", alert_message)
         decrease_threshold("current")
     if data["power"] > power_threshold:
         alert_message = f"Power exceeded! Current: {data['power']} W"
-        threading.Thread(target=speak_alert, args=(alert_message,)).start()
+        alert_dispatcher.notify(alert_message, key="power", voice=True)
         messagebox.showwarning("Alert", alert_message)
         decrease_threshold("power")
 
@@ -90,14 +76,8 @@ def update_graphs(data):
     current_line.set_ydata(current_data)
     power_line.set_ydata(power_data)
 
-    voltage_ax.relim()
-    voltage_ax.autoscale_view()
-    current_ax.relim()
-    current_ax.autoscale_view()
-    power_ax.relim()
-    power_ax.autoscale_view()
-
-    canvas.draw()
+    # Only the lines are redrawn; axes rescale when data leaves their range
+    blitter.update()
 
 # Start fetching data
 def start_monitoring():
@@ -166,6 +146,7 @@ power_ax.legend()
 
 canvas = FigureCanvasTkAgg(fig, master=root)
 canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+blitter = BlitManager(canvas, [voltage_line, current_line, power_line])
 
 # Start and Stop buttons
 control_frame = tk.Frame(root)
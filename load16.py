@@ -5,6 +5,10 @@ import csv
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 import os
+from sample_history import SampleHistory
+from downsample import axes_pixel_width, downsample
+
+HISTORY_COLUMNS = ["voltage", "current", "power"]
 
 class LoadMonitoringSystem:
     def __init__(self, root):
@@ -20,7 +24,7 @@ class LoadMonitoringSystem:
         self.running = False
 
         # Data storage
-        self.data_log = []  # To store data for plotting
+        self.data_log = SampleHistory(HISTORY_COLUMNS)  # plotted/exported history
 
         # GUI Elements
         self.setup_gui()
@@ -138,18 +142,17 @@ class LoadMonitoringSystem:
             writer.writerow([data['voltage'], data['current'], data['power']])
 
     def update_plots(self, data):
-        times = list(range(len(self.data_log)))
-        voltages = [entry['voltage'] for entry in self.data_log]
-        currents = [entry['current'] for entry in self.data_log]
-        powers = [entry['power'] for entry in self.data_log]
-
-        self.voltage_plot.set_data(times, voltages)
-        self.current_plot.set_data(times, currents)
-        self.power_plot.set_data(times, powers)
-
-        for ax, values in zip(self.axs, [voltages, currents, powers]):
-            ax.set_xlim(0, len(times))
-            ax.set_ylim(0, max(values) * 1.2 if values else 1)
+        # Column views and running maxima: nothing here rescans the history.
+        # Long logs are LTTB-decimated to the axes width; threshold breaches always stay
+        n = len(self.data_log)
+        times = self.data_log.positions()
+        thresholds = [self.voltage_threshold, self.current_threshold, self.power_threshold]
+        for line, ax, name, threshold in zip([self.voltage_plot, self.current_plot, self.power_plot], self.axs,
+                                             HISTORY_COLUMNS, thresholds):
+            values = self.data_log.column(name)
+            line.set_data(*downsample(times, values, axes_pixel_width(ax), keep=values > threshold))
+            ax.set_xlim(0, n)
+            ax.set_ylim(0, self.data_log.max(name) * 1.2 if n else 1)
 
         self.canvas.draw()
 
@@ -159,8 +162,7 @@ class LoadMonitoringSystem:
             with open(file_path, "w", newline="") as file:
                 writer = csv.writer(file)
                 writer.writerow(["Voltage (V)", "Current (A)", "Power (W)"])
-                for entry in self.data_log:
-                    writer.writerow([entry['voltage'], entry['current'], entry['power']])
+                writer.writerows(zip(*(self.data_log.column(name).tolist() for name in HISTORY_COLUMNS)))
             messagebox.showinfo("Export Successful", f"Data exported to {os.path.basename(file_path)}")
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import csv
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
+from sample_history import SampleHistory
+from downsample import axes_pixel_width, downsample
+
+HISTORY_COLUMNS = ["voltage", "current", "power"]
 
 class LoadMonitoringSystem:
     def __init__(self, root):
@@ -18,7 +23,7 @@ class LoadMonitoringSystem:
         self.running = False
 
         # Data storage
-        self.data_log = []  # To store data for plotting
+        self.data_log = SampleHistory(HISTORY_COLUMNS, timestamps=True)  # plotted/exported history
 
         # GUI Elements
         self.setup_gui()
@@ -134,24 +139,23 @@ class LoadMonitoringSystem:
             messagebox.showwarning("Alerts", "\n".join(alerts))
 
     def log_data(self, data):
-        self.data_log.append(data)
+        self.data_log.append(data, data['timestamp'])
         with open("energy_data.csv", "a", newline="") as file:
             writer = csv.writer(file)
             writer.writerow([data['timestamp'], data['voltage'], data['current'], data['power']])
 
     def update_plots(self, data):
-        times = list(range(len(self.data_log)))
-        voltages = [entry['voltage'] for entry in self.data_log]
-        currents = [entry['current'] for entry in self.data_log]
-        powers = [entry['power'] for entry in self.data_log]
-
-        self.voltage_plot.set_data(times, voltages)
-        self.current_plot.set_data(times, currents)
-        self.power_plot.set_data(times, powers)
-
-        for ax, values in zip(self.axs, [voltages, currents, powers]):
-            ax.set_xlim(0, len(times))
-            ax.set_ylim(0, max(values) * 1.2 if values else 1)
+        # Column views and running maxima: nothing here rescans the history.
+        # Long logs are LTTB-decimated to the axes width; threshold breaches always stay
+        n = len(self.data_log)
+        times = self.data_log.positions()
+        thresholds = [self.voltage_threshold, self.current_threshold, self.power_threshold]
+        for line, ax, name, threshold in zip([self.voltage_plot, self.current_plot, self.power_plot], self.axs,
+                                             HISTORY_COLUMNS, thresholds):
+            values = self.data_log.column(name)
+            line.set_data(*downsample(times, values, axes_pixel_width(ax), keep=values > threshold))
+            ax.set_xlim(0, n)
+            ax.set_ylim(0, self.data_log.max(name) * 1.2 if n else 1)
 
         self.canvas.draw()
 
@@ -161,8 +165,9 @@ class LoadMonitoringSystem:
             with open(file_path, "w", newline="") as file:
                 writer = csv.writer(file)
                 writer.writerow(["Timestamp", "Voltage (V)", "Current (A)", "Power (W)"])
-                for entry in self.data_log:
-                    writer.writerow([entry['timestamp'], entry['voltage'], entry['current'], entry['power']])
+                timestamps = np.char.replace(np.datetime_as_string(self.data_log.times(), unit="m"), "T", " ")
+                writer.writerows(zip(timestamps.tolist(), *(self.data_log.column(name).tolist()
+                                                             for name in HISTORY_COLUMNS)))
             messagebox.showinfo("Export Successful", f"Data exported to {file_path}")
 
 if __name__ == "__main__":
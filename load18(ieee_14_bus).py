@@ -1,15 +1,32 @@
+from lazy_imports import startup_profiler
+startup_profiler.start_if_requested()  # --profile-startup
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import csv
+import time
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import joblib
+from matplotlib.figure import Figure
+from downsample import axes_pixel_width, downsample
+from alert_rules import AlertRuleEngine, QUANTITIES, TOTAL_CHANNEL
+from alert_log import alert_message
+from anomaly_detector import StreamingAnomalyDetector, worst_feature
+from model_loader import CachedPredictor, ModelLoader
+
+# Forecasting input: the last FORECAST_WINDOW samples of (voltage, current, power)
+FORECAST_WINDOW = 5
+FORECAST_FEATURES = 3
+
+# Alert rules for the single IEEE feed; every breach is reported on every sample
+ALERT_RULES = [
+    {"name": "voltage_exceeded", "quantity": "voltage", "op": ">", "limit": "voltage_threshold",
+     "cooldown": 0, "message": "Voltage exceeds threshold!"},
+    {"name": "current_exceeded", "quantity": "current", "op": ">", "limit": "current_threshold",
+     "cooldown": 0, "message": "Current exceeds threshold!"},
+    {"name": "power_exceeded", "quantity": "power", "op": ">", "limit": "power_threshold",
+     "cooldown": 0, "message": "Power exceeds threshold!"}
+]
 
 class LoadMonitoringSystem:
     def __init__(self, root):
@@ -20,6 +37,11 @@ class LoadMonitoringSystem:
         self.voltage_threshold = 230
         self.current_threshold = 4.5
         self.power_threshold = 1000
+        self.alert_engine = AlertRuleEngine(ALERT_RULES, [TOTAL_CHANNEL], params={
+            "voltage_threshold": self.voltage_threshold,
+            "current_threshold": self.current_threshold,
+            "power_threshold": self.power_threshold
+        })
 
         # Running state
         self.running = False
@@ -27,10 +49,12 @@ class LoadMonitoringSystem:
         # Data storage
         self.data_log = []  # To store data for plotting
 
-        # ML models
-        self.anomaly_model = None
-        self.forecasting_model = None
-        self.scaler = None
+        # Online anomaly detection, updated as each sample arrives
+        self.anomaly_detector = StreamingAnomalyDetector(["voltage", "current", "power"])
+        self.anomaly_indices = []
+
+        # ML models, loaded in the background once the window is up
+        self.models = ModelLoader({"forecaster": load_forecaster, "scaler": load_scaler})
 
         # GUI Elements
         self.setup_gui()
@@ -39,8 +63,9 @@ class LoadMonitoringSystem:
         # Load IEEE dataset
         self.load_ieee_data()
 
-        # Load pre-trained models
-        self.load_models()
+        # Load pre-trained models without blocking the GUI
+        self.models.start()
+        self.root.after(200, self.check_models_ready)
 
     def setup_gui(self):
         frame = ttk.Frame(self.root)
@@ -65,7 +90,7 @@ class LoadMonitoringSystem:
         self.anomaly_button = ttk.Button(frame, text="Run Anomaly Detection", command=self.run_anomaly_detection)
         self.anomaly_button.grid(row=4, column=0, pady=10, sticky="w")
 
-        self.prediction_button = ttk.Button(frame, text="Predict Energy Usage", command=self.run_forecasting)
+        self.prediction_button = ttk.Button(frame, text="Loading Models...", command=self.run_forecasting, state="disabled")
         self.prediction_button.grid(row=4, column=1, pady=10, sticky="w")
 
         # Data display
@@ -81,8 +106,12 @@ class LoadMonitoringSystem:
         self.power_label = ttk.Label(self.data_frame, text="Power (W): --")
         self.power_label.grid(row=0, column=2, padx=5, pady=5)
 
+        self.anomaly_label = ttk.Label(self.data_frame, text="Anomaly: --")
+        self.anomaly_label.grid(row=0, column=3, padx=5, pady=5)
+
     def setup_plot(self):
-        self.figure, self.axs = plt.subplots(3, 1, figsize=(5, 8))
+        self.figure = Figure(figsize=(5, 8))
+        self.axs = self.figure.subplots(3, 1)
         self.figure.tight_layout(pad=3.0)
 
         self.voltage_plot, = self.axs[0].plot([], [], label="Voltage (V)", color="blue")
@@ -118,20 +147,15 @@ class LoadMonitoringSystem:
             {"timestamp": "2023-01-01 06:00", "voltage": 260, "current": 6.0, "power": 1560},
         ]
 
-    def load_models(self):
-        """Load pre-trained models for anomaly detection and forecasting."""
-        try:
-            self.anomaly_model = joblib.load("isolation_forest_model.pkl")
-        except Exception:
-            self.anomaly_model = None
-        try:
-            self.forecasting_model = joblib.load("lstm_model.h5")
-        except Exception:
-            self.forecasting_model = None
-        try:
-            self.scaler = joblib.load("scaler.pkl")
-        except Exception:
-            self.scaler = None
+    def check_models_ready(self):
+        """Enable forecasting once the background model loader has finished."""
+        if not self.models.ready.is_set():
+            self.root.after(200, self.check_models_ready)
+            return
+        if self.models.get("forecaster") is None or self.models.get("scaler") is None:
+            self.prediction_button.config(text="Forecasting Unavailable")
+            return
+        self.prediction_button.config(text="Predict Energy Usage", state="normal")
 
     def start_monitoring(self):
         self.running = True
@@ -150,6 +174,7 @@ class LoadMonitoringSystem:
             self.update_labels(data)
             self.check_alerts(data)
             self.log_data(data)
+            self.detect_anomaly(data)
             self.update_plots(data)
             self.root.after(1000, self.simulate_ieee_data)
 
@@ -159,13 +184,11 @@ class LoadMonitoringSystem:
         self.power_label.config(text=f"Power (W): {data['power']}")
 
     def check_alerts(self, data):
-        alerts = []
-        if data['voltage'] > self.voltage_threshold:
-            alerts.append("Voltage exceeds threshold!")
-        if data['current'] > self.current_threshold:
-            alerts.append("Current exceeds threshold!")
-        if data['power'] > self.power_threshold:
-            alerts.append("Power exceeds threshold!")
+        values = np.full((1, len(QUANTITIES)), np.nan)
+        for quantity in ("voltage", "current", "power"):
+            values[0, QUANTITIES.index(quantity)] = data[quantity]
+        events = self.alert_engine.evaluate(values, time.time())
+        alerts = [alert_message(event.kind, event.value, event.limit) for event in events]
 
         if alerts:
             messagebox.showwarning("Alerts", "\n".join(alerts))
@@ -177,18 +200,23 @@ class LoadMonitoringSystem:
             writer.writerow([data['timestamp'], data['voltage'], data['current'], data['power']])
 
     def update_plots(self, data):
-        times = list(range(len(self.data_log)))
-        voltages = [entry['voltage'] for entry in self.data_log]
-        currents = [entry['current'] for entry in self.data_log]
-        powers = [entry['power'] for entry in self.data_log]
-
-        self.voltage_plot.set_data(times, voltages)
-        self.current_plot.set_data(times, currents)
-        self.power_plot.set_data(times, powers)
+        times = np.arange(len(self.data_log))
+        voltages = np.array([entry['voltage'] for entry in self.data_log], dtype=float)
+        currents = np.array([entry['current'] for entry in self.data_log], dtype=float)
+        powers = np.array([entry['power'] for entry in self.data_log], dtype=float)
+
+        # Long logs are LTTB-decimated to the axes width; threshold breaches always stay
+        series = [
+            (self.voltage_plot, voltages, self.voltage_threshold),
+            (self.current_plot, currents, self.current_threshold),
+            (self.power_plot, powers, self.power_threshold)
+        ]
+        for line, values, threshold in series:
+            line.set_data(*downsample(times, values, axes_pixel_width(line.axes), keep=values > threshold))
 
         for ax, values in zip(self.axs, [voltages, currents, powers]):
             ax.set_xlim(0, len(times))
-            ax.set_ylim(0, max(values) * 1.2 if values else 1)
+            ax.set_ylim(0, values.max() * 1.2 if values.size else 1)
 
         self.canvas.draw()
 
@@ -202,41 +230,56 @@ class LoadMonitoringSystem:
                     writer.writerow([entry['timestamp'], entry['voltage'], entry['current'], entry['power']])
             messagebox.showinfo("Export Successful", f"Data exported to {file_path}")
 
+    def detect_anomaly(self, data):
+        """Score the newest sample against the running baseline (O(1) per sample)"""
+        flagged, scores = self.anomaly_detector.update(data)
+        if flagged:
+            feature = worst_feature(scores)
+            self.anomaly_indices.append(len(self.data_log) - 1)
+            self.anomaly_label.config(text=f"Anomaly: {feature} (z={scores[feature]:.1f}) at {data['timestamp']}")
+        else:
+            self.anomaly_label.config(text="Anomaly: none")
+
     def run_anomaly_detection(self):
-        """Run anomaly detection on the dataset. Trains a model if not loaded."""
+        """Report the anomalies flagged so far by the streaming detector."""
         if not self.data_log:
             messagebox.showinfo("No Data", "No data available for anomaly detection.")
             return
-        data_array = np.array([[entry['voltage'], entry['current'], entry['power']] for entry in self.data_log])
-        # If model is not loaded, train a new one on the fly
-        if self.anomaly_model is None:
-            messagebox.showinfo("Training Model", "No pre-trained anomaly model found. Training a new model on current data.")
-            self.anomaly_model = IsolationForest(contamination=0.15, random_state=42)
-            self.anomaly_model.fit(data_array)
-        try:
-            predictions = self.anomaly_model.predict(data_array)
-            anomalies = [i for i, pred in enumerate(predictions) if pred == -1]
-            if anomalies:
-                messagebox.showwarning("Anomalies Detected", f"Anomalies detected at indices: {anomalies}")
-            else:
-                messagebox.showinfo("No Anomalies", "No anomalies detected.")
-        except Exception as e:
-            messagebox.showerror("Anomaly Detection Error", f"An error occurred during anomaly detection: {e}")
+        if self.anomaly_indices:
+            messagebox.showwarning("Anomalies Detected", f"Anomalies detected at indices: {self.anomaly_indices}")
+        else:
+            messagebox.showinfo("No Anomalies", "No anomalies detected.")
 
     def run_forecasting(self):
         """Run energy usage forecasting."""
-        if self.forecasting_model and self.data_log:
-            data_array = np.array([[entry['voltage'], entry['current'], entry['power']] for entry in self.data_log])
-            data_scaled = self.scaler.transform(data_array)
-
-            # Use last 5 entries for prediction
-            input_data = np.expand_dims(data_scaled[-5:], axis=0)
-            prediction = self.forecasting_model.predict(input_data)
-            predicted_power = self.scaler.inverse_transform(prediction)[0, 2]
+        forecaster = self.models.get("forecaster")
+        scaler = self.models.get("scaler")
+        if forecaster and scaler and self.data_log:
+            # Only the window the model reads is converted and scaled
+            data_array = np.array([[entry['voltage'], entry['current'], entry['power']]
+                                   for entry in self.data_log[-FORECAST_WINDOW:]])
+            data_scaled = scaler.transform(data_array)
+
+            input_data = np.expand_dims(data_scaled, axis=0)
+            prediction = forecaster.predict(input_data)
+            predicted_power = scaler.inverse_transform(prediction)[0, 2]
 
             messagebox.showinfo("Forecast", f"Predicted next power usage: {predicted_power:.2f} W")
 
+
+def load_forecaster():
+    """LSTM forecaster with a warmed-up predict path (runs on the loader thread)"""
+    import joblib
+    return CachedPredictor(joblib.load("lstm_model.h5"), (1, FORECAST_WINDOW, FORECAST_FEATURES))
+
+
+def load_scaler():
+    import joblib
+    return joblib.load("scaler.pkl")
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = LoadMonitoringSystem(root)
+    root.after_idle(startup_profiler.mark_ready, "window shown")
     root.mainloop()
\ No newline at end of file
@@ -1,9 +1,21 @@
+from lazy_imports import startup_profiler, lazy_import
+startup_profiler.start_if_requested()  # --profile-startup or PROFILE_STARTUP=1 under uvicorn
+
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List
-import PyPDF2
-from transformers import pipeline
+from functools import lru_cache
 import os
+import queue
+import threading
+from retrieval import BM25Index, TOP_K, qa_batch, rank_answers, top_chunks
+from inference_worker import InferenceWorker
+from document_cache import AnswerCache, DocumentCache, digest_file
+
+# Deferred: only needed once slides are uploaded or a question is asked
+PyPDF2 = lazy_import("PyPDF2")
+transformers = lazy_import("transformers")
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -18,48 +30,111 @@ class QuestionResponse(BaseModel):
     answer: str
 
 # Initialize global variables
-qa_model = pipeline("question-answering")  # QA model for question answering
-text_data = ""  # Placeholder for extracted text
+# (chunked BM25 index, page text spool, PDF SHA-256); always replaced as a
+# whole, so a handler can take one consistent snapshot
+slides = (None, None, None)
+document_cache = DocumentCache()  # extracted pages and indexes, keyed by PDF hash
+answer_cache = AnswerCache()
+extraction_lock = threading.Lock()  # one deck extracted at a time; a repeat then finds it cached
+
+# QA model for question answering, built on first use
+@lru_cache(maxsize=None)
+def get_qa_model():
+    return transformers.pipeline("question-answering")
+
+# The model runs on one inference thread that micro-batches concurrent questions
+@lru_cache(maxsize=None)
+def get_qa_worker():
+    return InferenceWorker(lambda requests: qa_batch(get_qa_model(), requests))
 
 # Utility: Extract text from PDF
-def extract_text_from_pdf(pdf_path):
-    global text_data
+def extract_text_from_pdf(pdf_path, digest=None):
+    digest = digest or digest_file(pdf_path)
+    with extraction_lock:
+        if not use_cached_slides(digest):
+            extract_pages(pdf_path, digest)
+
+def extract_pages(pdf_path, digest):
+    # Page text goes to the cache's spool file as it is extracted, not to memory
+    pages = document_cache.spool(digest)
+    index = BM25Index()
     try:
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            text_data = "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
+            for page_number, page in enumerate(reader.pages, start=1):
+                text = page.extract_text() or ""
+                pages.append(page_number, text)
+                if text:
+                    index.add(text, page=page_number)
     except Exception as e:
         raise ValueError(f"Error reading PDF: {e}")
+    document_cache.publish(digest, index, pages)
+    set_slides(index, pages, digest)
+
+def use_cached_slides(digest):
+    """Load a previously extracted deck by its hash; False if it is not cached"""
+    if digest == slides[2]:
+        return True
+    cached = document_cache.load(digest)
+    if cached is None:
+        return False
+    pages, index = cached
+    set_slides(index, pages, digest)
+    return True
+
+def set_slides(index, pages, digest):
+    global slides
+    slides = (index, pages, digest)
 
 # Endpoint to load slides
 @app.post("/load-slides/")
-def load_slides(pdf_path: str):
+async def load_slides(pdf_path: str):
     if not os.path.exists(pdf_path):
         raise HTTPException(status_code=400, detail="PDF file not found.")
     try:
-        extract_text_from_pdf(pdf_path)
+        await run_in_threadpool(extract_text_from_pdf, pdf_path)
         return {"message": "Slides loaded successfully."}
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Endpoint to ask questions
 @app.post("/ask-question/", response_model=QuestionResponse)
-def ask_question(request: QuestionRequest):
-    global text_data
-    if not text_data:
+async def ask_question(request: QuestionRequest):
+    # One snapshot of the deck for the whole request: slides loaded while the
+    # model runs must not change the index or the cache key used
+    index, pages, digest = slides
+    if not index:
         raise HTTPException(status_code=400, detail="No slides loaded. Please load the slides first.")
 
     question = request.question
 
-    # Use QA model to find an answer
+    cached = answer_cache.get(digest, question)
+    if cached is not None:
+        answer, options = cached
+        return QuestionResponse(question=question, options=options, answer=answer)
+
+    # Run the QA model only on the best-matching chunks, batched with other requests
     try:
-        answer = qa_model({"question": question, "context": text_data})["answer"]
-        # Generate options (dummy options for now)
-        options = [answer, "Option B", "Option C", "Option D"]
+        chunk_ids = top_chunks(index, question, TOP_K)
+        results = await get_qa_worker().submit((question, index.contexts(chunk_ids, pages.read)))
+        candidates = rank_answers(index, chunk_ids, results)
+        if not candidates:
+            raise ValueError("no answer found in the slides")
+        answer = candidates[0]["answer"]
+        # Other chunks' answers make the distractors, padded with placeholders
+        options = list(dict.fromkeys(candidate["answer"] for candidate in candidates))[:4]
+        options += ["Option B", "Option C", "Option D"][len(options) - 1:]
+        answer_cache.put(digest, question, (answer, options))
         return QuestionResponse(question=question, options=options, answer=answer)
+    except queue.Full:
+        # The inference queue is at capacity: shed the request instead of queueing it
+        raise HTTPException(status_code=503, detail="Too many questions waiting. Please try again shortly.",
+                            headers={"Retry-After": str(get_qa_worker().retry_after())})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating answer: {e}")
 
+startup_profiler.mark_ready("app created")
+
 # Example usage
 # 1. Start the server: `uvicorn filename:app --reload`
 # 2. Load slides: POST to `/load-slides/` with `pdf_path`
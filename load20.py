@@ -1,9 +1,23 @@
+from lazy_imports import startup_profiler, lazy_import
+startup_profiler.start_if_requested()  # --profile-startup or PROFILE_STARTUP=1 under uvicorn
+
 from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List
-import PyPDF2
-from transformers import pipeline
+from functools import lru_cache
 import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from retrieval import TOP_K, qa_batch, rank_answers, top_chunks
+from inference_worker import InferenceWorker
+from document_cache import AnswerCache, DocumentCache
+from slide_ingest import EXTRACT_WORKERS, SlideExtraction, stream_to_file
+
+# Deferred: only needed once a question is asked
+transformers = lazy_import("transformers")
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -18,51 +32,140 @@ class QuestionResponse(BaseModel):
     answer: str
 
 # Initialize global variables
-qa_model = pipeline("question-answering")  # QA model for question answering
-text_data = ""  # Placeholder for extracted text
+# (chunked BM25 index, page text spool, PDF SHA-256, page extraction while it
+# runs); always replaced as a whole, so a handler can take one consistent snapshot
+slides = (None, None, None, None)
+document_cache = DocumentCache()  # extracted pages and indexes, keyed by PDF hash
+answer_cache = AnswerCache()
+extraction_pool = ThreadPoolExecutor(EXTRACT_WORKERS, thread_name_prefix="pdf-extract")
+extractions = {}  # PDF SHA-256 -> extraction still running; at most one per deck
+extraction_lock = threading.Lock()
 
-# Utility: Extract text from PDF
-def extract_text_from_pdf(file_path):
-    global text_data
-    try:
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text_data = "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
-    except Exception as e:
-        raise ValueError(f"Error reading PDF: {e}")
+# QA model for question answering, built on first use
+@lru_cache(maxsize=None)
+def get_qa_model():
+    return transformers.pipeline("question-answering")
+
+# The model runs on one inference thread that micro-batches concurrent questions
+@lru_cache(maxsize=None)
+def get_qa_worker():
+    return InferenceWorker(lambda requests: qa_batch(get_qa_model(), requests))
+
+def use_cached_slides(digest):
+    """Load a previously extracted deck by its hash; False if it is not cached.
+
+    The deck on show only counts once it was extracted without failed
+    pages, so re-uploading a deck with unreadable pages retries them.
+    """
+    snapshot = slides
+    if digest == snapshot[2] and slides_complete(snapshot) and not (snapshot[3] and snapshot[3].failed):
+        return True
+    cached = document_cache.load(digest)
+    if cached is None:
+        return False
+    pages, index = cached
+    set_slides(index, pages, digest)
+    return True
+
+def set_slides(index, pages, digest, new_extraction=None):
+    global slides
+    slides = (index, pages, digest, new_extraction)
+
+def slides_complete(snapshot):
+    extraction = snapshot[3]
+    return extraction is None or extraction.finished.is_set()
+
+# Utility: Show the deck, starting page-by-page extraction only if needed; the
+# index grows as pages complete. Takes ownership of (and deletes) the temp file
+def load_or_extract(file_path, digest):
+    with extraction_lock:
+        for done in [key for key, running in extractions.items() if running.finished.is_set()]:
+            del extractions[done]
+        # The same deck uploaded again while it is extracting joins that extraction
+        running = extractions.get(digest)
+        if running is not None or use_cached_slides(digest):
+            os.remove(file_path)
+            if running is not None:
+                set_slides(running.index, running.pages, digest, running)
+            return running
+        new_extraction = SlideExtraction(file_path, digest, extraction_pool, document_cache)
+        extractions[digest] = new_extraction
+        set_slides(new_extraction.index, new_extraction.pages, digest, new_extraction)
+        return new_extraction
 
 # Endpoint to upload and load slides
 @app.post("/upload-slides/")
-def upload_slides(file: UploadFile = File(...)):
-    global text_data
+async def upload_slides(file: UploadFile = File(...)):
+    file_location = None
+    started = False  # once extraction runs, it owns (and deletes) the temp file
     try:
-        file_location = f"temp_{file.filename}"
-        with open(file_location, "wb") as f:
-            f.write(file.file.read())
-        extract_text_from_pdf(file_location)
-        os.remove(file_location)  # Clean up temporary file
-        return {"message": "Slides uploaded and loaded successfully."}
+        # Streamed to disk in blocks and hashed on the way; never held in memory
+        fd, file_location = tempfile.mkstemp(prefix="temp_", suffix=".pdf", dir=".")
+        os.close(fd)
+        digest = await run_in_threadpool(stream_to_file, file.file, file_location)
+        # A deck seen before (under any name) skips extraction
+        new_extraction = await run_in_threadpool(load_or_extract, file_location, digest)
+        started = True
+        if new_extraction is None:
+            return {"message": "Slides uploaded and loaded successfully."}
+        return {"message": "Slides uploaded; pages are being indexed.", **new_extraction.status()}
     except Exception as e:
+        if file_location and not started and os.path.exists(file_location):
+            os.remove(file_location)
         raise HTTPException(status_code=500, detail=f"Error processing file: {e}")
 
+# Endpoint to follow page extraction
+@app.get("/slides-status/")
+def slides_status():
+    index, _, _, extraction = slides
+    if extraction is None:
+        return {"finished": index is not None, "chunks": len(index) if index else 0}
+    return extraction.status()
+
 # Endpoint to ask questions
 @app.post("/ask-question/", response_model=QuestionResponse)
-def ask_question(request: QuestionRequest):
-    global text_data
-    if not text_data:
+async def ask_question(request: QuestionRequest):
+    # One snapshot of the deck for the whole request: a new upload finishing
+    # while the model runs must not change the index or the cache key used
+    snapshot = slides
+    index, pages, digest, _ = snapshot
+    complete = slides_complete(snapshot)
+    if not index:
+        if not complete:
+            raise HTTPException(status_code=400, detail="Slides are still being processed. Please try again shortly.")
         raise HTTPException(status_code=400, detail="No slides loaded. Please upload the slides first.")
 
     question = request.question
 
-    # Use QA model to find an answer
+    # Answers over a partly indexed deck are not cached: more pages may change them
+    cached = answer_cache.get(digest, question) if complete else None
+    if cached is not None:
+        answer, options = cached
+        return QuestionResponse(question=question, options=options, answer=answer)
+
+    # Run the QA model only on the best-matching chunks, batched with other requests
     try:
-        answer = qa_model({"question": question, "context": text_data})["answer"]
-        # Generate options (dummy options for now)
-        options = [answer, "Option B", "Option C", "Option D"]
+        chunk_ids = top_chunks(index, question, TOP_K)
+        results = await get_qa_worker().submit((question, index.contexts(chunk_ids, pages.read)))
+        candidates = rank_answers(index, chunk_ids, results)
+        if not candidates:
+            raise ValueError("no answer found in the slides")
+        answer = candidates[0]["answer"]
+        # Other chunks' answers make the distractors, padded with placeholders
+        options = list(dict.fromkeys(candidate["answer"] for candidate in candidates))[:4]
+        options += ["Option B", "Option C", "Option D"][len(options) - 1:]
+        if complete:
+            answer_cache.put(digest, question, (answer, options))
         return QuestionResponse(question=question, options=options, answer=answer)
+    except queue.Full:
+        # The inference queue is at capacity: shed the request instead of queueing it
+        raise HTTPException(status_code=503, detail="Too many questions waiting. Please try again shortly.",
+                            headers={"Retry-After": str(get_qa_worker().retry_after())})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating answer: {e}")
 
+startup_profiler.mark_ready("app created")
+
 # Example usage
 # 1. Start the server: `uvicorn filename:app --reload`
 # 2. Upload slides: POST to `/upload-slides/` with a file
@@ -4,19 +4,30 @@ import random
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from collections import deque
-from gtts import gTTS
-from pydub import AudioSegment
-from pydub.playback import play
-import os
-
-# Function to generate and play audio alerts
-def speak_alert(message):
-    tts = gTTS(text=message, lang='en')
-    temp_file = "alert.mp3"
-    tts.save(temp_file)
-    alert_audio = AudioSegment.from_file(temp_file)
-    play(alert_audio)
-    os.remove(temp_file)
+import threading
+from alert_dispatcher import AlertDispatcher
+from tts_cache import CachedVoiceBackend, TTSClipCache
+
+# Voice alert clips are cached as decoded audio; template text is rendered at startup
+ALERT_TEMPLATES = [
+    "Voltage is exceeded! Current Voltage is {} volts",
+    "Current is exceeded! Current value is {} amperes",
+    "Power is exceeded! Current power is {} watts"
+]
+voice_cache = TTSClipCache()
+voice_alerts = AlertDispatcher(CachedVoiceBackend(voice_cache))  # speaks off the Tk thread
+
+def prerender_alerts():
+    try:
+        voice_cache.prerender(ALERT_TEMPLATES)
+    except Exception as e:
+        print(f"Error pre-rendering voice alerts: {e}")
+
+threading.Thread(target=prerender_alerts, daemon=True).start()
+
+# Queue an audio alert; repeats of the same kind are merged while it waits
+def speak_alert(message, kind):
+    voice_alerts.notify(message, key=kind, sound=False, voice=True)
 
 # Function to fetch simulated data
 def fetch_data():
@@ -46,15 +57,15 @@ def check_alerts(data):
     if data["voltage"] > voltage_threshold:
         alert_message = f"Voltage exceeded! Current: {data['voltage']} V"
         messagebox.showwarning("Alert", alert_message)
-        speak_alert(f"Voltage is exceeded! Current Voltage is {data['voltage']} volts")
+        speak_alert(f"Voltage is exceeded! Current Voltage is {data['voltage']} volts", "voltage")
     if data["current"] > current_threshold:
         alert_message = f"Current exceeded! Current: {data['current']} A"
         messagebox.showwarning("Alert", alert_message)
-        speak_alert(f"Current is exceeded! Current value is {data['current']} amperes")
+        speak_alert(f"Current is exceeded! Current value is {data['current']} amperes", "current")
     if data["power"] > power_threshold:
         alert_message = f"Power exceeded! Current: {data['power']} W"
         messagebox.showwarning("Alert", alert_message)
-        speak_alert(f"Power is exceeded! Current power is {data['power']} watts")
+        speak_alert(f"Power is exceeded! Current power is {data['power']} watts", "power")
 
 # Update the graphs
 def update_graphs(data):
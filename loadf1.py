@@ -1,31 +1,40 @@
+from lazy_imports import startup_profiler
+startup_profiler.start_if_requested()  # --profile-startup
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import random
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from collections import deque
-import pyttsx3
-import winsound
-import csv
 import datetime
 import json
 import os
 from threading import Thread
 import time
 import threading
+from log_sink import BufferedLogSink
+from rollups import MultiResolutionRollup
+from timeseries_store import TimeSeriesStore, now_ms, to_local_datetime64
+from blit_renderer import BlitManager
+from downsample import axes_pixel_width, downsample
+from alert_dispatcher import AlertDispatcher
+from alert_rules import AlertRuleEngine, DEFAULT_ALERT_RULES, QUANTITIES, TOTAL_CHANNEL, alert_rule_set
+from alert_log import alert_message
+from energy_integrator import EnergyIntegrator
+from exporters import sample_timestamps, write_csv
 
 # Constants
 CONFIG_FILE = "load_config.json"
 DATA_LOG_FILE = "load_data_log.csv"
+HISTORY_DIR = "loadf1_history"  # logged samples, the source of exports
+ENERGY_CHECKPOINT = os.path.join(HISTORY_DIR, "energy.json")  # as the Streamlit service keeps it
+OLD_ENERGY_CHECKPOINT = "energy_checkpoint.json"  # read once if the new one does not exist yet
 MAX_DATA_POINTS = 200
 UPDATE_INTERVAL = 500  # ms
-
-# Initialize text-to-speech
-try:
-    tts_engine = pyttsx3.init()
-    tts_engine.setProperty("rate", 150)
-except:
-    tts_engine = None
+# The desktop monitor has always also warned on low current and power
+DESKTOP_ALERT_RULES = alert_rule_set(DEFAULT_ALERT_RULES, ["low_current", "low_power"])
 
 class LoadManagementSystem:
     def __init__(self, root):
@@ -49,14 +58,27 @@ class LoadManagementSystem:
         self.voltage_data = deque([0] * MAX_DATA_POINTS, maxlen=MAX_DATA_POINTS)
         self.current_data = deque([0] * MAX_DATA_POINTS, maxlen=MAX_DATA_POINTS)
         self.power_data = deque([0] * MAX_DATA_POINTS, maxlen=MAX_DATA_POINTS)
-        self.energy_consumption = 0.0  # kWh
+        self.sample_times = deque(sample_timestamps(MAX_DATA_POINTS, UPDATE_INTERVAL / 1000).tolist(), maxlen=MAX_DATA_POINTS)
+        self.sample_energy = deque([0.0] * MAX_DATA_POINTS, maxlen=MAX_DATA_POINTS)  # kWh at each sample
+        self.energy = EnergyIntegrator(self.load_profiles)  # trapezoidal, per load and tariff period
+        self.history = TimeSeriesStore(HISTORY_DIR)  # also holds the energy checkpoint
+        if not self.energy.load(ENERGY_CHECKPOINT):
+            self.energy.load(OLD_ENERGY_CHECKPOINT)
+        self.energy_consumption = self.energy.total  # kWh
         self.start_time = datetime.datetime.now()
+        self.log_sink = BufferedLogSink(DATA_LOG_FILE)
+        self.rollups = MultiResolutionRollup()  # 1s/1m/15m/1h aggregates
+        self.alert_dispatcher = AlertDispatcher()  # beeps/speech off the sampling thread
         
         # Thresholds
         self.voltage_threshold = 230.0
+        self.low_voltage_threshold = 180.0
         self.current_threshold = 150.0  # Increased default threshold
         self.power_threshold = 30000.0 # Increased default threshold
         self.energy_budget = 1000.0  # Increased default budget (kWh)
+        self.alert_cooldown = 0  # seconds; repeats are also merged by the dispatcher
+        self.extra_alert_rules = []  # added to DESKTOP_ALERT_RULES
+        self.alert_engine = None
         
         # Tariff rates (Rs./kWh)
         self.tariff_rates = {
@@ -211,7 +233,9 @@ class LoadManagementSystem:
     
     def create_graphs(self):
         """Create the monitoring graphs"""
-        self.fig, (self.voltage_ax, self.current_ax, self.power_ax) = plt.subplots(3, 1, figsize=(12, 8))
+        # Figure instead of pyplot: the Tk canvas needs no pyplot backend machinery
+        self.fig = Figure(figsize=(12, 8))
+        self.voltage_ax, self.current_ax, self.power_ax = self.fig.subplots(3, 1)
         self.fig.tight_layout(pad=3.0)
         
         # Voltage graph
@@ -238,6 +262,7 @@ class LoadManagementSystem:
         # Embed in Tkinter
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.monitor_tab)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.blitter = BlitManager(self.canvas, [self.voltage_line, self.current_line, self.power_line])
     
     def create_control_tab(self):
         """Create the load control tab"""
@@ -326,6 +351,11 @@ class LoadManagementSystem:
         self.time_remaining_label = tk.Label(summary_frame, text="--", font=("Arial", 12, "bold"))
         self.time_remaining_label.grid(row=3, column=1, sticky="w", padx=10)
         
+        # Energy over the last 24 hours (from the rollup tiers)
+        tk.Label(summary_frame, text="Energy (Last 24 Hours):", font=("Arial", 12)).grid(row=4, column=0, sticky="e")
+        self.daily_energy_label = tk.Label(summary_frame, text="0.0 kWh", font=("Arial", 12, "bold"))
+        self.daily_energy_label.grid(row=4, column=1, sticky="w", padx=10)
+        
         # Tariff settings
         tariff_frame = tk.Frame(self.energy_tab, bd=2, relief=tk.GROOVE, padx=10, pady=10)
         tariff_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -352,7 +382,8 @@ class LoadManagementSystem:
                  command=self.update_tariff_rates).grid(row=4, column=0, columnspan=2, pady=10)
         
         # Energy history graph
-        self.energy_fig, self.energy_ax = plt.subplots(figsize=(10, 4))
+        self.energy_fig = Figure(figsize=(10, 4))
+        self.energy_ax = self.energy_fig.subplots()
         self.energy_line, = self.energy_ax.plot([], [], label="Energy Consumption (kWh)", color="purple")
         self.energy_ax.set_title("Energy Consumption Over Time")
         self.energy_ax.set_xlabel("Time (s)")
@@ -365,6 +396,7 @@ class LoadManagementSystem:
         
         self.energy_canvas = FigureCanvasTkAgg(self.energy_fig, master=self.energy_tab)
         self.energy_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        self.energy_blitter = BlitManager(self.energy_canvas, [self.energy_line])
     
     def create_alerts_tab(self):
         """Create the alerts history tab"""
@@ -455,6 +487,9 @@ class LoadManagementSystem:
     def stop_monitoring(self):
         """Stop the monitoring process"""
         self.running = False
+        self.flush_log()
+        self.energy.pause()
+        self.save_energy()
         
         if hasattr(self, 'start_btn') and self.start_btn and self.start_btn.winfo_exists():
             self.start_btn.config(state=tk.NORMAL)
@@ -481,18 +516,28 @@ class LoadManagementSystem:
                 self.current_data.append(data["current"])
                 self.power_data.append(data["power"])
                 
-                # Calculate energy consumption (kWh) - accumulate energy per update interval
-                # Power is in Watts, convert to kW: data["power"] / 1000
-                # Time interval is in ms, convert to hours: UPDATE_INTERVAL / 1000 / 3600
-                energy_this_interval = (data["power"] / 1000) * (UPDATE_INTERVAL / 3600000)
-                self.energy_consumption += energy_this_interval
+                # Energy (kWh) over the measured monotonic interval, so sleeps, beeps
+                # or speech stalling the loop do not skew it
+                energy_this_interval = self.energy.add(data["power"], data["load_power"])
+                self.energy_consumption = self.energy.total
+                self.sample_times.append(datetime.datetime.now())
+                self.sample_energy.append(self.energy_consumption)
+                
+                # Fold the sample into the rollup tiers (O(1) per tier)
+                timestamp = now_ms()
+                self.rollups.add(timestamp, {
+                    "voltage": data["voltage"],
+                    "current": data["current"],
+                    "power": data["power"],
+                    "energy": energy_this_interval
+                })
                 
                 # Update UI in main thread
                 self.root.after(0, self.update_ui, data)
                 
                 # Log data if enabled
                 if self.logging_var.get():
-                    self.log_data(data)
+                    self.log_data(data, timestamp)
                 
                 # Check for alerts
                 self.check_alerts(data)
@@ -513,6 +558,8 @@ class LoadManagementSystem:
         # Calculate total current based on active loads
         total_current = 0.0
         total_power = 0.0
+        load_currents = {}
+        load_powers = {}
         
         # Simulate occasional voltage spikes or drops (5% chance)
         if random.random() < 0.05:
@@ -538,10 +585,12 @@ class LoadManagementSystem:
                     self.log_alert(f"Current spike detected in {load_name}: {current_spike_magnitude:.1f}A spike", "warning")
                 
                 load_current = load_data["current"] + current_base_variation
+                load_currents[load_name] = round(load_current, 1)
                 total_current += load_current
                 
                 # Calculate power for this load (P = V*I*PF)
                 load_power = (base_voltage + voltage_variation) * load_current * load_data["power_factor"]
+                load_powers[load_name] = load_power
                 total_power += load_power
         
         # Add some small background load (always present)
@@ -567,6 +616,8 @@ class LoadManagementSystem:
             "voltage": round(voltage, 2),
             "current": round(current, 2),
             "power": round(power, 2),
+            "load_currents": load_currents,
+            "load_power": load_powers,
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     
@@ -579,16 +630,8 @@ class LoadManagementSystem:
         print(f"DEBUG: Energy consumption: {self.energy_consumption:.5f} kWh") # Added debug print
         self.energy_value.config(text=f"{self.energy_consumption:.5f} kWh")
         
-        # Update cost
-        current_hour = datetime.datetime.now().hour
-        if 8 <= current_hour < 20:  # Peak hours
-            rate = self.tariff_rates["peak"]
-        elif 0 <= current_hour < 6:  # Off-peak hours
-            rate = self.tariff_rates["off_peak"]
-        else:  # Shoulder hours
-            rate = self.tariff_rates["shoulder"]
-        
-        cost = self.energy_consumption * rate
+        # Update cost: each tariff period's energy at its own rate
+        cost = self.energy.cost(self.tariff_rates)
         self.cost_value.config(text=f"{cost:.5f} Rs.")
         
         # Update budget remaining
@@ -602,87 +645,90 @@ class LoadManagementSystem:
                 hours_remaining = budget_remaining / consumption_rate
                 self.time_remaining_label.config(text=f"{hours_remaining:.1f} hours at current rate")
         
+        # Update 24-hour energy from pre-aggregated buckets
+        now = now_ms()
+        self.daily_energy_label.config(text=f"{self.rollups.total('energy', now - 86400000, now + 1):.5f} kWh")
+        
         # Update graphs with matching x and y data lengths
-        x_data = range(len(self.voltage_data))
-        self.voltage_line.set_data(x_data, list(self.voltage_data))
-        self.current_line.set_data(x_data, list(self.current_data))
-        self.power_line.set_data(x_data, list(self.power_data))
+        voltages = np.asarray(self.voltage_data, dtype=float)
+        currents = np.asarray(self.current_data, dtype=float)
+        powers = np.asarray(self.power_data, dtype=float)
+        self.set_line_data(self.voltage_line, voltages, (voltages > self.voltage_threshold) | (voltages < self.low_voltage_threshold))
+        self.set_line_data(self.current_line, currents, currents > self.current_threshold)
+        self.set_line_data(self.power_line, powers, powers > self.power_threshold)
         
         # Update energy consumption
         self.energy_data.append(self.energy_consumption)
-        self.energy_line.set_data(x_data, list(self.energy_data))
-        
-        # Update all axes
-        self.voltage_ax.relim()
-        self.voltage_ax.autoscale_view()
-        self.current_ax.relim()
-        self.current_ax.autoscale_view()
-        self.power_ax.relim()
-        self.power_ax.autoscale_view()
-        self.energy_ax.relim()
-        self.energy_ax.autoscale_view()
+        self.set_line_data(self.energy_line, np.asarray(self.energy_data, dtype=float))
         
-        # Redraw canvases
-        self.canvas.draw()
-        self.energy_canvas.draw()
+        # Blit the lines; axes are only rescaled when the data leaves them
+        self.blitter.update()
+        self.energy_blitter.update()
     
-    def check_alerts(self, data):
-        """Check for threshold violations and trigger alerts"""
-        # Get current thresholds from internal variables, not UI entries
-        voltage_threshold = self.voltage_threshold
-        current_threshold = self.current_threshold
-        power_threshold = self.power_threshold
-        energy_budget = self.energy_budget
-        
-        print(f"DEBUG ALERT: Checking alerts with V_thresh={voltage_threshold}, C_thresh={current_threshold}, P_thresh={power_threshold}, E_budget={energy_budget}") # Debug print
-
-        # Check voltage - both high and low thresholds
-        if data["voltage"] > voltage_threshold:
-            self.log_alert(f"High Voltage Alert! {data['voltage']} V (Threshold: {voltage_threshold} V)", "warning")
-            self.trigger_alert(f"High voltage warning: {data['voltage']} V")
-        elif data["voltage"] < 180:  # Low voltage threshold
-            self.log_alert(f"Low Voltage Alert! {data['voltage']} V (Minimum: 180 V)", "warning")
-            self.trigger_alert(f"Low voltage warning: {data['voltage']} V")
-        
-        # Check current - both high and low thresholds
-        if data["current"] > current_threshold:
-            self.log_alert(f"High Current Alert! {data['current']} A (Threshold: {current_threshold} A)", "warning")
-            self.trigger_alert(f"High current warning: {data['current']} A")
-        elif data["current"] < 0.1 and any(load["active"] for load in self.load_profiles.values()):  # Low current when loads are active
-            self.log_alert(f"Low Current Alert! {data['current']} A (Expected higher with active loads)", "warning")
-            self.trigger_alert(f"Low current warning: {data['current']} A")
-        
-        # Check power - both high and low thresholds
-        if data["power"] > power_threshold:
-            self.log_alert(f"High Power Alert! {data['power']} W (Threshold: {power_threshold} W)", "warning")
-            self.trigger_alert(f"High power warning: {data['power']} W")
-        elif data["power"] < 50 and any(load["active"] for load in self.load_profiles.values()):  # Low power when loads are active
-            self.log_alert(f"Low Power Alert! {data['power']} W (Expected higher with active loads)", "warning")
-            self.trigger_alert(f"Low power warning: {data['power']} W")
-        
-        # Check energy budget
-        if self.energy_consumption >= energy_budget * 0.9:  # 90% of budget
-            if self.energy_consumption >= energy_budget:
-                self.log_alert(f"Energy Budget Exceeded! {self.energy_consumption:.2f}/{energy_budget} kWh", "error")
-                self.trigger_alert("Energy budget exceeded!")
-            else:
-                self.log_alert(f"Energy Budget Warning! {self.energy_consumption:.2f}/{energy_budget} kWh (90% threshold)", "warning")
-                self.trigger_alert("Energy budget nearly exceeded!")
+    def set_line_data(self, line, values, keep=None):
+        """Plot a series, LTTB-decimated to the axes width once it is longer"""
+        x_data, values = downsample(np.arange(len(values)), values, axes_pixel_width(line.axes), keep)
+        line.set_data(x_data, values)
     
-    def trigger_alert(self, message):
-        """Trigger visual and audible alerts"""
-        if self.alert_sound_var.get():
-            try:
-                winsound.Beep(1000, 1000)
-            except:
-                pass
-        
-        if self.voice_alerts_var.get() and tts_engine:
+    def get_alert_engine(self):
+        """Alert rule engine compiled for the current rules and loads"""
+        channels = [TOTAL_CHANNEL] + list(self.load_profiles)
+        engine = self.alert_engine
+        try:
+            rules = alert_rule_set(DESKTOP_ALERT_RULES, self.extra_alert_rules)
+        except KeyError as e:
+            self.log_alert(f"Invalid alert rules, using defaults: {str(e)}", "error")
+            self.extra_alert_rules = []
+            rules = alert_rule_set(DESKTOP_ALERT_RULES)
+        if engine is None or engine.channels != channels or engine.rules != rules:
+            groups = {"loads": channels[1:]}
             try:
-                tts_engine.say(message)
-                tts_engine.runAndWait()
-            except:
-                pass
+                engine = AlertRuleEngine(rules, channels, groups=groups)
+            except (KeyError, ValueError) as e:
+                self.log_alert(f"Invalid alert rules, using defaults: {str(e)}", "error")
+                self.extra_alert_rules = []
+                engine = AlertRuleEngine(DESKTOP_ALERT_RULES, channels, groups=groups)
+            self.alert_engine = engine
+        return engine
+    
+    def alert_params(self):
+        """Named values that alert rule limits and cooldowns can refer to"""
+        return {
+            "voltage_threshold": self.voltage_threshold,
+            "low_voltage_threshold": self.low_voltage_threshold,
+            "current_threshold": self.current_threshold,
+            "power_threshold": self.power_threshold,
+            "energy_budget": self.energy_budget,
+            "alert_cooldown": self.alert_cooldown,
+            "rated_current": {name: load["current"] for name, load in self.load_profiles.items()}
+        }
+    
+    def check_alerts(self, data):
+        """Evaluate the alert rules on the latest sample (aggregate feed plus every load)"""
+        engine = self.get_alert_engine()
+        params = self.alert_params()
+        if params != engine.params:
+            engine.update_params(params)
+        
+        # Tick matrix: one row per channel, one column per quantity
+        loads = list(self.load_profiles.values())
+        load_currents = data.get("load_currents", {})
+        values = np.full((len(engine.channels), len(QUANTITIES)), np.nan)
+        values[0] = [data["voltage"], data["current"], data["power"],
+                     self.energy_consumption, sum(load["active"] for load in loads)]
+        values[1:, QUANTITIES.index("current")] = [load_currents.get(name, 0.0) for name in engine.channels[1:]]
+        values[1:, QUANTITIES.index("active_loads")] = [load["active"] for load in loads]
+        
+        for event in engine.evaluate(values, time.time()):
+            subject = None if event.channel == TOTAL_CHANNEL else event.channel
+            message = alert_message(event.kind, event.value, event.limit, subject)
+            self.log_alert(message, event.level.name.lower())
+            self.trigger_alert(message, event.kind if subject is None else f"{event.kind}:{subject}")
+    
+    def trigger_alert(self, message, key=None):
+        """Queue audible alerts; never blocks the caller"""
+        self.alert_dispatcher.notify(message, key=key, sound=bool(self.alert_sound_var.get()),
+                                     voice=bool(self.voice_alerts_var.get()))
     
     def log_alert(self, message, level="info"):
         """Log an alert message"""
@@ -775,27 +821,35 @@ class LoadManagementSystem:
         except ValueError:
             self.log_alert("Invalid tariff rates", "error")
     
-    def log_data(self, data):
-        """Log data to CSV file"""
+    def log_data(self, data, timestamp):
+        """Log data to the CSV file and the history store"""
         try:
-            file_exists = os.path.isfile(DATA_LOG_FILE)
-            
-            with open(DATA_LOG_FILE, mode='a', newline='') as file:
-                writer = csv.writer(file)
-                
-                if not file_exists:
-                    writer.writerow(["timestamp", "voltage", "current", "power", "energy"])
-                
-                writer.writerow([
-                    data["timestamp"],
-                    data["voltage"],
-                    data["current"],
-                    data["power"],
-                    self.energy_consumption
-                ])
+            self.log_sink.write([
+                data["timestamp"],
+                data["voltage"],
+                data["current"],
+                data["power"],
+                self.energy_consumption
+            ])
+            self.history.append(timestamp, [data["voltage"], data["current"], data["power"], self.energy_consumption])
+        except Exception as e:
+            self.log_alert(f"Failed to log data: {str(e)}", "error")
+    
+    def flush_log(self):
+        """Write any buffered log rows to disk"""
+        try:
+            self.log_sink.flush()
+            self.history.flush()
         except Exception as e:
             self.log_alert(f"Failed to log data: {str(e)}", "error")
     
+    def save_energy(self):
+        """Checkpoint the energy integrator so totals survive a restart"""
+        try:
+            self.energy.save(ENERGY_CHECKPOINT)
+        except Exception as e:
+            self.log_alert(f"Failed to save energy checkpoint: {str(e)}", "error")
+    
     def export_data(self):
         """Export data to a CSV file"""
         try:
@@ -806,30 +860,27 @@ class LoadManagementSystem:
             )
             
             if filename:
-                with open(filename, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["timestamp", "voltage", "current", "power", "energy"])
-                    
-                    # Generate timestamp for each data point
-                    time_step = UPDATE_INTERVAL / 1000  # seconds
-                    start_time = datetime.datetime.now() - datetime.timedelta(
-                        seconds=len(self.voltage_data) * time_step)
-                    
-                    for i in range(len(self.voltage_data)):
-                        timestamp = (start_time + datetime.timedelta(seconds=i * time_step)).strftime("%Y-%m-%d %H:%M:%S")
-                        energy = sum(list(self.power_data)[:i+1]) / 1000 * (time_step / 3600)  # kWh
-
-                        print(f"DEBUG EXPORT: Row data to write: Timestamp={timestamp}, Voltage={list(self.voltage_data)[i]}, Current={list(self.current_data)[i]}, Power={list(self.power_data)[i]}, Energy={energy}") # Debug print
-
-                        writer.writerow([
-                            timestamp,
-                            list(self.voltage_data)[i],
-                            list(self.current_data)[i],
-                            list(self.power_data)[i],
-                            energy
-                        ])
+                # This session's samples from the columnar history store
+                session_start = int(self.start_time.timestamp() * 1000)
+                timestamps, columns = self.history.range(start=session_start)
+                
+                if len(timestamps):
+                    data = {"timestamp": to_local_datetime64(timestamps),
+                            **{name: columns[name] for name in ("voltage", "current", "power", "energy")}}
+                else:
+                    # Nothing stored yet (e.g. logging disabled): fall back to the live buffers
+                    data = {
+                        "timestamp": np.array(self.sample_times, dtype="datetime64[ms]"),
+                        "voltage": np.asarray(self.voltage_data, dtype=np.float64),
+                        "current": np.asarray(self.current_data, dtype=np.float64),
+                        "power": np.asarray(self.power_data, dtype=np.float64),
+                        "energy": np.asarray(self.sample_energy, dtype=np.float64)  # kWh
+                    }
+                
+                # Written in chunks; the stored columns are memory-mapped, not loaded
+                rows = write_csv(filename, data)
                 
-                self.log_alert(f"Data exported to {filename}")
+                self.log_alert(f"Data exported to {filename} ({rows} records)")
         except Exception as e:
             self.log_alert(f"Export failed: {str(e)}", "error")
     
@@ -844,7 +895,9 @@ class LoadManagementSystem:
             "load_profiles": self.load_profiles,
             "logging_enabled": bool(self.logging_var.get()),
             "alert_sounds": bool(self.alert_sound_var.get()),
-            "voice_alerts": bool(self.voice_alerts_var.get())
+            "voice_alerts": bool(self.voice_alerts_var.get()),
+            "alert_cooldown": self.alert_cooldown,
+            "extra_alert_rules": self.extra_alert_rules
         }
         
         print(f"DEBUG: Configuration being saved to {CONFIG_FILE}: {config}") # Debug print
@@ -871,6 +924,8 @@ class LoadManagementSystem:
                 self.current_threshold = config.get("current_threshold", 150.0)
                 self.power_threshold = config.get("power_threshold", 30000.0)
                 self.energy_budget = config.get("energy_budget", 1000.0)
+                self.alert_cooldown = config.get("alert_cooldown", self.alert_cooldown)
+                self.extra_alert_rules = config.get("extra_alert_rules", [])
                 
                 print(f"DEBUG: Loaded thresholds: V={self.voltage_threshold}, A={self.current_threshold}, W={self.power_threshold}, E={self.energy_budget}") # Debug print
 
@@ -901,6 +956,7 @@ class LoadManagementSystem:
                 
                 # Update load profiles
                 self.load_profiles = config.get("load_profiles", self.load_profiles)
+                self.energy.set_loads(self.load_profiles)
                 self.update_load_controls()
                 
                 # Update settings
@@ -936,6 +992,10 @@ class LoadManagementSystem:
         self.voltage_data.clear()
         self.current_data.clear()
         self.power_data.clear()
+        self.sample_times.clear()
+        self.sample_energy.clear()
+        self.energy.reset()
+        self.save_energy()
         self.energy_consumption = 0.0
         self.start_time = datetime.datetime.now()
         
@@ -947,14 +1007,14 @@ class LoadManagementSystem:
         self.cost_value.config(text="-- Rs.")
         
         # Update graphs
-        self.voltage_line.set_ydata([])
-        self.current_line.set_ydata([])
-        self.power_line.set_ydata([])
+        self.voltage_line.set_data([], [])
+        self.current_line.set_data([], [])
+        self.power_line.set_data([], [])
         self.energy_line.set_data([], [])
         
         # Redraw canvases
-        self.canvas.draw()
-        self.energy_canvas.draw()
+        self.blitter.update()
+        self.energy_blitter.update()
         
         self.log_alert("All monitoring data cleared", "info")
     
@@ -966,6 +1026,10 @@ class LoadManagementSystem:
         if self.data_thread and self.data_thread.is_alive():
             self.data_thread.join(timeout=1.0) # Wait for data thread to finish
         
+        self.log_sink.close()
+        self.history.close()
+        self.alert_dispatcher.close()
+        self.save_energy()
         self.save_config()
         self.root.destroy()
 
@@ -976,5 +1040,6 @@ if __name__ == "__main__":
     
     # Handle window closing
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.after_idle(startup_profiler.mark_ready, "login screen shown")
     
     root.mainloop()               
\ No newline at end of file
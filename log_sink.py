@@ -0,0 +1,76 @@
+import csv
+import io
+import os
+import threading
+import time
+
+# Defaults
+LOG_HEADER = ["timestamp", "voltage", "current", "power", "energy"]
+FLUSH_ROWS = 100        # flush after this many buffered rows
+FLUSH_INTERVAL = 5.0    # or after this many seconds
+
+
+class BufferedLogSink:
+    """Long-lived CSV sink that keeps the log file open and batches rows.
+
+    Rows are formatted into an in-memory buffer and written with a single
+    ``write`` call once ``flush_rows`` rows are pending or ``flush_interval``
+    seconds have passed since the last flush. Call ``flush`` when monitoring
+    stops and ``close`` on shutdown so nothing buffered is lost.
+    """
+
+    def __init__(self, path, header=LOG_HEADER, flush_rows=FLUSH_ROWS, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.header = header
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+
+        self._lock = threading.Lock()
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = None
+
+    def _open(self):
+        """Open the log file for appending, writing the header for new files"""
+        new_file = not os.path.isfile(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, mode='a', newline='')
+        if new_file and self.header:
+            csv.writer(self._file).writerow(self.header)
+            self._file.flush()
+
+    def write(self, row):
+        """Buffer one row, flushing if the row-count or time budget is spent"""
+        with self._lock:
+            self._writer.writerow(row)
+            self._pending += 1
+            if self._pending >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def flush(self):
+        """Write all buffered rows to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        if self._file is None:
+            self._open()
+        self._file.write(self._buffer.getvalue())
+        self._file.flush()
+        self.rows_written += self._pending
+        self._pending = 0
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+    def close(self):
+        """Flush pending rows and release the file handle"""
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,176 @@
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+# Defaults
+CHUNK_WORDS = 150     # roughly 200 tokens, well inside a QA model window
+CHUNK_OVERLAP = 30    # words shared by neighbouring chunks so answers are not cut
+TOP_K = 4
+BM25_K1 = 1.5
+BM25_B = 0.75
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def chunk_starts(word_count, chunk_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    """Word offsets of overlapping windows of ``chunk_words`` words"""
+    if not word_count:
+        return range(0)
+    return range(0, max(word_count - overlap, 1), max(chunk_words - overlap, 1))
+
+
+def chunk_text(text, chunk_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    """Split text into overlapping windows of ``chunk_words`` words"""
+    words = text.split()
+    return [" ".join(words[start:start + chunk_words]) for start in chunk_starts(len(words), chunk_words, overlap)]
+
+
+class BM25Index:
+    """Inverted index over text chunks scored with Okapi BM25.
+
+    Chunks can be added at any time (e.g. page by page as a deck is
+    extracted); document frequencies and the average length are kept up
+    to date, so IDF is always computed from the current collection. Each
+    posting list holds parallel chunk-id and term-frequency arrays, and a
+    query is scored with one vectorized update per query term. Adding and
+    searching are thread-safe, so a deck can be queried while it is still
+    being indexed.
+
+    Chunk text is not kept: a chunk is its page number and word offset, and
+    ``contexts`` cuts it from the page text when the QA model needs it.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B, chunk_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+        self.k1 = k1
+        self.b = b
+        self.chunk_words = chunk_words
+        self.overlap = overlap
+        self.pages = []
+        self.starts = []
+        self._lengths = []
+        self._postings = {}   # term -> ([chunk ids], [term frequencies])
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def add(self, text, page):
+        """Chunk the text of ``page`` and index the chunks; returns how many were added"""
+        words = text.split()
+        starts = chunk_starts(len(words), self.chunk_words, self.overlap)
+        # Tokenize outside the lock; only the bookkeeping is serialized
+        tokenized = [tokenize(" ".join(words[start:start + self.chunk_words])) for start in starts]
+        with self._lock:
+            for start, tokens in zip(starts, tokenized):
+                chunk_id = len(self.pages)
+                for term, tf in Counter(tokens).items():
+                    ids, tfs = self._postings.setdefault(term, ([], []))
+                    ids.append(chunk_id)
+                    tfs.append(tf)
+                self.pages.append(page)
+                self.starts.append(start)
+                self._lengths.append(len(tokens))
+                self._total_length += len(tokens)
+        return len(starts)
+
+    def contexts(self, chunk_ids, read_page):
+        """Text of each chunk, cut from the page text that ``read_page(page)`` returns"""
+        words = {}
+        texts = []
+        for chunk_id in chunk_ids:
+            page = self.pages[chunk_id]
+            if page not in words:
+                words[page] = read_page(page).split()
+            start = self.starts[chunk_id]
+            texts.append(" ".join(words[page][start:start + self.chunk_words]))
+        return texts
+
+    def search(self, query, k=TOP_K):
+        """``(chunk_id, score)`` pairs of the ``k`` best chunks, best first"""
+        with self._lock:
+            return self._search(query, k)
+
+    def _search(self, query, k):
+        n = len(self.pages)
+        if not n:
+            return []
+        lengths = np.asarray(self._lengths, dtype=np.float64)
+        norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / n))
+        scores = np.zeros(n)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            ids = np.asarray(posting[0])
+            tf = np.asarray(posting[1], dtype=np.float64)
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            scores[ids] += idf * tf * (self.k1 + 1) / (tf + norm[ids])
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+def top_chunks(index, question, k=TOP_K):
+    """Ids of the chunks to read for ``question``; the first chunks if no term matches"""
+    chunk_ids = [chunk_id for chunk_id, _ in index.search(question, k)]
+    return chunk_ids or list(range(min(k, len(index))))
+
+
+def qa_batch(qa_model, requests):
+    """Answer ``(question, contexts)`` requests with a single pipeline call.
+
+    Every (question, context) pair of every request goes into one batched
+    forward pass; the raw results are split back per request.
+    """
+    questions, contexts, sizes = [], [], []
+    for question, request_contexts in requests:
+        questions.extend([question] * len(request_contexts))
+        contexts.extend(request_contexts)
+        sizes.append(len(request_contexts))
+    if not contexts:
+        return [[] for _ in requests]
+    results = qa_model(question=questions, context=contexts)
+    if isinstance(results, dict):
+        results = [results]
+
+    split, start = [], 0
+    for size in sizes:
+        split.append(results[start:start + size])
+        start += size
+    return split
+
+
+def rank_answers(index, chunk_ids, results):
+    """Candidate answers, best first, as dicts with ``answer``, ``score`` and ``page``"""
+    candidates = [
+        {"answer": result["answer"], "score": float(result["score"]), "page": index.pages[chunk_id]}
+        for chunk_id, result in zip(chunk_ids, results)
+    ]
+    return sorted(candidates, key=lambda candidate: candidate["score"], reverse=True)
+
+
+def answer_question(qa_model, index, read_page, question, k=TOP_K):
+    """Run the QA model on the top-``k`` chunks in one batched call"""
+    chunk_ids = top_chunks(index, question, k)
+    if not chunk_ids:
+        return []
+    results = qa_batch(qa_model, [(question, index.contexts(chunk_ids, read_page))])[0]
+    return rank_answers(index, chunk_ids, results)
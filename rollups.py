@@ -0,0 +1,176 @@
+import threading
+
+import numpy as np
+
+# Rollup tiers: (bucket width in seconds, number of buckets kept)
+DEFAULT_TIERS = (
+    (1, 3600),          # 1 s buckets for the last hour
+    (60, 7 * 1440),     # 1 min buckets for the last week
+    (900, 35 * 96),     # 15 min buckets for the last 35 days
+    (3600, 400 * 24)    # 1 h buckets for the last 400 days
+)
+ROLLUP_COLUMNS = ("voltage", "current", "power", "energy")
+
+
+def energy_increments(cumulative):
+    """Per-sample kWh increments from a cumulative energy column.
+
+    The cumulative counter restarts from zero whenever a session starts or
+    its data is cleared; a drop is treated as a restart, so the increment
+    for that sample is the new cumulative value itself.
+    """
+    cumulative = np.asarray(cumulative, dtype=np.float64)
+    if cumulative.size == 0:
+        return cumulative
+    increments = np.diff(cumulative, prepend=cumulative[0])
+    restarts = increments < 0
+    increments[restarts] = cumulative[restarts]
+    return increments
+
+
+class RollupTier:
+    """Ring buffer of fixed-width buckets holding min/max/sum/count per column"""
+
+    def __init__(self, resolution, capacity, columns=ROLLUP_COLUMNS):
+        self.resolution = resolution
+        self.resolution_ms = resolution * 1000
+        self.capacity = capacity
+        self.columns = tuple(columns)
+
+        width = len(self.columns)
+        self.bucket_ids = np.full(capacity, -1, dtype=np.int64)
+        self.mins = np.zeros((capacity, width))
+        self.maxs = np.zeros((capacity, width))
+        self.sums = np.zeros((capacity, width))
+        self.counts = np.zeros(capacity, dtype=np.int64)
+
+    def add(self, timestamp, values):
+        """Fold one sample (epoch ms, array in column order) into its bucket"""
+        bucket = timestamp // self.resolution_ms
+        slot = bucket % self.capacity
+        if self.bucket_ids[slot] != bucket:
+            # Starting a new bucket; it evicts whatever was in this slot
+            self.bucket_ids[slot] = bucket
+            self.mins[slot] = values
+            self.maxs[slot] = values
+            self.sums[slot] = values
+            self.counts[slot] = 1
+        else:
+            np.minimum(self.mins[slot], values, out=self.mins[slot])
+            np.maximum(self.maxs[slot], values, out=self.maxs[slot])
+            self.sums[slot] += values
+            self.counts[slot] += 1
+
+    def add_many(self, timestamps, values):
+        """Fold a sorted block of samples in with one reduction per bucket"""
+        buckets = timestamps // self.resolution_ms
+        # Only the newest ``capacity`` buckets can survive in the ring
+        keep = buckets > buckets[-1] - self.capacity
+        buckets, values = buckets[keep], values[keep]
+        starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+
+        ids = buckets[starts]
+        slots = ids % self.capacity
+        mins = np.minimum.reduceat(values, starts, axis=0)
+        maxs = np.maximum.reduceat(values, starts, axis=0)
+        sums = np.add.reduceat(values, starts, axis=0)
+        counts = np.diff(np.append(starts, buckets.size))
+
+        # Merge into buckets that already hold data, overwrite stale slots
+        existing = self.bucket_ids[slots] == ids
+        fresh = ~existing
+        merge = slots[existing]
+        self.mins[merge] = np.minimum(self.mins[merge], mins[existing])
+        self.maxs[merge] = np.maximum(self.maxs[merge], maxs[existing])
+        self.sums[merge] += sums[existing]
+        self.counts[merge] += counts[existing]
+        new = slots[fresh]
+        self.bucket_ids[new] = ids[fresh]
+        self.mins[new] = mins[fresh]
+        self.maxs[new] = maxs[fresh]
+        self.sums[new] = sums[fresh]
+        self.counts[new] = counts[fresh]
+
+    def series(self, start, end):
+        """Buckets overlapping ``[start, end)`` (epoch ms) that hold data.
+
+        Returns ``(bucket start timestamps, {"min"|"max"|"sum"|"mean"|"count":
+        {column: array}})``.
+        """
+        first = max(start // self.resolution_ms, (end - 1) // self.resolution_ms - self.capacity + 1)
+        ids = np.arange(first, (end - 1) // self.resolution_ms + 1, dtype=np.int64)
+        slots = ids % self.capacity
+        valid = self.bucket_ids[slots] == ids
+        ids, slots = ids[valid], slots[valid]
+
+        counts = self.counts[slots]
+        means = self.sums[slots] / counts[:, None] if counts.size else self.sums[slots]
+        stats = {
+            "min": self.mins[slots],
+            "max": self.maxs[slots],
+            "sum": self.sums[slots],
+            "mean": means
+        }
+        result = {name: {col: table[:, i] for i, col in enumerate(self.columns)} for name, table in stats.items()}
+        result["count"] = counts
+        return ids * self.resolution_ms, result
+
+    def total(self, column, start, end):
+        """Sum of ``column`` over the buckets overlapping ``[start, end)``"""
+        _, stats = self.series(start, end)
+        return float(stats["sum"][column].sum())
+
+
+class MultiResolutionRollup:
+    """Incrementally maintained 1 s / 1 min / 15 min / 1 h rollups.
+
+    ``add`` costs O(1) per tier, so every sample updates all tiers as it
+    arrives and long-range charts and energy totals read pre-aggregated
+    buckets instead of re-reducing raw samples. Feed the ``energy`` column
+    with per-sample kWh increments so bucket sums are energy totals.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, columns=ROLLUP_COLUMNS):
+        self.columns = tuple(columns)
+        self.tiers = {resolution: RollupTier(resolution, capacity, self.columns) for resolution, capacity in tiers}
+        self._lock = threading.Lock()
+
+    def add(self, timestamp, values):
+        """Add one sample; ``values`` is a mapping or a sequence in column order"""
+        if isinstance(values, dict):
+            values = [values[name] for name in self.columns]
+        values = np.asarray(values, dtype=np.float64)
+        timestamp = int(timestamp)
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.add(timestamp, values)
+
+    def add_many(self, timestamps, columns):
+        """Bulk-load sorted samples, e.g. when rebuilding from the history store"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if timestamps.size == 0:
+            return
+        values = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in self.columns])
+        with self._lock:
+            for resolution, tier in self.tiers.items():
+                # Skip rows that are older than anything this tier keeps
+                first = int(np.searchsorted(timestamps, timestamps[-1] - self.span(resolution) * 1000))
+                tier.add_many(timestamps[first:], values[first:])
+
+    def span(self, resolution):
+        """Time covered by a tier, in seconds"""
+        tier = self.tiers[resolution]
+        return tier.resolution * tier.capacity
+
+    def series(self, resolution, start, end):
+        """Bucketed series from one tier, see ``RollupTier.series``"""
+        with self._lock:
+            return self.tiers[resolution].series(start, end)
+
+    def total(self, column, start, end, resolution=None):
+        """Sum of ``column`` over ``[start, end)`` from the finest tier that covers it"""
+        if resolution is None:
+            seconds = (end - start) / 1000
+            resolution = next((r for r in sorted(self.tiers) if self.span(r) >= seconds), max(self.tiers))
+        with self._lock:
+            return self.tiers[resolution].total(column, start, end)
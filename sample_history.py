@@ -0,0 +1,90 @@
+import numpy as np
+
+# Defaults
+INITIAL_CAPACITY = 1024
+GROWTH_FACTOR = 2
+
+
+class SampleHistory:
+    """Growable columnar history of float samples with running min/max.
+
+    Columns live in one preallocated ``(columns, capacity)`` float64 array
+    that doubles when full, so ``append`` is amortized O(1) and each
+    sample costs 8 bytes per column instead of a dict. Column accessors
+    return views of the filled part without copying, and the running
+    minimum and maximum of every column are updated on append, so
+    autoscaling never rescans the history. Optional timestamps are kept
+    in a parallel ``datetime64[s]`` array.
+    """
+
+    def __init__(self, columns, capacity=INITIAL_CAPACITY, timestamps=False):
+        self.columns = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.empty((len(self.columns), capacity))
+        self._times = np.empty(capacity, dtype="datetime64[s]") if timestamps else None
+        self._positions = np.arange(capacity, dtype=np.float64)
+        self._size = 0
+        # Plain lists: scalar compares on NumPy elements would dominate append
+        self.minimum = [np.inf] * len(self.columns)
+        self.maximum = [-np.inf] * len(self.columns)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return self._data.shape[1]
+
+    def _grow(self):
+        capacity = self.capacity * GROWTH_FACTOR
+        data = np.empty((len(self.columns), capacity))
+        data[:, :self._size] = self._data[:, :self._size]
+        self._data = data
+        self._positions = np.arange(capacity, dtype=np.float64)
+        if self._times is not None:
+            times = np.empty(capacity, dtype=self._times.dtype)
+            times[:self._size] = self._times[:self._size]
+            self._times = times
+
+    def append(self, sample, timestamp=None):
+        """Add one sample (a mapping with every column); ``timestamp`` as str or datetime"""
+        if self._size == self.capacity:
+            self._grow()
+        row = self._size
+        values = [float(sample[name]) for name in self.columns]
+        self._data[:, row] = values
+        minimum, maximum = self.minimum, self.maximum
+        for i, value in enumerate(values):
+            if value < minimum[i]:
+                minimum[i] = value
+            if value > maximum[i]:
+                maximum[i] = value
+        if self._times is not None:
+            self._times[row] = np.datetime64(timestamp, "s") if timestamp is not None else np.datetime64("NaT")
+        self._size += 1
+
+    def column(self, name):
+        """View of a column's samples; it does not see later appends"""
+        return self._data[self._index[name], :self._size]
+
+    def positions(self):
+        """Sample numbers 0..n-1 as a view, for use as an x axis"""
+        return self._positions[:self._size]
+
+    def times(self):
+        return None if self._times is None else self._times[:self._size]
+
+    def min(self, name):
+        return self.minimum[self._index[name]] if self._size else None
+
+    def max(self, name):
+        return self.maximum[self._index[name]] if self._size else None
+
+    def clear(self):
+        self._size = 0
+        self.minimum = [np.inf] * len(self.columns)
+        self.maximum = [-np.inf] * len(self.columns)
+
+    def nbytes(self):
+        """Memory held by the column buffers"""
+        return self._data.nbytes + self._positions.nbytes + (0 if self._times is None else self._times.nbytes)
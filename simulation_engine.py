@@ -0,0 +1,124 @@
+import datetime
+import numpy as np
+
+# Simulation parameters (match the original per-load loop in app.py)
+BASE_VOLTAGE = 230.0
+VOLTAGE_JITTER = 5.0            # uniform(-5, 5) V per tick
+VOLTAGE_SPIKE_PROB = 0.01       # 1% chance per tick
+VOLTAGE_SPIKE_RANGE = 30.0      # uniform(-30, 30) V
+CURRENT_JITTER = 0.1            # uniform(-0.1, 0.1) * rated current
+CURRENT_SPIKE_PROB = 0.005      # 0.5% chance per active load per tick
+CURRENT_SPIKE_RANGE = (10.0, 30.0)
+BACKGROUND_CURRENT = (3.0, 8.0)
+BACKGROUND_PF = 0.92
+VOLTAGE_BOUNDS = (180.0, 270.0)
+CURRENT_BOUNDS = (0.0, 600.0)
+POWER_BOUNDS = (0.0, 150000.0)
+
+
+class VectorizedLoadSimulator:
+    """NumPy-backed load simulator that builds whole ticks in one call.
+
+    Load profiles are held as column arrays (rated current, power factor and
+    an active mask) so that the cost of a tick is a handful of array
+    operations regardless of how many loads a site has.
+    """
+
+    def __init__(self, load_profiles=None, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.names = []
+        self.current = np.zeros(0)
+        self.power_factor = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)
+        if load_profiles:
+            self.set_profiles(load_profiles)
+
+    def set_profiles(self, load_profiles):
+        """Rebuild the column arrays from a ``{name: profile}`` mapping"""
+        self.names = list(load_profiles.keys())
+        profiles = list(load_profiles.values())
+        self.current = np.fromiter((p["current"] for p in profiles), dtype=np.float64, count=len(profiles))
+        self.power_factor = np.fromiter((p["power_factor"] for p in profiles), dtype=np.float64, count=len(profiles))
+        self.active = np.fromiter((p["active"] for p in profiles), dtype=bool, count=len(profiles))
+
+    def set_active(self, index, active):
+        """Switch a single load on or off without rebuilding the arrays"""
+        self.active[index] = active
+
+    def simulate_batch(self, ticks):
+        """Simulate ``ticks`` samples at once.
+
+        Returns a dict of float arrays of length ``ticks`` (``voltage``,
+        ``current``, ``power``, ``voltage_spike``), the per-load currents and
+        powers as ``load_current`` and ``load_power`` (ticks x loads, zero for
+        inactive loads; power uses the same bus voltage as ``power``) and the
+        spike events as ``current_spikes`` (tick index, load index,
+        magnitude arrays).
+        """
+        rng = self.rng
+        idx = np.flatnonzero(self.active)
+        rated = self.current[idx]
+        pf = self.power_factor[idx]
+
+        # Bus voltage: jitter plus occasional spikes or drops
+        voltage_variation = rng.uniform(-VOLTAGE_JITTER, VOLTAGE_JITTER, ticks)
+        spike_mask = rng.random(ticks) < VOLTAGE_SPIKE_PROB
+        voltage_spike = np.where(spike_mask, rng.uniform(-VOLTAGE_SPIKE_RANGE, VOLTAGE_SPIKE_RANGE, ticks), 0.0)
+        load_voltage = BASE_VOLTAGE + voltage_variation + voltage_spike
+
+        # Per-load current: (ticks x active loads) matrix
+        variation = rng.uniform(-CURRENT_JITTER, CURRENT_JITTER, (ticks, idx.size)) * rated
+        current_spike_mask = rng.random((ticks, idx.size)) < CURRENT_SPIKE_PROB
+        spike_ticks, spike_loads = np.nonzero(current_spike_mask)
+        spike_values = rng.uniform(CURRENT_SPIKE_RANGE[0], CURRENT_SPIKE_RANGE[1], spike_ticks.size)
+        variation[spike_ticks, spike_loads] += spike_values
+        load_current = np.maximum(0.0, rated + variation)
+
+        total_current = load_current.sum(axis=1)
+        per_load = np.zeros((ticks, self.current.size))
+        per_load[:, idx] = load_current
+        per_load_power = np.zeros_like(per_load)
+        per_load_power[:, idx] = load_voltage[:, None] * load_current * pf
+        total_power = load_voltage * (load_current @ pf)
+
+        # Background load (always present)
+        background_current = rng.uniform(BACKGROUND_CURRENT[0], BACKGROUND_CURRENT[1], ticks)
+        total_current += background_current
+        total_power += load_voltage * background_current * BACKGROUND_PF
+
+        return {
+            "voltage": np.clip(load_voltage, *VOLTAGE_BOUNDS),
+            "current": np.clip(total_current, *CURRENT_BOUNDS),
+            "power": np.clip(total_power, *POWER_BOUNDS),
+            "voltage_spike": voltage_spike,
+            "load_current": per_load,
+            "load_power": per_load_power,
+            "current_spikes": (spike_ticks, idx[spike_loads], spike_values),
+        }
+
+    def simulate_tick(self):
+        """Simulate a single sample in the dict format used by the front ends.
+
+        The returned dict also carries ``load_current`` (amps) and
+        ``load_power`` (watts) as arrays in ``names`` order, and ``events``:
+        a list of ``(kind, load name, magnitude)`` tuples describing the
+        voltage and current spikes injected into this tick, so callers can
+        raise alerts for them.
+        """
+        batch = self.simulate_batch(1)
+        events = []
+        if batch["voltage_spike"][0] != 0.0:
+            events.append(("voltage_spike", None, float(batch["voltage_spike"][0])))
+        _, loads, values = batch["current_spikes"]
+        for load_index, value in zip(loads, values):
+            events.append(("current_spike", self.names[load_index], float(value)))
+
+        return {
+            "voltage": round(float(batch["voltage"][0]), 1),
+            "current": round(float(batch["current"][0]), 1),
+            "power": round(float(batch["power"][0]), 0),
+            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "load_current": np.round(batch["load_current"][0], 1),
+            "load_power": batch["load_power"][0],
+            "events": events
+        }
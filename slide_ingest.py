@@ -0,0 +1,105 @@
+import hashlib
+import os
+import threading
+
+from document_cache import PageSpool
+from lazy_imports import lazy_import
+from retrieval import BM25Index
+
+PyPDF2 = lazy_import("PyPDF2")
+
+# Defaults
+UPLOAD_BLOCK = 1024 * 1024   # bytes copied per read while streaming an upload
+EXTRACT_WORKERS = 4
+PAGES_PER_TASK = 16
+
+
+def stream_to_file(source, path, block_size=UPLOAD_BLOCK):
+    """Copy a file object to ``path`` block by block; returns the SHA-256 of the data"""
+    sha = hashlib.sha256()
+    with open(path, "wb") as target:
+        for block in iter(lambda: source.read(block_size), b""):
+            sha.update(block)
+            target.write(block)
+    return sha.hexdigest()
+
+
+class SlideExtraction:
+    """Extracts a PDF page by page on a thread pool and indexes pages as they finish.
+
+    The page range is split into tasks of ``PAGES_PER_TASK`` pages, each
+    with its own ``PdfReader`` (readers are not thread-safe). Every
+    extracted page is added to ``index`` straight away and its text goes
+    to the ``pages`` spool file, so questions can be answered on the pages
+    done so far and no copy of the full text is kept in memory. When the
+    last page is in, the cache entry is published and ``path`` is deleted.
+    """
+
+    def __init__(self, path, digest, pool, cache=None):
+        self.path = path
+        self.digest = digest
+        self.cache = cache
+        self.index = BM25Index()
+        self.pages = cache.spool(digest) if cache is not None else PageSpool()
+        self.done = 0
+        self.failed = 0
+        self.errors = []
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+
+        with open(path, "rb") as file:
+            self.total = len(PyPDF2.PdfReader(file).pages)
+        if not self.total:
+            self._finish()
+        for start in range(0, self.total, PAGES_PER_TASK):
+            pool.submit(self._extract, range(start, min(start + PAGES_PER_TASK, self.total)))
+
+    def status(self):
+        return {"pages_done": self.done, "pages_failed": self.failed, "pages_total": self.total,
+                "chunks": len(self.index), "finished": self.finished.is_set()}
+
+    def _extract(self, page_range):
+        with open(self.path, "rb") as file:
+            try:
+                reader = PyPDF2.PdfReader(file)
+            except Exception as e:
+                self._fail(f"pages {page_range.start + 1}-{page_range.stop}: {e}", len(page_range))
+                return
+            for i in page_range:
+                try:
+                    text = reader.pages[i].extract_text() or ""
+                except Exception as e:
+                    self._fail(f"page {i + 1}: {e}", 1)
+                    continue
+                self._add(i + 1, text)
+
+    def _fail(self, error, pages):
+        with self._lock:
+            self.errors.append(error)
+        self._count(pages, failed=True)
+
+    def _add(self, page_number, text):
+        # Spooled before indexing, so a chunk the index returns can always be read
+        self.pages.append(page_number, text)
+        if text:
+            self.index.add(text, page=page_number)
+        self._count(1)
+
+    def _count(self, pages, failed=False):
+        with self._lock:
+            self.done += pages
+            if failed:
+                self.failed += pages
+            last = self.done == self.total
+        if last:
+            self._finish()
+
+    def _finish(self):
+        # A deck with unreadable pages is not cached, so a re-upload retries them
+        if self.cache is not None and not self.failed:
+            self.cache.publish(self.digest, self.index, self.pages)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.finished.set()
@@ -0,0 +1,215 @@
+import bisect
+import datetime
+import os
+import threading
+import time
+from array import array
+
+import numpy as np
+
+# Defaults
+HISTORY_COLUMNS = ("voltage", "current", "power", "energy")
+INDEX_STRIDE = 1024     # one sparse-index entry per this many rows
+FLUSH_ROWS = 100        # rows buffered in memory before they hit disk
+
+TIMESTAMP_FILE = "timestamp.i8"
+
+
+def now_ms():
+    """Current time as int64 epoch milliseconds"""
+    return int(time.time() * 1000)
+
+
+def local_offset_ms():
+    """The local UTC offset in milliseconds"""
+    offset = datetime.datetime.now().astimezone().utcoffset()
+    return int(offset.total_seconds() * 1000) if offset else 0
+
+
+def to_local_datetime64(timestamps):
+    """Convert epoch-millisecond timestamps to local-time ``datetime64[ms]``"""
+    return (np.asarray(timestamps, dtype=np.int64) + local_offset_ms()).astype("datetime64[ms]")
+
+
+def from_local_datetime64(times):
+    """Convert local-time ``datetime64`` values to int64 epoch milliseconds"""
+    return np.asarray(times).astype("datetime64[ms]").astype(np.int64) - local_offset_ms()
+
+
+class TimeSeriesStore:
+    """Append-only columnar store for monitoring history.
+
+    Every column lives in its own fixed-width file inside ``directory``:
+    ``timestamp.i8`` holds int64 epoch milliseconds and ``<column>.f8`` holds
+    float64 values, so row ``i`` sits at byte offset ``8 * i`` in each file.
+    Reads go through ``numpy.memmap`` and a sparse in-memory index (every
+    ``index_stride``-th timestamp) narrows range queries to a single block,
+    so answering "power between 10:00 and 11:00" is O(log n) and touches
+    only the rows returned.
+
+    Timestamps must be appended in non-decreasing order.
+    """
+
+    def __init__(self, directory, columns=HISTORY_COLUMNS, index_stride=INDEX_STRIDE, flush_rows=FLUSH_ROWS):
+        self.directory = directory
+        self.columns = tuple(columns)
+        self.index_stride = index_stride
+        self.flush_rows = flush_rows
+
+        self._lock = threading.RLock()
+        self._pending_ts = array('q')
+        self._pending = {name: array('d') for name in self.columns}
+        self._files = None
+        self._maps = None
+        self._mapped_rows = -1
+
+        os.makedirs(directory, exist_ok=True)
+        self._rows = self._repair()
+        self._sparse_index = []
+        self._last_ts = None
+        if self._rows:
+            ts = self._map_timestamps()
+            self._sparse_index = ts[::index_stride].tolist()
+            self._last_ts = int(ts[-1])
+
+    def _path(self, name):
+        if name == "timestamp":
+            return os.path.join(self.directory, TIMESTAMP_FILE)
+        return os.path.join(self.directory, f"{name}.f8")
+
+    def _repair(self):
+        """Truncate all column files to the shortest one (torn final write)"""
+        names = ("timestamp",) + self.columns
+        sizes = [os.path.getsize(self._path(n)) if os.path.exists(self._path(n)) else 0 for n in names]
+        rows = min(sizes) // 8
+        for name, size in zip(names, sizes):
+            if size != rows * 8:
+                with open(self._path(name), 'ab') as f:
+                    f.truncate(rows * 8)
+        return rows
+
+    def __len__(self):
+        with self._lock:
+            return self._rows + len(self._pending_ts)
+
+    def append(self, timestamp, values):
+        """Append one row; ``values`` is a mapping or a sequence in column order"""
+        timestamp = int(timestamp)
+        with self._lock:
+            if self._last_ts is not None and timestamp < self._last_ts:
+                raise ValueError(f"Timestamp {timestamp} is older than the last stored sample ({self._last_ts})")
+            if isinstance(values, dict):
+                values = [values[name] for name in self.columns]
+            self._pending_ts.append(timestamp)
+            for name, value in zip(self.columns, values):
+                self._pending[name].append(float(value))
+            self._last_ts = timestamp
+            if len(self._pending_ts) >= self.flush_rows:
+                self._flush_locked()
+
+    def append_many(self, timestamps, columns):
+        """Append a block of rows given as an int64 array and ``{column: array}``"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if timestamps.size == 0:
+            return
+        if np.any(np.diff(timestamps) < 0):
+            raise ValueError("Timestamps must be in non-decreasing order")
+        with self._lock:
+            if self._last_ts is not None and timestamps[0] < self._last_ts:
+                raise ValueError(f"Timestamp {int(timestamps[0])} is older than the last stored sample ({self._last_ts})")
+            self._flush_locked()
+            self._write(timestamps, {name: np.asarray(columns[name], dtype=np.float64) for name in self.columns})
+            self._last_ts = int(timestamps[-1])
+
+    def last_timestamp(self):
+        """Timestamp of the newest row, or None when the store is empty"""
+        with self._lock:
+            return self._last_ts
+
+    def flush(self):
+        """Write buffered rows to the column files"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending_ts:
+            return
+        timestamps = np.frombuffer(self._pending_ts, dtype=np.int64)
+        columns = {name: np.frombuffer(self._pending[name], dtype=np.float64) for name in self.columns}
+        self._write(timestamps, columns)
+        self._pending_ts = array('q')
+        self._pending = {name: array('d') for name in self.columns}
+
+    def _write(self, timestamps, columns):
+        if self._files is None:
+            self._files = {name: open(self._path(name), 'ab') for name in ("timestamp",) + self.columns}
+        first_row = self._rows
+        self._files["timestamp"].write(timestamps.tobytes())
+        for name in self.columns:
+            self._files[name].write(columns[name].tobytes())
+        for f in self._files.values():
+            f.flush()
+        self._rows += timestamps.size
+
+        # Extend the sparse index with every stride boundary we crossed
+        first_entry = -(-first_row // self.index_stride) * self.index_stride
+        self._sparse_index.extend(timestamps[first_entry - first_row::self.index_stride].tolist())
+
+    def _map_timestamps(self):
+        return np.memmap(self._path("timestamp"), dtype=np.int64, mode='r', shape=(self._rows,))
+
+    def _remap(self):
+        """(Re)create the memory maps after the files have grown"""
+        if self._mapped_rows != self._rows:
+            self._maps = {"timestamp": self._map_timestamps()}
+            for name in self.columns:
+                self._maps[name] = np.memmap(self._path(name), dtype=np.float64, mode='r', shape=(self._rows,))
+            self._mapped_rows = self._rows
+        return self._maps
+
+    def _search(self, ts, timestamp, side):
+        """Row position of ``timestamp`` using the sparse index, then one block"""
+        block = bisect.bisect_left(self._sparse_index, timestamp) if side == 'left' else bisect.bisect_right(self._sparse_index, timestamp)
+        lo = max(0, block - 1) * self.index_stride
+        hi = min(self._rows, block * self.index_stride + 1)
+        return lo + int(np.searchsorted(ts[lo:hi], timestamp, side=side))
+
+    def range(self, start=None, end=None, columns=None):
+        """Rows with ``start <= timestamp < end`` (epoch ms, either bound optional).
+
+        Returns ``(timestamps, {column: values})``; the arrays are read-only
+        views onto the memory-mapped files.
+        """
+        columns = self.columns if columns is None else columns
+        with self._lock:
+            self._flush_locked()
+            if not self._rows:
+                return np.zeros(0, dtype=np.int64), {name: np.zeros(0) for name in columns}
+            maps = self._remap()
+            ts = maps["timestamp"]
+            lo = 0 if start is None else self._search(ts, start, 'left')
+            hi = self._rows if end is None else self._search(ts, end, 'left')
+            hi = max(lo, hi)
+            return ts[lo:hi], {name: maps[name][lo:hi] for name in columns}
+
+    def tail(self, count, columns=None):
+        """The last ``count`` rows as ``(timestamps, {column: values})``"""
+        columns = self.columns if columns is None else columns
+        with self._lock:
+            self._flush_locked()
+            if not self._rows:
+                return np.zeros(0, dtype=np.int64), {name: np.zeros(0) for name in columns}
+            maps = self._remap()
+            lo = max(0, self._rows - count)
+            return maps["timestamp"][lo:], {name: maps[name][lo:] for name in columns}
+
+    def close(self):
+        """Flush pending rows and close the column files"""
+        with self._lock:
+            self._flush_locked()
+            if self._files is not None:
+                for f in self._files.values():
+                    f.close()
+                self._files = None
+            self._maps = None
+            self._mapped_rows = -1
@@ -0,0 +1,153 @@
+import hashlib
+import io
+import re
+import threading
+from collections import OrderedDict
+
+from gtts import gTTS
+from pydub import AudioSegment
+from pydub.playback import play
+
+from alert_dispatcher import SystemBackend
+
+# Defaults
+MAX_CACHE_BYTES = 32 * 1024 * 1024   # decoded PCM kept in memory
+NUMBER_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+TEMPLATE_FIELD = "{}"
+ONES = ("zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+        "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen")
+TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+SCALES = ((1_000_000_000, "billion"), (1_000_000, "million"), (1000, "thousand"))
+NUMBER_WORDS = ONES + TENS[2:] + ("hundred",) + tuple(word for _, word in SCALES)
+
+
+def number_words(n):
+    """Words for a non-negative integer, e.g. 231 -> ["two", "hundred", "thirty", "one"]"""
+    if n < 20:
+        return [ONES[n]]
+    if n < 100:
+        tens, ones = divmod(n, 10)
+        return [TENS[tens]] + ([ONES[ones]] if ones else [])
+    if n < 1000:
+        hundreds, rest = divmod(n, 100)
+        return [ONES[hundreds], "hundred"] + (number_words(rest) if rest else [])
+    for scale, word in SCALES:
+        if n >= scale:
+            head, rest = divmod(n, scale)
+            return number_words(head) + [word] + (number_words(rest) if rest else [])
+
+
+class TTSClipCache:
+    """Content-addressed LRU cache of decoded text-to-speech clips.
+
+    Clips are keyed by a SHA-256 of the voice settings and the text, held
+    as decoded ``AudioSegment`` PCM and evicted least-recently-used once
+    ``max_bytes`` is exceeded. Synthesis goes through an in-memory MP3
+    buffer, so no temporary files are written.
+
+    Alert messages carry live readings ("... is 231.45 volts"), so
+    ``speech`` splits a message into its fixed text and its numbers and
+    assembles it from cached pieces: text fragments and number words
+    ("two", "hundred", "thirty", "one", "point", ...). After ``prerender``
+    has warmed the template fragments and the number words, any reading
+    costs dictionary lookups and a concatenation, with no synthesis.
+    """
+
+    def __init__(self, lang='en', slow=False, max_bytes=MAX_CACHE_BYTES):
+        self.lang = lang
+        self.slow = slow
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._clips = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, text):
+        """Cache key for ``text`` under the current voice settings"""
+        return hashlib.sha256(f"{self.lang}|{self.slow}|{text}".encode("utf-8")).hexdigest()
+
+    def synthesize(self, text):
+        """Render ``text`` with gTTS and decode it to PCM"""
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=self.lang, slow=self.slow).write_to_fp(buffer)
+        buffer.seek(0)
+        return AudioSegment.from_file(buffer, format="mp3")
+
+    def clip(self, text):
+        """Decoded clip for ``text``, synthesizing it on a miss"""
+        key = self.key(text)
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None:
+                self._clips.move_to_end(key)
+                self.hits += 1
+                return clip
+            self.misses += 1
+
+        clip = self.synthesize(text)
+        with self._lock:
+            if key not in self._clips:
+                self._clips[key] = clip
+                self.size += len(clip.raw_data)
+                self._evict()
+        return clip
+
+    def _evict(self):
+        # Always keep the clip that was just added
+        while self.size > self.max_bytes and len(self._clips) > 1:
+            _, clip = self._clips.popitem(last=False)
+            self.size -= len(clip.raw_data)
+
+    def _pieces(self, message):
+        """Split a message into cacheable fragments; numbers are spoken piecewise"""
+        pieces = []
+        for i, part in enumerate(NUMBER_PATTERN.split(message)):
+            part = part.strip()
+            if not part:
+                continue
+            if i % 2 == 0:
+                pieces.append(part)
+                continue
+            whole, _, decimals = part.partition(".")
+            pieces.extend(number_words(int(whole)))
+            if decimals:
+                pieces.append("point")
+                pieces.extend(ONES[int(digit)] for digit in decimals)
+        return pieces
+
+    def speech(self, message):
+        """Full clip for ``message`` assembled from cached fragments"""
+        clips = [self.clip(piece) for piece in self._pieces(message)]
+        if not clips:
+            return AudioSegment.empty()
+        return sum(clips[1:], clips[0])
+
+    def prerender(self, templates):
+        """Warm the cache with the fixed parts of ``{}`` templates, the number words and "point" """
+        pieces = ["point"] + list(NUMBER_WORDS)
+        for template in templates:
+            for part in template.split(TEMPLATE_FIELD):
+                pieces.extend(self._pieces(part))
+        for piece in dict.fromkeys(pieces):
+            self.clip(piece)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clips)
+
+
+class CachedVoiceBackend(SystemBackend):
+    """``AlertDispatcher`` backend that speaks through a ``TTSClipCache``.
+
+    Assembly, any synthesis on a cache miss and playback all run on the
+    dispatcher's worker thread; beeps are the system ones.
+    """
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def speak(self, message):
+        play(self.cache.speech(message))